@@ -0,0 +1,206 @@
+"""
+A2L (ASAP2) nesne okuyucu.
+- /begin ... /end bloklarını iç içe ayrıştırır (yorum ve "string" farkındalıklı).
+- CHARACTERISTIC / MEASUREMENT / AXIS_PTS için adres + byte boyu çıkarır.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|/\*.*?\*/|//[^\n]*|\S+', re.S)
+
+DATATYPE_SIZE = {
+    "UBYTE": 1, "SBYTE": 1,
+    "UWORD": 2, "SWORD": 2, "FLOAT16_IEEE": 2,
+    "ULONG": 4, "SLONG": 4, "FLOAT32_IEEE": 4,
+    "A_UINT64": 8, "A_INT64": 8, "FLOAT64_IEEE": 8,
+}
+
+# RECORD_LAYOUT RESERVED bileşeni DataSize (BYTE/WORD/LONG) kullanır
+DATASIZE_SIZE = {"BYTE": 1, "WORD": 2, "LONG": 4}
+
+# Bloklar içine inilerek aranacak kapsayıcılar
+CONTAINER_KINDS = ("PROJECT", "MODULE")
+
+
+@dataclass
+class A2LBlock:
+    kind: str
+    start: int                      # '/begin' karakter ofseti
+    end: int = -1                   # '/end KIND' sonrası karakter ofseti
+    tokens: list = field(default_factory=list)      # blok içindeki düz tokenlar
+    children: list = field(default_factory=list)    # iç /begin blokları
+
+    @property
+    def name(self) -> str:
+        return self.tokens[0] if self.tokens else ""
+
+    def keyword_args(self, keyword: str, count: int) -> Optional[list]:
+        """'MATRIX_DIM 4 2 1' gibi anahtar kelimenin arkasındaki count tokenı döner."""
+        for i, t in enumerate(self.tokens):
+            if t == keyword:
+                return self.tokens[i + 1:i + 1 + count]
+        return None
+
+    def child(self, kind: str) -> Iterator["A2LBlock"]:
+        return (c for c in self.children if c.kind == kind)
+
+
+def parse_blocks(text: str) -> list[A2LBlock]:
+    """Metindeki en üst seviye /begin blokları (iç içe yapı korunur)."""
+    roots, stack = [], []
+    pending_begin = None
+    it = TOKEN_RE.finditer(text)
+    for m in it:
+        tok = m.group(0)
+        if tok.startswith("/*") or tok.startswith("//"):
+            continue
+        if pending_begin is not None:
+            blk = A2LBlock(kind=tok, start=pending_begin)
+            (stack[-1].children if stack else roots).append(blk)
+            stack.append(blk)
+            pending_begin = None
+            continue
+        if tok == "/begin":
+            pending_begin = m.start()
+            continue
+        if tok == "/end":
+            kind = next(it, None)
+            if stack:
+                blk = stack.pop()
+                blk.end = kind.end() if kind else m.end()
+            continue
+        if stack:
+            stack[-1].tokens.append(tok)
+    return roots
+
+
+def iter_objects(blocks: list[A2LBlock], kinds: tuple) -> Iterator[A2LBlock]:
+    """PROJECT/MODULE içine inerek istenen türdeki blokları verir."""
+    for b in blocks:
+        if b.kind in kinds:
+            yield b
+        elif b.kind in CONTAINER_KINDS:
+            yield from iter_objects(b.children, kinds)
+
+
+def parse_int(tok: str) -> Optional[int]:
+    try:
+        return int(tok, 0)
+    except (TypeError, ValueError):
+        try:
+            return int(float(tok))
+        except (TypeError, ValueError):
+            return None
+
+
+def _dims(blk: A2LBlock) -> int:
+    md = blk.keyword_args("MATRIX_DIM", 3)
+    if md:
+        n = 1
+        for t in md:
+            v = parse_int(t)
+            if v is None: break
+            n *= max(v, 1)
+        return n
+    for kw in ("NUMBER", "ARRAY_SIZE"):
+        nb = blk.keyword_args(kw, 1)
+        if nb and parse_int(nb[0]) is not None:
+            return parse_int(nb[0])
+    return 1
+
+
+def parse_record_layouts(blocks: list[A2LBlock]) -> dict:
+    """RECORD_LAYOUT adı -> [(bileşen, datatype)] listesi."""
+    layouts = {}
+    for rl in iter_objects(blocks, ("RECORD_LAYOUT",)):
+        comps = []
+        toks = rl.tokens[1:]
+        for i, t in enumerate(toks):
+            # Bileşenler: <KEYWORD> <position> <datatype> ...
+            if i + 2 >= len(toks) or parse_int(toks[i + 1]) is None: continue
+            if toks[i + 2] in DATATYPE_SIZE or (t == "RESERVED" and toks[i + 2] in DATASIZE_SIZE):
+                comps.append((t, toks[i + 2]))
+        layouts[rl.name] = comps
+    return layouts
+
+
+def layout_size(components: list, n_values: int, axis_points: list[int]) -> Optional[int]:
+    if not components: return None
+    size = 0
+    for kw, dt in components:
+        ds = DATATYPE_SIZE.get(dt) or DATASIZE_SIZE[dt]
+        if kw == "FNC_VALUES":
+            size += ds * n_values
+        elif kw.startswith("AXIS_PTS_") and kw[-1] in "XYZ45":
+            ax = "XYZ45".index(kw[-1])
+            size += ds * (axis_points[ax] if ax < len(axis_points) else 1)
+        elif kw.startswith("AXIS_RESCALE_"):
+            return None  # yeniden ölçekleme eksenleri desteklenmiyor
+        else:
+            size += ds  # NO_AXIS_PTS_x, SRC_ADDR_x, RIP_ADDR_x, OFFSET_x ...
+    return size
+
+
+@dataclass
+class A2LItem:
+    name: str
+    kind: str
+    address: int
+    size: Optional[int]
+
+
+def characteristic_item(blk: A2LBlock, layouts: dict) -> Optional[A2LItem]:
+    # CHARACTERISTIC Name "Long" Type Address Deposit MaxDiff Conversion Lower Upper
+    if len(blk.tokens) < 5: return None
+    ctype, addr, deposit = blk.tokens[2], parse_int(blk.tokens[3]), blk.tokens[4]
+    if addr is None: return None
+    axis = [parse_int(a.tokens[3]) or 1 for a in blk.child("AXIS_DESCR") if len(a.tokens) > 3]
+    if ctype in ("CURVE", "MAP", "CUBOID", "CUBE_4", "CUBE_5"):
+        n = 1
+        for p in axis: n *= p
+    else:
+        n = _dims(blk)  # VALUE / VAL_BLK / ASCII
+    return A2LItem(blk.name, "CHARACTERISTIC", addr, layout_size(layouts.get(deposit), n, axis))
+
+
+def measurement_item(blk: A2LBlock) -> Optional[A2LItem]:
+    # MEASUREMENT Name "Long" Datatype Conversion Resolution Accuracy Lower Upper ... ECU_ADDRESS 0x..
+    ea = blk.keyword_args("ECU_ADDRESS", 1)
+    if not ea or len(blk.tokens) < 3: return None
+    addr = parse_int(ea[0])
+    if addr is None: return None
+    ds = DATATYPE_SIZE.get(blk.tokens[2])
+    return A2LItem(blk.name, "MEASUREMENT", addr, ds * _dims(blk) if ds else None)
+
+
+def axis_pts_item(blk: A2LBlock, layouts: dict) -> Optional[A2LItem]:
+    # AXIS_PTS Name "Long" Address InputQuantity Deposit MaxDiff Conversion MaxAxisPoints ...
+    if len(blk.tokens) < 8: return None
+    addr, npts = parse_int(blk.tokens[2]), parse_int(blk.tokens[7]) or 1
+    if addr is None: return None
+    comps = layouts.get(blk.tokens[4])
+    size = None
+    if comps:
+        size = 0
+        for kw, dt in comps:
+            size += (DATATYPE_SIZE.get(dt) or DATASIZE_SIZE[dt]) * (npts if kw.startswith("AXIS_PTS_") else 1)
+    return A2LItem(blk.name, "AXIS_PTS", addr, size)
+
+
+def read_items(text: str, kinds: tuple = ("CHARACTERISTIC",)) -> list[A2LItem]:
+    """A2L metninden istenen türlerdeki adreslenmiş nesneleri döner."""
+    blocks = parse_blocks(text)
+    layouts = parse_record_layouts(blocks)
+    items = []
+    for blk in iter_objects(blocks, kinds):
+        if blk.kind == "CHARACTERISTIC":
+            it = characteristic_item(blk, layouts)
+        elif blk.kind == "MEASUREMENT":
+            it = measurement_item(blk)
+        elif blk.kind == "AXIS_PTS":
+            it = axis_pts_item(blk, layouts)
+        else:
+            it = None
+        if it: items.append(it)
+    return items
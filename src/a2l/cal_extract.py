@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Offline kalibrasyon imajı çıkarıcı.
+Adreslenmiş A2L'deki CHARACTERISTIC (ve AXIS_PTS) adres/boylarını alır, ilk değerleri
+doğrudan ELF'in .data / kalibrasyon bölümlerinden okur ve S19/HEX imajı olarak yazar.
+Böylece Vision'da base .cal için canlı ECU Upload'ı yalnızca değerler farklıysa gerekir.
+"""
+from pathlib import Path
+import argparse, csv
+from bisect import bisect_right
+from a2l.a2l_objects import read_items
+from a2l.elf_image import ElfImage
+from a2l.hexfile import write_image, read_srec
+
+CAL_KINDS = ("CHARACTERISTIC", "AXIS_PTS")
+
+
+def extract_calibration(elf_img: ElfImage, a2l_text: str, kinds: tuple = CAL_KINDS):
+    """(chunks, report) döner. chunks: [(addr, memoryview)], report: [(name, kind, addr, size, durum)]"""
+    items = read_items(a2l_text, kinds)
+    sized = [it for it in items if it.size and it.address]
+    views = elf_img.read_many([(it.address, it.size) for it in sized])
+    chunks, report = [], []
+    for it, mv in zip(sized, views):
+        if mv is None:
+            report.append((it.name, it.kind, it.address, it.size, "NOT_IN_ELF_DATA"))
+            continue
+        chunks.append((it.address, mv))
+        report.append((it.name, it.kind, it.address, it.size, "EXTRACTED"))
+    for it in items:
+        if not it.size: report.append((it.name, it.kind, it.address, 0, "UNKNOWN_SIZE"))
+        elif not it.address: report.append((it.name, it.kind, 0, it.size, "NO_ADDRESS"))
+    return chunks, report
+
+
+def diff_against_image(chunks, image_chunks) -> list[int]:
+    """Çıkarılan parçalardan, verilen imajda (ör. ECU'dan alınan S19) farklı olanların adresleri."""
+    ref = dict(image_chunks)
+    starts = sorted(ref)
+    changed = []
+    for addr, mv in chunks:
+        i = bisect_right(starts, addr) - 1
+        if i < 0: changed.append(addr); continue
+        base = starts[i]
+        data = ref[base]
+        ofs = addr - base
+        if ofs + len(mv) > len(data) or data[ofs:ofs + len(mv)] != mv:
+            changed.append(addr)
+    return changed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ELF ilk değerlerinden kalibrasyon imajı (S19/HEX) üretir")
+    ap.add_argument("--elf", required=True)
+    ap.add_argument("--a2l", required=True, help="adreslenmiş A2L")
+    ap.add_argument("--out", required=True, help="çıkış .s19 / .hex")
+    ap.add_argument("--csv", dest="csv_out", default=None)
+    ap.add_argument("--compare", default=None, help="karşılaştırılacak referans S19 (ör. ECU upload)")
+    args = ap.parse_args()
+    elf_path, a2l_path, out = Path(args.elf), Path(args.a2l), Path(args.out)
+    assert elf_path.exists(), f"ELF bulunamadı: {elf_path}"
+    assert a2l_path.exists(), f"A2L bulunamadı: {a2l_path}"
+
+    with ElfImage(elf_path) as img:
+        chunks, report = extract_calibration(img, a2l_path.read_text(encoding="utf-8", errors="ignore"))
+        write_image(out, chunks, header=out.stem)
+        if args.compare:
+            changed = diff_against_image(chunks, read_srec(Path(args.compare)))
+            print(f"Referans imajdan farklı parametre sayısı: {len(changed)}")
+        chunks = None
+
+    if args.csv_out:
+        with open(args.csv_out, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["ParameterName", "Kind", "Address", "Size", "Result"])
+            for n, k, a, s, r in report: w.writerow([n, k, f"0x{a:X}", s, r])
+    ok = sum(1 for r in report if r[4] == "EXTRACTED")
+    print(f"{ok}/{len(report)} parametre çıkarıldı -> {out}")
+
+
+if __name__ == "__main__":
+    main()
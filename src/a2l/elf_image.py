@@ -0,0 +1,79 @@
+"""
+ELF içindeki ilk değerli (PROGBITS + ALLOC) bölümlere mmap üzerinden kopyasız erişim.
+"""
+import mmap
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional
+from elftools.elf.elffile import ELFFile
+from elftools.elf.constants import SH_FLAGS
+
+
+class ElfImage:
+    """ELF dosyasını bir kez mmap'ler; adres -> dosya ofseti çevirisi yapıp memoryview dilimi verir."""
+
+    def __init__(self, elf_path: Path):
+        self.path = Path(elf_path)
+        self._f = self.path.open("rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buf = memoryview(self._mm)
+        elf = ELFFile(self._f)
+        regions = []
+        for sec in elf.iter_sections():
+            if sec["sh_type"] == "SHT_NOBITS" or not (sec["sh_flags"] & SH_FLAGS.SHF_ALLOC): continue
+            if sec["sh_size"] == 0: continue
+            regions.append((int(sec["sh_addr"]), int(sec["sh_size"]), int(sec["sh_offset"]), sec.name))
+        regions.sort()
+        self.regions = regions
+        self._starts = [r[0] for r in regions]
+        # Flash'a yazılacak içerik: PT_LOAD segmentleri, yükleme (fiziksel) adresine göre
+        self.segments = sorted((int(seg["p_paddr"]), int(seg["p_filesz"]), int(seg["p_offset"]))
+                               for seg in elf.iter_segments()
+                               if seg["p_type"] == "PT_LOAD" and seg["p_filesz"] > 0)
+
+    def close(self):
+        try:
+            self.buf.release()
+            self._mm.close()
+        except BufferError:
+            pass  # dışarıda yaşayan dilimler var; mmap GC ile kapanır
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def find_region(self, addr: int) -> Optional[tuple]:
+        i = bisect_right(self._starts, addr) - 1
+        if i < 0: return None
+        r = self.regions[i]
+        return r if addr < r[0] + r[1] else None
+
+    def read(self, addr: int, size: int) -> Optional[memoryview]:
+        """[addr, addr+size) tek bir bölüm içindeyse kopyasız dilim; değilse None."""
+        r = self.find_region(addr)
+        if r is None or addr + size > r[0] + r[1]: return None
+        ofs = r[2] + (addr - r[0])
+        return self.buf[ofs:ofs + size]
+
+    def load_chunks(self) -> list[tuple[int, memoryview]]:
+        """Flash imajı: [(LMA, memoryview)] (kopyasız)."""
+        return [(addr, self.buf[ofs:ofs + size]) for addr, size, ofs in self.segments]
+
+    def read_many(self, requests: list[tuple[int, int]]) -> list[Optional[memoryview]]:
+        """(addr, size) listesini adres sırasıyla tek geçişte dilimler; sonuç giriş sırasıyla döner."""
+        out: list[Optional[memoryview]] = [None] * len(requests)
+        order = sorted(range(len(requests)), key=lambda k: requests[k][0])
+        i, n = 0, len(self.regions)
+        for k in order:
+            addr, size = requests[k]
+            while i < n and self.regions[i][0] + self.regions[i][1] <= addr:
+                i += 1
+            if i == n: break
+            base, rsize, fofs, _ = self.regions[i]
+            if base <= addr and addr + size <= base + rsize:
+                ofs = fofs + (addr - base)
+                out[k] = self.buf[ofs:ofs + size]
+        return out
@@ -0,0 +1,120 @@
+"""
+ELF sembol/DWARF indeksi önbelleği.
+Sembol haritası ve global değişken DIE indeksi bir kez kurulur, (yol, boyut, mtime) ile
+önbelleklenir. GUI, ELF seçilir seçilmez prefetch() ile indeksi arka planda kurdurur;
+adresleme stage'i aynı süreçte get_index() ile hazır indeksi kullanır. ELF belleğe okunur,
+dosya açık tutulmaz (linker yeniden yazarken kilitlenmez).
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+from elftools.elf.elffile import ELFFile
+from a2l.main_a2l import build_symbol_map, check_cancel
+from perf import timing
+
+CACHE_SIZE = 2          # bellekte tutulan ELF sayısı
+
+
+def build_global_var_index(dwarfinfo, progress: Optional[Callable[[int, int], None]] = None,
+                           cancel: Optional[Callable[[], bool]] = None) -> dict:
+    """
+    CU üst seviyesindeki DW_TAG_variable'lar: ad -> DIE (ilk bulunan, find_global_var_die ile aynı).
+    progress(cu_offset, .debug_info boyutu) ve cancel() her CU'da çağrılır.
+    """
+    idx = {}
+    if dwarfinfo is None:
+        return idx
+    total = dwarfinfo.debug_info_sec.size
+    for cu in dwarfinfo.iter_CUs():
+        check_cancel(cancel)
+        if progress: progress(cu.cu_offset, total)
+        timing.count("dwarf.cus")
+        for d in cu.get_top_DIE().iter_children():
+            if d.tag == 'DW_TAG_variable':
+                nm = d.attributes.get('DW_AT_name')
+                if nm:
+                    idx.setdefault(nm.value.decode(errors='ignore'), d)
+    if progress: progress(total, total)
+    return idx
+
+
+def _scaled(progress, lo: int, hi: int):
+    # progress(yüzde) -> (done, total) geri çağrısı; yüzde lo..hi aralığına ölçeklenir
+    if progress is None: return None
+    return lambda done, total: progress(lo + (hi - lo) * done // max(total, 1))
+
+
+class ElfIndex:
+    """
+    progress(yüzde 0..100): semboller 0-50, DWARF indeksi 50-100. cancel() -> AddressingCancelled.
+    data verilirse ELF bellekten okunur, dosya açık tutulmaz (linker aynı dosyanın üzerine yazabilir).
+    """
+
+    def __init__(self, path: str, progress: Optional[Callable[[int], None]] = None,
+                 cancel: Optional[Callable[[], bool]] = None, data: Optional[bytes] = None):
+        self.path = os.path.abspath(path)
+        self._f = open(self.path, "rb") if data is None else io.BytesIO(data)
+        try:
+            with timing.span("elf_index.build"):
+                self._build(progress, cancel)
+        except Exception:
+            self._f.close()
+            raise
+
+    def _build(self, progress, cancel):
+        self.elf = ELFFile(self._f)
+        self.symmap = build_symbol_map(self.elf, _scaled(progress, 0, 50), cancel)
+        self.dwarfinfo = self.elf.get_dwarf_info() if self.elf.has_dwarf_info() else None
+        self.var_dies = build_global_var_index(self.dwarfinfo, _scaled(progress, 50, 100), cancel)
+
+    def close(self):
+        self._f.close()
+
+
+_CACHE: "OrderedDict[tuple, ElfIndex]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _key(path: str) -> tuple:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def get_index(path: str, progress: Optional[Callable[[int], None]] = None,
+              cancel: Optional[Callable[[], bool]] = None) -> ElfIndex:
+    """Önbellekte varsa onu, yoksa yeni kurulan indeksi döndürür. İptal edilen kurulum önbelleğe girmez."""
+    key = _key(path)
+    with _LOCK:
+        idx = _CACHE.get(key)
+        if idx is not None:
+            _CACHE.move_to_end(key)
+            return idx
+        # Aynı yolun eski (değişmiş) sürümünü bırak
+        for k in [k for k in _CACHE if k[0] == key[0]]:
+            _CACHE.pop(k).close()
+        idx = _CACHE[key] = ElfIndex(path, progress, cancel, data=Path(path).read_bytes())
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)[1].close()
+        return idx
+
+
+def cached(path: str) -> Optional[ElfIndex]:
+    try:
+        key = _key(path)
+    except OSError:
+        return None
+    with _LOCK:
+        return _CACHE.get(key)
+
+
+def prefetch(path: str) -> bool:
+    """Spekülatif kurulum; hatalar yutulur (gerçek koşu hatayı zaten raporlar)."""
+    try:
+        get_index(path)
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,103 @@
+"""
+S-record (S19/S28/S37) ve Intel HEX okuma/yazma.
+Görüntüler (adres, bytes) parça listesi olarak taşınır; bitişik parçalar birleştirilir.
+"""
+from pathlib import Path
+from typing import Iterable
+
+SREC_DATA_BYTES = 32
+
+
+def coalesce(chunks: Iterable[tuple[int, bytes]]) -> list[tuple[int, bytes]]:
+    """Adrese göre sıralar, bitişik/çakışan parçaları tek parçada birleştirir (sonraki kazanır)."""
+    out: list[tuple[int, bytearray]] = []
+    for addr, data in sorted(chunks, key=lambda c: c[0]):
+        if not data: continue
+        if out and addr <= out[-1][0] + len(out[-1][1]):
+            base, buf = out[-1]
+            ofs = addr - base
+            buf[ofs:ofs + len(data)] = data
+        else:
+            out.append((addr, bytearray(data)))
+    return [(a, bytes(b)) for a, b in out]
+
+
+def _srec_line(rtype: str, addr: int, alen: int, data: bytes) -> str:
+    body = addr.to_bytes(alen, "big") + bytes(data)
+    count = len(body) + 1
+    csum = (~(count + sum(body))) & 0xFF
+    return f"S{rtype}{count:02X}{body.hex().upper()}{csum:02X}"
+
+
+SREC_TYPES = {"1": (2, "9"), "2": (3, "8"), "3": (4, "7")}     # veri kaydı -> (adres byte, bitiş kaydı)
+
+
+def write_srec(path: Path, chunks: Iterable[tuple[int, bytes]], header: str = "", rtype: str = "") -> None:
+    """rtype ("1"/"2"/"3") verilmezse en yüksek adrese göre en kısa kayıt tipi seçilir."""
+    chunks = coalesce(chunks)
+    top = max((a + len(d) for a, d in chunks), default=0)
+    if not rtype:
+        rtype = "1" if top <= 0x10000 else "2" if top <= 0x1000000 else "3"
+    alen, term = SREC_TYPES[rtype]
+    if top > 1 << (8 * alen):
+        raise ValueError(f"S{rtype} kaydı 0x{top:X} adresini taşıyamaz")
+    lines = [_srec_line("0", 0, 2, header.encode("ascii", errors="ignore"))]
+    n = 0
+    for addr, data in chunks:
+        mv = memoryview(data)
+        for ofs in range(0, len(mv), SREC_DATA_BYTES):
+            lines.append(_srec_line(rtype, addr + ofs, alen, mv[ofs:ofs + SREC_DATA_BYTES]))
+            n += 1
+    # S5: 16 bit kayıt sayısı, daha fazlası için S6 (24 bit)
+    if n <= 0xFFFF:
+        lines.append(_srec_line("5", n, 2, b""))
+    elif n <= 0xFFFFFF:
+        lines.append(_srec_line("6", n, 3, b""))
+    lines.append(_srec_line(term, 0, alen, b""))
+    Path(path).write_text("\n".join(lines) + "\n", encoding="ascii")
+
+
+def read_srec(path: Path) -> list[tuple[int, bytes]]:
+    alen = {"1": 2, "2": 3, "3": 4}
+    chunks = []
+    with open(path, "r", encoding="ascii", errors="ignore") as f:
+        for ln in f:
+            ln = ln.strip()
+            if len(ln) < 4 or ln[0] != "S" or ln[1] not in alen: continue
+            raw = bytes.fromhex(ln[2:])
+            n = alen[ln[1]]
+            body = raw[1:raw[0]]            # count byte'ı ve checksum hariç
+            chunks.append((int.from_bytes(body[:n], "big"), body[n:]))
+    return coalesce(chunks)
+
+
+def _ihex_line(rtype: int, addr: int, data: bytes) -> str:
+    body = bytes([len(data)]) + (addr & 0xFFFF).to_bytes(2, "big") + bytes([rtype]) + bytes(data)
+    return f":{body.hex().upper()}{(-sum(body)) & 0xFF:02X}"
+
+
+def write_ihex(path: Path, chunks: Iterable[tuple[int, bytes]]) -> None:
+    lines = []
+    upper = None
+    for addr, data in coalesce(chunks):
+        mv = memoryview(data)
+        ofs = 0
+        while ofs < len(mv):
+            a = addr + ofs
+            if a >> 16 != upper:
+                upper = a >> 16
+                lines.append(_ihex_line(4, 0, upper.to_bytes(2, "big")))
+            # 64K sınırını aşmadan yaz
+            n = min(SREC_DATA_BYTES, len(mv) - ofs, 0x10000 - (a & 0xFFFF))
+            lines.append(_ihex_line(0, a, mv[ofs:ofs + n]))
+            ofs += n
+    lines.append(":00000001FF")
+    Path(path).write_text("\n".join(lines) + "\n", encoding="ascii")
+
+
+def write_image(path: Path, chunks: Iterable[tuple[int, bytes]], header: str = "") -> None:
+    """Uzantıya göre .hex/.ihex -> Intel HEX, diğerleri -> S-record."""
+    if Path(path).suffix.lower() in (".hex", ".ihex"):
+        write_ihex(path, chunks)
+    else:
+        write_srec(path, chunks, header)
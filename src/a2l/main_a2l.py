@@ -1,21 +1,46 @@
 #!/usr/bin/env python3
 from pathlib import Path
 import re, csv, argparse
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 from elftools.elf.elffile import ELFFile
 from elftools.elf.sections import SymbolTableSection
 from elftools.dwarf.descriptions import describe_form_class
+from perf import timing
 
 LINE_RE = re.compile(r'^(?P<prefix>.*?\b)(?P<addr>0x[0-9A-Fa-f]+)(?P<suffix>.*?/\*\s*@ECU_Address@(?P<name>[^@]+)@\s*\*/.*)$')
 BASE_INDEX_RE = re.compile(r'^(?P<base>[A-Za-z0-9_.$:+-]+)(\[(?P<idx>\d+)\])?$')
 
-def build_symbol_map(elf: ELFFile) -> dict:
+# progress(done, total) / cancel() çağrı sıklığı
+PROGRESS_EVERY_LINES = 2000
+PROGRESS_EVERY_SYMBOLS = 5000
+
+class AddressingCancelled(Exception):
+    pass
+
+def check_cancel(cancel: Optional[Callable[[], bool]]):
+    if cancel is not None and cancel(): raise AddressingCancelled("A2L addressing cancelled")
+
+def build_symbol_map(elf: ELFFile, progress: Optional[Callable[[int, int], None]] = None,
+                     cancel: Optional[Callable[[], bool]] = None) -> dict:
+    with timing.span("build_symbol_map") as sp:
+        sym = _build_symbol_map(elf, progress, cancel)
+        sp.set(symbols=len(sym))
+    timing.count("elf.symbols", len(sym))
+    return sym
+
+def _build_symbol_map(elf: ELFFile, progress, cancel) -> dict:
     sym = {}
-    for sec in elf.iter_sections():
-        if isinstance(sec, SymbolTableSection):
-            for s in sec.iter_symbols():
-                nm = s.name or ""
-                if nm: sym[nm] = s.entry["st_value"]
+    secs = [sec for sec in elf.iter_sections() if isinstance(sec, SymbolTableSection)]
+    total = sum(sec.num_symbols() for sec in secs); done = 0
+    for sec in secs:
+        for s in sec.iter_symbols():
+            nm = s.name or ""
+            if nm: sym[nm] = s.entry["st_value"]
+            done += 1
+            if done % PROGRESS_EVERY_SYMBOLS == 0:
+                check_cancel(cancel)
+                if progress: progress(done, total)
+    if progress: progress(total, total)
     return sym
 
 def resolve_direct_symbol(symmap: dict, pname: str) -> Optional[Tuple[int, str]]:
@@ -69,6 +94,7 @@ def parse_member_location(loc_attr) -> Optional[int]:
     return None
 
 def find_global_var_die(dwarfinfo, name: str):
+    timing.count("dwarf.cu_scans")
     for cu in dwarfinfo.iter_CUs():
         top = cu.get_top_DIE()
         for d in top.iter_children():
@@ -102,9 +128,11 @@ def struct_size(struct_die) -> Optional[int]:
     bs = struct_die.attributes.get('DW_AT_byte_size')
     return int(bs.value) if bs else None
 
-def resolve_struct_member_addr(elf: ELFFile, dwarfinfo, symmap: dict, dotted_name: str) -> Optional[Tuple[int, str]]:
-    """Desteklenen: Base.member  ve  Base[idx].member  (idx >= 0)"""
+def resolve_struct_member_addr(elf: ELFFile, dwarfinfo, symmap: dict, dotted_name: str,
+                               var_dies: Optional[dict] = None) -> Optional[Tuple[int, str]]:
+    """Desteklenen: Base.member  ve  Base[idx].member  (idx >= 0). var_dies: hazır global değişken indeksi"""
     if '.' not in dotted_name or dwarfinfo is None: return None
+    timing.count("dwarf.lookups")
     head, member = dotted_name.split('.', 1)
     m = BASE_INDEX_RE.match(head)
     if not m: return None
@@ -114,7 +142,7 @@ def resolve_struct_member_addr(elf: ELFFile, dwarfinfo, symmap: dict, dotted_nam
     base_addr = symmap.get(base_name)
     if base_addr is None: return None
 
-    var_die = find_global_var_die(dwarfinfo, base_name)
+    var_die = var_dies.get(base_name) if var_dies is not None else find_global_var_die(dwarfinfo, base_name)
     if not var_die: return None
 
     t_die = follow_type(ref_to_die(dwarfinfo, var_die, 'DW_AT_type') or var_die, dwarfinfo)
@@ -189,14 +217,25 @@ def fill_reg_placeholders_in_line(ln: str, elf: ELFFile, seg_to_sections: dict[s
     note = f"ELF section {used}: addr=0x{addr:X}, size=0x{size:X}"
     return new_line, note
 
-def process_a2l(a2l_in: Path, a2l_out: Path, elf: ELFFile, symmap: dict, csv_out: Path):
-    lines = a2l_in.read_text(encoding="utf-8", errors="ignore").splitlines()
-    dwarfinfo = elf.get_dwarf_info()
+def process_a2l(a2l_in: Path, a2l_out: Path, elf: ELFFile, symmap: dict, csv_out: Path,
+                dwarfinfo=None, var_dies: Optional[dict] = None,
+                progress: Optional[Callable[[int, int], None]] = None, cancel: Optional[Callable[[], bool]] = None):
+    """progress(satır, toplam) ve cancel() her PROGRESS_EVERY_LINES satırda çağrılır; iptalde çıktı yazılmaz."""
+    with timing.span("process_a2l"):
+        _process_a2l(a2l_in, a2l_out, elf, symmap, csv_out, dwarfinfo, var_dies, progress, cancel)
+
+def _process_a2l(a2l_in, a2l_out, elf, symmap, csv_out, dwarfinfo, var_dies, progress, cancel):
+    with timing.span("a2l.read"):
+        lines = a2l_in.read_text(encoding="utf-8", errors="ignore").splitlines()
+    dwarfinfo = dwarfinfo or elf.get_dwarf_info()
     resolved, missing, unchanged = [], [], []
     new_lines = []
     seg_to_sections = {"CAL_SEG_RAM": [".cal_seg_ram", ".CAL_SEG_RAM", ".CAL_SEG_RAM_DATA"],}
 
-    for ln in lines:
+    for i, ln in enumerate(lines):
+        if i % PROGRESS_EVERY_LINES == 0:
+            check_cancel(cancel)
+            if progress: progress(i, len(lines))
 
         # 1) Önce segment placeholder satırları
         rr = fill_reg_placeholders_in_line(ln, elf, seg_to_sections)
@@ -214,7 +253,7 @@ def process_a2l(a2l_in: Path, a2l_out: Path, elf: ELFFile, symmap: dict, csv_out
             unchanged.append((pname, cur)); new_lines.append(ln); continue
 
         if '.' in pname:
-            r = resolve_struct_member_addr(elf, dwarfinfo, symmap, pname)
+            r = resolve_struct_member_addr(elf, dwarfinfo, symmap, pname, var_dies)
             if r:
                 addr, note = r
                 new_lines.append(f"{m.group('prefix')}0x{addr:X}{m.group('suffix')}")
@@ -228,13 +267,18 @@ def process_a2l(a2l_in: Path, a2l_out: Path, elf: ELFFile, symmap: dict, csv_out
 
         new_lines.append(ln); missing.append(pname)
 
-    a2l_out.write_text("\n".join(new_lines), encoding="utf-8")
-    with csv_out.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["ParameterName","Result","AddressOrNote","Mode"])
-        for n,a,note,mode in resolved: w.writerow([n,"RESOLVED",f"{a} ({note})",mode])
-        for n in missing: w.writerow([n,"MISSING","symbol not found (needs DWARF or missing symbol)",""])
-        for n,a in unchanged: w.writerow([n,"UNCHANGED_NONZERO",a,""])
+    if progress: progress(len(lines), len(lines))
+    timing.count("a2l.lines", len(lines))
+    timing.count("a2l.resolved", len(resolved))
+    timing.count("a2l.missing", len(missing))
+    with timing.span("a2l.write"):
+        a2l_out.write_text("\n".join(new_lines), encoding="utf-8")
+        with csv_out.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["ParameterName","Result","AddressOrNote","Mode"])
+            for n,a,note,mode in resolved: w.writerow([n,"RESOLVED",f"{a} ({note})",mode])
+            for n in missing: w.writerow([n,"MISSING","symbol not found (needs DWARF or missing symbol)",""])
+            for n,a in unchanged: w.writerow([n,"UNCHANGED_NONZERO",a,""])
 
 def main():
     ap = argparse.ArgumentParser(description="A2L ECU_ADDRESS doldurucu (pyelftools, struct & array destekli)")
@@ -242,8 +286,17 @@ def main():
     ap.add_argument("--in", dest="a2l_in", required=True)
     ap.add_argument("--out", dest="a2l_out", required=True)
     ap.add_argument("--csv", dest="csv_out", default="a2l_address_resolution_summary.csv")
+    ap.add_argument("--watch", action="store_true", help="ELF/A2L değiştikçe yeniden adresle")
+    ap.add_argument("--debounce", type=float, default=0.5, help="izleme: son yazmadan sonra bekleme (s)")
     args = ap.parse_args()
     elf_path, a2l_in, a2l_out, csv_out = Path(args.elf), Path(args.a2l_in), Path(args.a2l_out), Path(args.csv_out)
+    if args.watch:
+        from a2l.watch import A2lWatcher
+        try:
+            A2lWatcher(elf_path, a2l_in, a2l_out, csv_out, debounce_s=args.debounce).serve()
+        except KeyboardInterrupt:
+            pass
+        return
     assert elf_path.exists(), f"ELF bulunamadı: {elf_path}"
     assert a2l_in.exists(), f"A2L bulunamadı: {a2l_in}"
     with elf_path.open("rb") as f:
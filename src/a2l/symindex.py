@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Paylaşılan (mmap) sembol/yerleşim indeksi.
+ELF bir kez açılır (ElfIndex -> main_a2l sembol haritası + DWARF global değişkenleri), çıkan
+sembol adresleri ve struct üye ofsetleri düz bir dosyaya yazılır:
+    <INDEX_DIR>/<anahtar>.symidx     anahtar = (ELF yolu, boyut, mtime)
+GUI, CLI ve lab script'leri dosyayı salt-okunur mmap'ler; ELF/DWARF ayrıştırması yapılmaz,
+sütunlar memoryview.cast ile doğrudan sayfa önbelleğinden okunur (süreçler aynı fiziksel
+sayfaları paylaşır). Ad araması CRC32 açık adresleme tablosuyla, adres araması sıralı
+adres sütununda ikili aramayla yapılır.
+
+Desteklenen çözümlemeler main_a2l ile aynıdır: Sembol (mtlb_ önekli de), Base.member,
+Base[idx].member (dizi eleman boyu ya da struct boyu adımıyla).
+
+  PYTHONPATH=src python -m a2l.symindex serve --elf build/app.elf      # kur + ELF değiştikçe yenile
+  PYTHONPATH=src python -m a2l.symindex lookup --elf build/app.elf Foo st0_1.a ar0_0[3].b 0x40001234
+"""
+import os
+import sys
+import json
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+import argparse
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional, Tuple
+
+from a2l.main_a2l import BASE_INDEX_RE, follow_type, ref_to_die, element_size_of_array, struct_size, \
+    parse_member_location
+
+INDEX_DIR = os.environ.get("RELEASE_SYMINDEX_DIR",
+                           str(Path.home() / ".software_release_tool" / "symindex"))
+MAGIC = b"SYMIDX01"
+NONE = 0xFFFFFFFF
+VAR_STRUCT, VAR_ARRAY = 1, 2
+# sütun adı -> array tipi
+COLUMNS = {"str_off": "I", "sym_addr": "Q", "sym_str": "I", "sym_var": "I", "slots": "I",
+           "var_type": "I", "var_stride": "I", "var_flags": "I", "type_mem": "I", "mem_str": "I", "mem_off": "I"}
+
+
+def index_path(elf_path: str, index_dir: str = INDEX_DIR) -> Path:
+    st = os.stat(elf_path)
+    key = f"{os.path.abspath(elf_path)}|{st.st_size}|{st.st_mtime_ns}".encode("utf-8")
+    return Path(index_dir) / f"{hashlib.blake2b(key, digest_size=12).hexdigest()}.symidx"
+
+
+def _slot_count(n: int) -> int:
+    s = 8
+    while s < 2 * n:
+        s *= 2
+    return s
+
+
+class _Builder:
+    def __init__(self):
+        self.strings = bytearray()
+        self.str_off = array("I", [0])
+        self._ids = {}
+
+    def intern(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.str_off) - 1
+            self.strings += s.encode("utf-8")
+            self.str_off.append(len(self.strings))
+        return i
+
+
+def _layouts(idx, b: _Builder) -> tuple:
+    """var adı -> (tip, adım, bayrak) ve struct üye tabloları; main_a2l.resolve_struct_member_addr ile aynı kurallar."""
+    dw = idx.dwarfinfo
+    vars_, types = {}, {}
+    type_mem, mem_str, mem_off = array("I", [0]), array("I"), array("I")
+
+    def struct_id(die) -> int:
+        t = types.get(die.offset)
+        if t is None:
+            for child in die.iter_children():
+                if child.tag != 'DW_TAG_member': continue
+                nm = child.attributes.get('DW_AT_name')
+                if not nm: continue
+                off = parse_member_location(child.attributes.get('DW_AT_data_member_location'))
+                if off is None: continue
+                mem_str.append(b.intern(nm.value.decode(errors='ignore')))
+                mem_off.append(off)
+            t = types[die.offset] = len(type_mem) - 1
+            type_mem.append(len(mem_str))
+        return t
+
+    if dw is None:
+        return vars_, type_mem, mem_str, mem_off
+    for name, var_die in idx.var_dies.items():
+        if name not in idx.symmap: continue
+        t_die = follow_type(ref_to_die(dw, var_die, 'DW_AT_type') or var_die, dw)
+        if t_die.tag == 'DW_TAG_structure_type':
+            vars_[name] = (struct_id(t_die), struct_size(t_die) or 0, VAR_STRUCT)
+        elif t_die.tag == 'DW_TAG_array_type':
+            esize = element_size_of_array(t_die, dw)
+            elem = follow_type(ref_to_die(dw, t_die, 'DW_AT_type'), dw)
+            if esize is not None and elem is not None and elem.tag == 'DW_TAG_structure_type':
+                vars_[name] = (struct_id(elem), esize, VAR_ARRAY)
+    return vars_, type_mem, mem_str, mem_off
+
+
+def build(elf_path: str, out: Optional[str] = None, index_dir: str = INDEX_DIR) -> Path:
+    """ELF'ten indeks dosyasını kurar (geçici dosya + os.replace). Dosya yolunu döndürür."""
+    from a2l.elf_index import ElfIndex
+
+    out = Path(out) if out else index_path(elf_path, index_dir)
+    data = Path(elf_path).read_bytes()      # dosya açık kalmaz; linker üzerine yazabilir
+    idx = ElfIndex(elf_path, data=data)
+    try:
+        b = _Builder()
+        vars_, type_mem, mem_str, mem_off = _layouts(idx, b)
+        syms = sorted(idx.symmap.items(), key=lambda kv: (kv[1], kv[0]))
+    finally:
+        idx.close()
+
+    cols = {k: array(t) for k, t in COLUMNS.items()}
+    var_index = {}
+    for name, (t, stride, flags) in vars_.items():
+        var_index[name] = len(cols["var_type"])
+        cols["var_type"].append(t); cols["var_stride"].append(stride); cols["var_flags"].append(flags)
+    for name, addr in syms:
+        cols["sym_addr"].append(addr)
+        cols["sym_str"].append(b.intern(name))
+        cols["sym_var"].append(var_index.get(name, NONE))
+    slots = cols["slots"] = array("I", [0]) * _slot_count(len(syms))
+    mask = len(slots) - 1
+    for i, (name, _) in enumerate(syms):
+        h = zlib.crc32(name.encode("utf-8")) & mask
+        while slots[h]:
+            h = (h + 1) & mask
+        slots[h] = i + 1
+    cols["str_off"], cols["type_mem"], cols["mem_str"], cols["mem_off"] = b.str_off, type_mem, mem_str, mem_off
+
+    # Bölümler 8 byte hizalı; başlık sabit uzunlukta ayrılır
+    sections, blobs, pos = {}, [], 0
+    for name, col in [("strings", b.strings)] + list(cols.items()):
+        raw = bytes(col) if isinstance(col, bytearray) else col.tobytes()
+        sections[name] = (pos, len(raw))
+        blobs.append(raw + b"\0" * (-len(raw) % 8))
+        pos += len(blobs[-1])
+    hdr = json.dumps({"elf": os.path.abspath(elf_path), "byteorder": sys.byteorder, "symbols": len(syms),
+                      "created": time.strftime("%Y-%m-%d %H:%M:%S"), "sections": sections}).encode("utf-8")
+    hdr_len = len(MAGIC) + 4 + len(hdr)
+    hdr_len += -hdr_len % 8
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC + struct.pack("<I", hdr_len) + hdr.ljust(hdr_len - len(MAGIC) - 4))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, out)
+    return out
+
+
+class SharedIndex:
+    """Salt-okunur mmap indeks. Aramalar kopyasız sütunlardan yapılır; yalnız dönen adlar str'e çevrilir."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(self._mm)
+        self._views = [mv]
+        if bytes(mv[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise ValueError(f"Sembol indeksi değil: {path}")
+        (hdr_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        self.header = json.loads(bytes(mv[len(MAGIC) + 4:hdr_len]).rstrip())
+        if self.header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError("Sembol indeksi farklı byte sırasına sahip bir makinede kurulmuş")
+        for name, (ofs, size) in self.header["sections"].items():
+            v = mv[hdr_len + ofs:hdr_len + ofs + size]
+            if name != "strings":
+                self._views.append(v)
+                v = v.cast(COLUMNS[name])
+            self._views.append(v)
+            setattr(self, "_" + name, v)
+        self._mask = len(self._slots) - 1
+
+    def __len__(self):
+        return len(self._sym_addr)
+
+    def _str(self, i: int) -> memoryview:
+        return self._strings[self._str_off[i]:self._str_off[i + 1]]
+
+    def _find(self, name: str) -> int:
+        key = name.encode("utf-8")
+        h = zlib.crc32(key) & self._mask
+        while True:
+            k = self._slots[h]
+            if not k: return -1
+            if self._str(self._sym_str[k - 1]) == key: return k - 1
+            h = (h + 1) & self._mask
+
+    def address(self, name: str) -> Optional[int]:
+        i = self._find(name)
+        return None if i < 0 else self._sym_addr[i]
+
+    def resolve_direct_symbol(self, pname: str) -> Optional[Tuple[int, str]]:
+        for key in (f"mtlb_{pname}", pname):
+            i = self._find(key)
+            if i >= 0: return self._sym_addr[i], key
+        return None
+
+    def resolve_struct_member_addr(self, dotted_name: str) -> Optional[Tuple[int, str]]:
+        if '.' not in dotted_name: return None
+        head, member = dotted_name.split('.', 1)
+        m = BASE_INDEX_RE.match(head)
+        if not m: return None
+        base_name = m.group('base')
+        idx = int(m.group('idx')) if m.group('idx') is not None else None
+        i = self._find(base_name)
+        if i < 0 or self._sym_var[i] == NONE: return None
+        v = self._sym_var[i]
+        t, stride, flags = self._var_type[v], self._var_stride[v], self._var_flags[v]
+        if idx is None and flags != VAR_STRUCT: return None
+        if idx is not None and not stride: return None
+        base_ofs = idx * stride if idx is not None else 0
+        key = member.encode("utf-8")
+        for k in range(self._type_mem[t], self._type_mem[t + 1]):
+            if self._str(self._mem_str[k]) == key:
+                mem_off = self._mem_off[k]
+                note = base_name + (f"[{idx}]" if idx is not None else "") + f"+DWARF({mem_off})"
+                return self._sym_addr[i] + base_ofs + mem_off, note
+        return None
+
+    def resolve(self, pname: str) -> Optional[Tuple[int, str]]:
+        """process_a2l sırası: önce struct üyesi, sonra doğrudan sembol."""
+        return self.resolve_struct_member_addr(pname) or self.resolve_direct_symbol(pname)
+
+    def symbol_at(self, addr: int) -> Optional[Tuple[str, int]]:
+        """Adresteki ya da önündeki en yakın sembol: (ad, adres içi ofset)."""
+        i = bisect_right(self._sym_addr, addr) - 1
+        if i < 0: return None
+        return bytes(self._str(self._sym_str[i])).decode("utf-8"), addr - self._sym_addr[i]
+
+    def close(self):
+        # mmap, üzerindeki memoryview'lar (türetilenler önce) bırakılmadan kapanamaz
+        for v in reversed(getattr(self, "_views", [])):
+            v.release()
+        self._views = []
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def attach(elf_path: str, build_missing: bool = True, index_dir: str = INDEX_DIR) -> SharedIndex:
+    """ELF'in güncel indeksine bağlanır; yoksa (build_missing) kurar. Eşzamanlı kurulumlar aynı içeriği yazar."""
+    path = index_path(elf_path, index_dir)
+    if not path.exists():
+        if not build_missing:
+            raise FileNotFoundError(f"Sembol indeksi yok: {path} (symindex serve çalışıyor mu?)")
+        build(elf_path, str(path))
+    return SharedIndex(str(path))
+
+
+def serve(elf_path: str, index_dir: str = INDEX_DIR, poll_s: float = 0.5, log=print, stop=None):
+    """İndeksi kurar ve ELF değiştikçe yeniler; eski sürümlerin dosyaları silinir (açık olanlar kalır)."""
+    from a2l.watch import file_sig
+
+    built, last = [], None
+    while not (stop and stop()):
+        sig = file_sig(Path(elf_path))
+        if sig is not None and sig != last:
+            time.sleep(poll_s)                      # linker yazmayı bitirsin
+            if file_sig(Path(elf_path)) != sig:
+                continue
+            try:
+                t0 = time.perf_counter()
+                path = build(elf_path, index_dir=index_dir)
+                log(f"Sembol indeksi hazır: {path} ({time.perf_counter() - t0:.2f} s)")
+                last = sig
+                for old in [p for p in built if p != path]:
+                    try:
+                        old.unlink(); built.remove(old)
+                    except OSError:
+                        pass                        # Windows: hâlâ mmap'li
+                if path not in built: built.append(path)
+            except Exception as e:
+                log(f"Sembol indeksi kurulamadı: {e}")
+                last = sig
+        time.sleep(poll_s)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Paylaşılan (mmap) ELF sembol/yerleşim indeksi")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="indeksi kur ve ELF değiştikçe yenile")
+    s.add_argument("--elf", required=True)
+    s.add_argument("--poll", type=float, default=0.5)
+    lk = sub.add_parser("lookup", help="ad (Base.member, Base[i].member) ya da 0x adres çözümle")
+    lk.add_argument("--elf", required=True)
+    lk.add_argument("names", nargs="+")
+    for p in (s, lk):
+        p.add_argument("--dir", default=INDEX_DIR)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        try:
+            serve(args.elf, args.dir, args.poll)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    with attach(args.elf, index_dir=args.dir) as si:
+        rc = 0
+        for n in args.names:
+            if n.lower().startswith("0x"):
+                r = si.symbol_at(int(n, 16))
+                print(f"{n}: " + ("-" if r is None else f"{r[0]}+0x{r[1]:X}"))
+            else:
+                r = si.resolve(n)
+                print(f"{n}: " + ("MISSING" if r is None else f"0x{r[0]:X} ({r[1]})"))
+            rc |= r is None
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
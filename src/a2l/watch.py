@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+main_a2l izleme modu: ELF (ve giriş A2L) değişince adreslemeyi yeniden koşar.
+  - Dosyalar (boyut, mtime) ile yoklanır; son değişiklikten DEBOUNCE_S sonra, imza sabitse koşulur
+    (linker ELF'i parça parça yazar).
+  - ELF belleğe okunur, indeks bellekteki kopyadan kurulur; dosya açık tutulmaz.
+  - ELF içeriği aynıysa (yeniden link, aynı çıktı) hiçbir şey yeniden yazılmaz; yalnız A2L
+    değiştiyse sıcak indeksle sadece process_a2l koşar.
+  - Çıktılar .tmp'ye yazılıp os.replace ile değiştirilir; okuyan araç yarım dosya görmez.
+  - Okunamayan/yarım ELF bir sonraki değişikliğe kadar beklenir, izleme durmaz.
+
+  PYTHONPATH=src python -m a2l.main_a2l --elf build/app.elf --in in.a2l --out out.a2l --watch
+"""
+import os
+import time
+import hashlib
+from pathlib import Path
+from typing import Callable, Optional
+
+from a2l.elf_index import ElfIndex
+from a2l.main_a2l import process_a2l
+from perf import timing
+
+POLL_S = 0.2
+DEBOUNCE_S = 0.5
+
+
+def file_sig(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class A2lWatcher:
+    def __init__(self, elf_path: Path, a2l_in: Path, a2l_out: Path, csv_out: Path,
+                 debounce_s: float = DEBOUNCE_S, poll_s: float = POLL_S, log: Callable[[str], None] = print):
+        self.elf_path, self.a2l_in = Path(elf_path), Path(a2l_in)
+        self.a2l_out, self.csv_out = Path(a2l_out), Path(csv_out)
+        self.debounce_s, self.poll_s, self.log = debounce_s, poll_s, log
+        self.index: Optional[ElfIndex] = None
+        self.runs = 0
+        self._elf_digest = None
+        self._sigs = {self.elf_path: None, self.a2l_in: None}
+        self._dirty = set()
+        self._changed_at = 0.0
+
+    def poll(self) -> bool:
+        """Bir yoklama adımı; adresleme koşulduysa True."""
+        now = time.monotonic()
+        for p, old in self._sigs.items():
+            sig = file_sig(p)
+            if sig != old:
+                self._sigs[p] = sig
+                self._changed_at = now
+                if sig is not None:
+                    self._dirty.add(p)
+        if not self._dirty or now - self._changed_at < self.debounce_s:
+            return False
+        if any(self._sigs[p] is None or self._sigs[p][0] == 0 for p in self._sigs):
+            return False
+        dirty, self._dirty = self._dirty, set()
+        try:
+            return self.run_once(self.elf_path in dirty, self.a2l_in in dirty)
+        except Exception as e:
+            # Yarım yazılmış ELF vb.; bir sonraki değişiklikte tekrar denenir
+            self.log(f"Adresleme başarısız: {e}")
+            if self.elf_path in dirty:
+                self._elf_digest = None
+            return False
+
+    def run_once(self, elf_changed: bool = True, a2l_changed: bool = True) -> bool:
+        t0 = time.perf_counter()
+        if elf_changed or self.index is None:
+            if not self._reload_elf() and not a2l_changed and self.a2l_out.exists():
+                return False
+        t1 = time.perf_counter()
+        tmp_a2l = self.a2l_out.with_name(self.a2l_out.name + ".tmp")
+        tmp_csv = self.csv_out.with_name(self.csv_out.name + ".tmp")
+        idx = self.index
+        with timing.span("watch.process_a2l"):
+            process_a2l(self.a2l_in, tmp_a2l, idx.elf, idx.symmap, tmp_csv, idx.dwarfinfo, idx.var_dies)
+        os.replace(tmp_csv, self.csv_out)
+        os.replace(tmp_a2l, self.a2l_out)
+        self.runs += 1
+        self.log(f"A2L güncellendi: {self.a2l_out} (indeks {t1 - t0:.2f} s, adresleme "
+                 f"{time.perf_counter() - t1:.2f} s)")
+        return True
+
+    def _reload_elf(self) -> bool:
+        """İndeks yeniden kurulduysa True."""
+        data = self.elf_path.read_bytes()
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if digest == self._elf_digest and self.index is not None:
+            self.log("ELF içeriği değişmemiş, indeks korunuyor")
+            return False
+        with timing.span("watch.index", bytes=len(data)):
+            idx = ElfIndex(str(self.elf_path), data=data)
+        if self.index is not None:
+            self.index.close()
+        self.index, self._elf_digest = idx, digest
+        return True
+
+    def serve(self, stop: Optional[Callable[[], bool]] = None):
+        self.log(f"İzleniyor: {self.elf_path}, {self.a2l_in} (Ctrl+C ile çık)")
+        try:
+            while not (stop and stop()):
+                self.poll()
+                time.sleep(self.poll_s)
+        finally:
+            self.close()
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
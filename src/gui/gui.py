@@ -1,15 +1,20 @@
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from PySide6.QtCore import QObject, QThread, Signal
+
+if __name__ == "__main__" and Path(sys.path[0]).resolve() == Path(__file__).resolve().parent:
+    # Script olarak çalışınca src/gui, "gui" paketini bu dosyayla gölgeler: yerine src konur
+    sys.path[0] = str(Path(__file__).resolve().parent.parent)
+
+from PySide6.QtCore import QObject, Signal
 import traceback
-from a2l.main_a2l import build_symbol_map, process_a2l
-from elftools.elf.elffile import ELFFile
-from t32 import t32
-from vision import ati_vision
+import threading
+from pipeline.release import ReleaseConfig, StageContext, run_release
+from pipeline import workers
+from gui.logsink import LogSink
 import os
 
-from PySide6.QtCore import Qt, QDateTime, QSettings
+from PySide6.QtCore import Qt, QSettings
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QApplication,
@@ -26,7 +31,8 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QMessageBox,
     QProgressBar,
-    QComboBox
+    QComboBox,
+    QCheckBox
 )
 @dataclass
 class UiConfig:
@@ -36,120 +42,86 @@ class UiConfig:
     elf_path: str = ""
     addressed_a2l_path: str = ""
     output_dir: str = ""
-
-class A2LAddressWorker(QObject):
+    target_id: str = ""
+    resume_flash: bool = False
+    trace: bool = False
+
+class PipelineWorker(QObject):
+    """
+    Release hattını (pipeline/release.py) DAG olarak çalıştırır:
+    A2L adresleme ve TRACE32 flash aynı anda, Vision ikisi bitince.
+    Stage'ler kalıcı worker havuzunda (pipeline/workers.py) koşar; sinyaller havuz
+    thread'lerinden emit edilir ve GUI thread'ine kuyrukla ulaşır.
+    """
     log = Signal(str)
     progress = Signal(int)
     status = Signal(str)
-    finished = Signal(str)      # çıktı A2L path
-    failed = Signal(str)        # error text
+    stage_done = Signal(str, str)   # stage adı, çıktı (metin)
+    finished = Signal()
+    failed = Signal(str)            # error text
 
-    def __init__(self, a2l_in: str, elf_path: str, out_dir: str, svn_number: str, selected_project: str):
+    def __init__(self, cfg: ReleaseConfig, pool: "workers.WorkerPool"):
         super().__init__()
-        self.a2l_in = Path(a2l_in)
-        self.elf_path = Path(elf_path)
-        self.out_dir = Path(out_dir)
-        self.selected_project = selected_project
-        self.svn_num = svn_number
+        self.cfg = cfg
+        self.pool = pool
+        self._cancel = threading.Event()
+        self._stage_pct = {}
+        self._lock = threading.Lock()
+
+    def request_cancel(self):
+        # GUI thread'inden çağrılır; stage'ler iptali kendi yoklamalarında görür
+        self._cancel.set()
+
+    def _on_progress(self, stage: str, pct: int):
+        # Genel ilerleme: çalışan stage'lerin ortalaması
+        with self._lock:
+            self._stage_pct[stage] = pct
+            n = 1 + int(self.cfg.flash) + int(self.cfg.vision) + int(self.cfg.bundle)
+            total = min(sum(self._stage_pct.values()) // n, 100)
+        self.progress.emit(total)
+
+    def _on_event(self, kind: str, stage: str, data):
+        if kind == "start":
+            self.log.emit(f"Stage started: {stage}")
+        elif kind == "done":
+            self.stage_done.emit(stage, "" if data is None else str(data))
+        elif kind == "failed":
+            self.log.emit(f"Stage FAILED: {stage}: {data}")
+        elif kind == "skipped":
+            self.log.emit(f"Stage skipped: {stage} (dependency failed)")
+
+    def start(self):
+        return self.pool.submit(self.run)
 
     def run(self):
         try:
-            self.status.emit("A2L addressing started")
-            self.progress.emit(5)
-
-            # Output isimleri
-            if self.selected_project == "project1": 
-                name = "pj1"
-            if self.selected_project == "project2": 
-                name = "pj2"
-            
-            out_a2l = self.out_dir / f"{name}_ecu_{self.svn_num}.a2l"
-            out_csv = self.out_dir / f"{name}_ecu_{self.svn_num}.csv"
-
-            self.log.emit(f"Input A2L : {self.a2l_in}")
-            self.log.emit(f"Input ELF : {self.elf_path}")
-            self.log.emit(f"Output A2L: {out_a2l}")
-            self.log.emit(f"Output CSV: {out_csv}")
-            self.progress.emit(10)
-
-            # ELF aç + symbol map
-            self.status.emit("Loading ELF & symbols")
-            with self.elf_path.open("rb") as f:
-                elf = ELFFile(f)
-                symmap = build_symbol_map(elf)
-                self.progress.emit(40)
-
-                # A2L işlem
-                self.status.emit("Resolving ECU addresses in A2L")
-                process_a2l(self.a2l_in, out_a2l, elf, symmap, out_csv)
-                self.progress.emit(100)
-
-            self.status.emit("Done")
-            self.finished.emit(str(out_a2l))
+            ctx = StageContext(log=self.log.emit, status=self.status.emit,
+                               progress=self._on_progress, cancel=self._cancel.is_set)
+            res = run_release(self.cfg, ctx, on_event=self._on_event, pool=self.pool)
+            for name, (t0, t1) in res.timings.items():
+                if t1 is not None:
+                    self.log.emit(f"  {name:<8} {t1 - t0:7.1f} s")
+            self.log.emit(f"Pipeline wall time: {res.wall_s:.1f} s")
+            if res.ok:
+                self.status.emit("Done")
+                self.finished.emit()
+            else:
+                errs = "\n\n".join(
+                    f"[{n}] {e}\n" + "".join(traceback.format_exception(type(e), e, e.__traceback__))
+                    for n, e in res.errors.items())
+                self.failed.emit(errs or "Pipeline did not complete")
 
         except Exception as e:
             tb = traceback.format_exc()
             self.failed.emit(f"{e}\n\n{tb}")
 
 
-class Trace32Worker(QObject):
-    log = Signal(str)
-    status = Signal(str)
-    finished = Signal()
-    failed = Signal(str)
-
-    def __init__(self, elf_path: str, boot_path: str):
-        super().__init__()
-        self.elf_path = elf_path
-        self.boot_path = boot_path
-
-    def run(self):
-        try:
-            self.status.emit("TRACE32 flashing started")
-            self.log.emit(f"TRACE32: flashing BOOT -> {self.boot_path}")
-            self.log.emit(f"TRACE32: flashing ELF -> {self.elf_path}")
-
-            t32.run_flash(self.elf_path, self.boot_path)
-
-            self.status.emit("TRACE32 flashing done")
-            self.finished.emit()
-
-        except Exception as e:
-            self.failed.emit(str(e))
-
-class VisionWorker(QObject):
-    log = Signal(str)
-    status = Signal(str)
-    finished = Signal()
-    failed = Signal(str)
-
-    def __init__(self,a2l_path,s19_path: str):
-        super().__init__()
-        self.a2l_path = a2l_path
-        self.s19_path = s19_path
-
-
-    def run(self):
-        try:
-            self.status.emit("Vision is starting...")
-            self.log.emit(f"Vision S19-> {self.s19_path}")
-            self.log.emit(f"Vision S19-> {self.a2l_path}")
-
-            ati_vision.ecu_connection_on_vision(self.a2l_path,self.s19_path)
-
-            self.status.emit("Vision operation finished.")
-            self.finished.emit()
-
-        except Exception as e:
-            self.failed.emit(str(e))
-
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Software Release Tool")
         self.setWindowIcon(QIcon('logo.jpg'))
         self.resize(1100, 650)
-        self.pending_cfg = None            # mevcut akış config’i
         self.addressed_a2l_path = None     # output dir’de üretilen addressed a2l
         self.selected_project = None       # kullanıcının ekranda sectigi proje 
         # Kalıcı ayarlar (son kullanılan path'leri hatırlasın)
@@ -178,6 +150,9 @@ class MainWindow(QMainWindow):
         self.elf_edit = QLineEdit()
         self.elf_btn = QPushButton("Browse...")
         self.elf_btn.clicked.connect(lambda: self._pick_file(self.elf_edit, "Elf File (*.elf);"))
+        # Geçerli bir ELF yolu girilir girilmez indeksi arka planda kur (_pick_file / _restore_settings)
+        self._prefetched_elf = None
+        self.elf_edit.textChanged.connect(self._prefetch_elf)
 
         self.out_edit = QLineEdit()
         self.out_btn = QPushButton("Browse...")
@@ -185,6 +160,13 @@ class MainWindow(QMainWindow):
 
         self.svn_num = QLineEdit()
 
+        # Aynı ECU'ya tekrar koşuda (ör. Vision hatası sonrası) başarılı flash checkpoint'ten atlanır
+        self.target_edit = QLineEdit()
+        self.target_edit.setPlaceholderText("ECU / bench label")
+        self.resume_flash_chk = QCheckBox("Resume flash (same ECU)")
+        # Stage süreleri + Chrome trace (output_dir/release_trace.json), özet log'a basılır
+        self.trace_chk = QCheckBox("Timing trace")
+
         self.project_combo = QComboBox()
         self.project_combo.addItem("project1")
         self.project_combo.addItem("project2")
@@ -217,6 +199,11 @@ class MainWindow(QMainWindow):
 
         input_layout.addWidget(QLabel("Svn Number:"), 5, 0)
         input_layout.addWidget(self.svn_num, 5, 1)
+
+        input_layout.addWidget(QLabel("Target ID:"), 6, 0)
+        input_layout.addWidget(self.target_edit, 6, 1)
+        input_layout.addWidget(self.resume_flash_chk, 7, 1)
+        input_layout.addWidget(self.trace_chk, 8, 1)
         
         input_layout.addWidget(QLabel("Select Project"),10 , 0)
         input_layout.addWidget(self.project_combo,10,1)
@@ -231,8 +218,13 @@ class MainWindow(QMainWindow):
         self.run_btn = QPushButton("Run")
         self.run_btn.clicked.connect(self.on_run_clicked)
 
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.on_cancel_clicked)
+
         btn_row = QHBoxLayout()
         btn_row.addWidget(self.run_btn)
+        btn_row.addWidget(self.cancel_btn)
         btn_row.addStretch(1)
 
         left_col = QVBoxLayout()
@@ -254,12 +246,14 @@ class MainWindow(QMainWindow):
         self.log = QPlainTextEdit()
         self.log.setReadOnly(True)
         self.log.setLineWrapMode(QPlainTextEdit.NoWrap)
+        # Toplu/throttled log: ring buffer + QTimer flush + dönen dosya
+        self.log_sink = LogSink(self.log, str(Path.cwd() / "logs" / "release_gui.log"), self)
 
         self.copy_log_btn = QPushButton("Copy Log")
         self.copy_log_btn.clicked.connect(self.on_copy_log)
 
         self.clear_log_btn = QPushButton("Clear Log")
-        self.clear_log_btn.clicked.connect(self.log.clear)
+        self.clear_log_btn.clicked.connect(self.log_sink.clear)
 
         log_btn_row = QHBoxLayout()
         log_btn_row.addWidget(self.clear_log_btn)
@@ -291,8 +285,8 @@ class MainWindow(QMainWindow):
     # UI helpers
     # -------------------------
     def _log_info(self, msg: str) -> None:
-        ts = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-        self.log.appendPlainText(f"[{ts}] {msg}")
+        # Her thread'den güvenli; widget'a LogSink'in zamanlayıcısı basar
+        self.log_sink.write(msg)
 
     def _set_status(self, msg: str) -> None:
         self.status_label.setText(f"Status: {msg}")
@@ -304,6 +298,14 @@ class MainWindow(QMainWindow):
             target_edit.setText(path)
             self._save_settings()  # her seçimde kaydet
 
+    def _prefetch_elf(self, text: str) -> None:
+        p = Path(text.strip())
+        if not p.is_file() or str(p) == self._prefetched_elf:
+            return
+        self._prefetched_elf = str(p)
+        workers.get_pool().prefetch_elf(str(p))
+        self._log_info(f"ELF index is being prepared in background: {p.name}")
+
     def _pick_dir(self, target_edit: QLineEdit) -> None:
         start_dir = self._best_start_dir()
         path = QFileDialog.getExistingDirectory(self, "Select output directory", start_dir)
@@ -346,6 +348,9 @@ class MainWindow(QMainWindow):
 
         if svn_num < 0:
             return False, "SVN ID negatif olamaz."
+
+        if self.resume_flash_chk.isChecked() and not self.target_edit.text().strip():
+            return False, "Resume flash için Target ID girilmeli."
     
         return True, ""
 
@@ -373,11 +378,18 @@ class MainWindow(QMainWindow):
         self._log_info(f"Output Dir: {cfg.output_dir}")
 
         # Backend
-        self._start_a2l_addressing(cfg)
+        self._start_pipeline(cfg)
+
 
+    def on_cancel_clicked(self) -> None:
+        worker = getattr(self, "pipeline_worker", None)
+        if worker is not None and self.cancel_btn.isEnabled():
+            self._log_info("Cancel requested -> running stages will be stopped")
+            worker.request_cancel()
+            self.cancel_btn.setEnabled(False)
 
     def on_copy_log(self) -> None:
-        QApplication.clipboard().setText(self.log.toPlainText())
+        QApplication.clipboard().setText(self.log_sink.text())
         self._log_info("Log clipboard'a kopyalandı.")
 
     def on_save_preset(self) -> None:
@@ -419,6 +431,9 @@ class MainWindow(QMainWindow):
             boot_path=self.boot_edit.text().strip(),
             elf_path=self.elf_edit.text().strip(),
             output_dir=self.out_edit.text().strip(),
+            target_id=self.target_edit.text().strip(),
+            resume_flash=self.resume_flash_chk.isChecked(),
+            trace=self.trace_chk.isChecked(),
         )
 
     def _apply_config(self, cfg: UiConfig) -> None:
@@ -426,6 +441,9 @@ class MainWindow(QMainWindow):
         self.s19_edit.setText(cfg.s19_path)
         self.elf_edit.setText(cfg.elf_path)
         self.out_edit.setText(cfg.output_dir)
+        self.target_edit.setText(cfg.target_id)
+        self.resume_flash_chk.setChecked(cfg.resume_flash)
+        self.trace_chk.setChecked(cfg.trace)
 
     def _save_settings(self) -> None:
         cfg = self._collect_config()
@@ -433,6 +451,9 @@ class MainWindow(QMainWindow):
         self.settings.setValue("s19_path", cfg.s19_path)
         self.settings.setValue("elf_path", cfg.elf_path)
         self.settings.setValue("output_dir", cfg.output_dir)
+        self.settings.setValue("target_id", cfg.target_id)
+        self.settings.setValue("resume_flash", cfg.resume_flash)
+        self.settings.setValue("trace", cfg.trace)
 
     def _restore_settings(self) -> None:
         cfg = UiConfig(
@@ -440,149 +461,82 @@ class MainWindow(QMainWindow):
             s19_path=self.settings.value("s19_path", "", type=str),
             elf_path=self.settings.value("elf_path", "", type=str),
             output_dir=self.settings.value("output_dir", "", type=str),
+            target_id=self.settings.value("target_id", "", type=str),
+            resume_flash=self.settings.value("resume_flash", False, type=bool),
+            trace=self.settings.value("trace", False, type=bool),
         )
         self._apply_config(cfg)
 
-    def _start_a2l_addressing(self, cfg: UiConfig) -> None:
+    def _start_pipeline(self, cfg: UiConfig) -> None:
         # UI state
         self.run_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
         self.progress.setValue(0)
-        self._set_status("Starting A2L addressing...")
+        self._set_status("Starting release pipeline...")
+
+        rcfg = ReleaseConfig(
+            a2l_path=cfg.a2l_path,
+            s19_path=os.path.normpath(cfg.s19_path),
+            boot_path=cfg.boot_path,
+            elf_path=cfg.elf_path,
+            output_dir=cfg.output_dir,
+            svn_number=self.svn_num.text().strip(),
+            project=self.selected_project,
+            resume_flash=cfg.resume_flash,
+            target_id=cfg.target_id,
+            trace=cfg.trace,
+        )
 
-        # Thread + Worker
-        self.thread = QThread(self)
-        self.worker = A2LAddressWorker(cfg.a2l_path, cfg.elf_path, cfg.output_dir, self.svn_num.text(),self.selected_project)
-        self.worker.moveToThread(self.thread)
+        # Worker (havuz ilk koşuda kurulur, pencere kapanana kadar yaşar)
+        self.pipeline_worker = PipelineWorker(rcfg, workers.get_pool())
 
         # Signals
-        self.thread.started.connect(self.worker.run)
-        self.worker.log.connect(self._log_info)
-        self.worker.progress.connect(self.progress.setValue)
-        self.worker.status.connect(self._set_status)
-
-        self.worker.finished.connect(self._on_a2l_done)
-        self.worker.failed.connect(self._on_a2l_failed)
-
-        # Cleanup
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.failed.connect(self.thread.quit)
-        self.thread.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        self.thread.start()
-
-    def _on_vision_done(self):
-        self._log_info("VISION OK")
+        # DirectConnection: her satır için GUI olayı kuyruklanmaz, LogSink kendisi toplar
+        self.pipeline_worker.log.connect(self._log_info, Qt.DirectConnection)
+        self.pipeline_worker.progress.connect(self.progress.setValue)
+        self.pipeline_worker.status.connect(self._set_status)
+        self.pipeline_worker.stage_done.connect(self._on_stage_done)
+
+        self.pipeline_worker.finished.connect(self._on_pipeline_done)
+        self.pipeline_worker.failed.connect(self._on_pipeline_failed)
+
+        self.pipeline_worker.start()
+
+    def _on_stage_done(self, stage: str, output: str) -> None:
+        if stage == "address":
+            # önemli: bu ORIGINAL A2L değil, addressed A2L
+            self.addressed_a2l_path = output
+            self._set_status("A2L addressing completed")
+        elif stage == "flash":
+            self._set_status("TRACE32 flashing done")
+        elif stage == "vision":
+            self._set_status("Vision operation finished.")
+        elif stage == "bundle":
+            self._set_status("Release bundle created")
+
+    def _on_pipeline_done(self) -> None:
+        self._log_info("Release pipeline OK")
         self._set_status("Ready")
-        self._pending_cfg = None
+        self.progress.setValue(100)
+        self.cancel_btn.setEnabled(False)
         self.run_btn.setEnabled(True)
 
-    def _on_vision_failed(self, err: str):
-        self._log_info("VISION FAILED")
-        self._log_info(err)
-        QMessageBox.critical(self, "VISION Error", "Vision operation failed")
-        self._set_status("Vision failed")
-        self._pending_cfg = None
-        self.run_btn.setEnabled(True)
-
-    def _create_vision_package(self, a2l_path, s19_path: str):
-        self.run_btn.setEnabled(False)
-        self.progress.setValue(0)
-        self._set_status("Starting vision...")
-
-        self.vision_thread = QThread(self)
-        self.vison_worker = VisionWorker(a2l_path,s19_path)
-        self.vison_worker.moveToThread(self.vision_thread)
-
-        # thread → worker
-        self.vision_thread.started.connect(self.vison_worker.run)
-
-        # worker → GUI
-        self.vison_worker.log.connect(self._log_info)
-        self.vison_worker.status.connect(self._set_status)
-        self.vison_worker.finished.connect(self._on_vision_done)
-        self.vison_worker.failed.connect(self._on_vision_failed)
-
-        # cleanup
-        self.vison_worker.finished.connect(self.vision_thread.quit)
-        self.vison_worker.failed.connect(self.vision_thread.quit)
-        self.vision_thread.finished.connect(self.vison_worker.deleteLater)
-        self.vision_thread.finished.connect(self.vision_thread.deleteLater)
-
-        self.vision_thread.start()
-
-    def _start_trace32_flash(self, elf_path: str, boot_path: str):
-        self.run_btn.setEnabled(False)
-        self.progress.setValue(0)
-        self._set_status("Starting TRACE32 flash...")
-
-        self.t32_thread = QThread(self)
-        self.t32_worker = Trace32Worker(elf_path, boot_path)
-        self.t32_worker.moveToThread(self.t32_thread)
-
-        # thread → worker
-        self.t32_thread.started.connect(self.t32_worker.run)
-
-        # worker → GUI
-        self.t32_worker.log.connect(self._log_info)
-        self.t32_worker.status.connect(self._set_status)
-        self.t32_worker.finished.connect(self._on_t32_done)
-        self.t32_worker.failed.connect(self._on_t32_failed)
-
-        # cleanup
-        self.t32_worker.finished.connect(self.t32_thread.quit)
-        self.t32_worker.failed.connect(self.t32_thread.quit)
-        self.t32_thread.finished.connect(self.t32_worker.deleteLater)
-        self.t32_thread.finished.connect(self.t32_thread.deleteLater)
-
-        self.t32_thread.start()
-        
-    def _on_a2l_done(self, out_a2l_path: str) -> None:
-        self._log_info(f"A2L addressing OK. Output: {out_a2l_path}")
-        self._set_status("A2L addressing completed")
-
-        cfg = self._collect_config()
-
-        # önemli: bu ORIGINAL A2L değil, addressed A2L
-        cfg.addressed_a2l_path = out_a2l_path
-
-        self._pending_cfg = cfg
-
-        # Trace32’ye geç
-        self._start_trace32_flash(cfg.elf_path, cfg.boot_path)
-
-
-    def _on_a2l_failed(self, err: str) -> None:
-        self._log_info("A2L addressing FAILED:")
+    def _on_pipeline_failed(self, err: str) -> None:
+        self._log_info("Release pipeline FAILED:")
         self._log_info(err)
-        QMessageBox.critical(self, "A2L addressing failed", "A2L addressing sırasında hata oluştu. Log'u kontrol et.")
-        self._set_status("A2L addressing failed")
+        QMessageBox.critical(self, "Release failed", "Release sırasında hata oluştu. Log'u kontrol et.")
+        self._set_status("Release failed")
+        self.cancel_btn.setEnabled(False)
         self.run_btn.setEnabled(True)
 
-    def _on_t32_done(self):
-        self._log_info("TRACE32 flash OK")
-
-        if self._pending_cfg is None:
-            self._log_info("WARN: TRACE32 finished but no pending config found. Skipping VISION.")
-            self._set_status("Ready")
-            self.run_btn.setEnabled(True)
-            return
-
-
-        cfg = self._pending_cfg
-        if not cfg:
-            return
-        a2l = os.path.normpath(cfg.addressed_a2l_path)
-        s19 = os.path.normpath(cfg.s19_path)
-        print(a2l)
-        print(s19)
-        self._create_vision_package(a2l, s19)
-
-    def _on_t32_failed(self, err: str):
-        self._log_info("TRACE32 flash FAILED")
-        self._log_info(err)
-        QMessageBox.critical(self, "TRACE32 Error", "TRACE32 flash failed")
-        self.run_btn.setEnabled(True)
+    def closeEvent(self, event) -> None:
+        # Sıcak T32/Vision oturumlarını ve adresleme sürecini kapat
+        worker = getattr(self, "pipeline_worker", None)
+        if worker is not None:
+            worker.request_cancel()
+        workers.close_pool()
+        self.log_sink.close()
+        super().closeEvent(event)
 
 def main():
     app = QApplication(sys.argv)
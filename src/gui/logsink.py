@@ -0,0 +1,123 @@
+"""
+GUI log altyapısı.
+- write() her thread'den çağrılabilir; satır zaman damgalanır, sınırlı halka tampona ve
+  bekleyen listeye eklenir (kilit altında, Qt çağrısı yok).
+- QTimer her FLUSH_MS'de bekleyenleri tek appendPlainText ile widget'a basar ve aynı
+  partiyi dönen (rotating) log dosyasına yazar.
+- Widget blok sayısı VIEW_LINES ile sınırlı; taşma olursa atlanan satır sayısı yazılır,
+  tam log dosyada kalır.
+"""
+import os
+import time
+import threading
+from collections import deque
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QPlainTextEdit
+
+FLUSH_MS = 100
+RING_LINES = 20000          # Copy Log için bellekte tutulan son satırlar
+VIEW_LINES = 5000           # widget'ta tutulan satırlar
+PENDING_MAX = 5000          # bir flush'ta widget'a basılacak en fazla satır
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 5
+
+
+class RotatingLogFile:
+    """app.log -> app.log.1 -> ... -> app.log.N dönen basit dosya."""
+
+    def __init__(self, path: str, max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("ab")      # ikili: tell() ve sınır UTF-8 byte cinsinden
+
+    def _rollover(self):
+        self._f.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = Path(f"{self.path}.{i}")
+            if src.exists():
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self._f = self.path.open("ab")
+
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        if self._f.tell() + len(data) > self.max_bytes and self._f.tell() > 0:
+            self._rollover()
+        self._f.write(data)
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class LogSink(QObject):
+    def __init__(self, view: QPlainTextEdit, log_path: str = "", parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.view.setMaximumBlockCount(VIEW_LINES)
+        self.ring = deque(maxlen=RING_LINES)
+        self._pending = deque()
+        self._file_batch = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self.file = None
+        if log_path:
+            try:
+                self.file = RotatingLogFile(log_path)
+            except OSError as e:
+                self.ring.append(f"Log file could not be opened: {e}")
+        self._timer = QTimer(self)
+        self._timer.setInterval(FLUSH_MS)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def write(self, msg: str) -> None:
+        line = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}"
+        with self._lock:
+            self.ring.append(line)
+            self._pending.append(line)
+            if len(self._pending) > PENDING_MAX:
+                # Ekran yetişemiyor: en eskiyi ekrandan düş (ring ve dosyada kalır)
+                self._pending.popleft()
+                self._dropped += 1
+            self._file_batch.append(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending and not self._file_batch:
+                return
+            lines, self._pending = list(self._pending), deque()
+            batch, self._file_batch = self._file_batch, []
+            dropped, self._dropped = self._dropped, 0
+        if self.file is not None and batch:
+            try:
+                self.file.write("\n".join(batch) + "\n")
+            except OSError:
+                self.file = None
+        if dropped:
+            lines.insert(0, f"... {dropped} line(s) not shown (see log file)")
+        if lines:
+            self.view.appendPlainText("\n".join(lines))
+
+    def text(self) -> str:
+        with self._lock:
+            return "\n".join(self.ring)
+
+    def clear(self) -> None:
+        # Ekran ve Copy Log tamponu temizlenir; dosya olduğu gibi kalır
+        with self._lock:
+            self.ring.clear()
+            self._pending.clear()
+            self._dropped = 0
+        self.view.clear()
+
+    def close(self) -> None:
+        self._timer.stop()
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
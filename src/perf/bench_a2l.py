@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Adresleme motoru benchmark'ı (sentetik ELF/A2L ile, perf/synth_elf.py).
+Ölçülenler (en iyi / --repeat):
+  symbol_map          : build_symbol_map
+  var_index           : build_global_var_index (DWARF global değişken indeksi)
+  resolve_indexed_1k  : 1000 resolve_struct_member_addr, indeksli
+  resolve_scan_1k     : aynısı CU taramasıyla (örnekten 1000'e ölçeklenir)
+  end_to_end_<N>      : ELF aç + indeks + process_a2l, N parametre
+Sonuçlar baseline ile karşılaştırılır; tolerans aşılırsa çıkış kodu 1.
+
+  PYTHONPATH=src python -m perf.bench_a2l --params 1000,10000,100000 [--save-baseline]
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+from elftools.elf.elffile import ELFFile
+from a2l.main_a2l import build_symbol_map, resolve_struct_member_addr, process_a2l
+from a2l.elf_index import ElfIndex, build_global_var_index
+from perf.synth_elf import SynthSpec, build_elf, write_a2l, param_names
+
+WORKDIR = "bench_work"
+BASELINE = str(Path(WORKDIR) / "a2l_baseline.json")
+SCAN_SAMPLE = 50
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_benchmarks(spec: SynthSpec, sizes: list, repeat: int = 3, workdir: str = WORKDIR, log=print) -> dict:
+    elf_path = build_elf(spec, workdir)
+    log(f"ELF: {elf_path} ({elf_path.stat().st_size / 1e6:.1f} MB)")
+    res = {}
+    with open(elf_path, "rb") as f:
+        elf = ELFFile(f)
+        res["symbol_map"] = best_of(lambda: build_symbol_map(elf), repeat)
+        dw = elf.get_dwarf_info()
+        res["var_index"] = best_of(lambda: build_global_var_index(dw), repeat)
+
+        symmap = build_symbol_map(elf)
+        var_dies = build_global_var_index(dw)
+        probe = SynthSpec(**dict(asdict(spec), params=4000, struct_ratio=1.0, missing_ratio=0.0))
+        names = list(param_names(probe))[:1000]
+
+        def indexed():
+            for n in names:
+                resolve_struct_member_addr(elf, dw, symmap, n, var_dies)
+        res["resolve_indexed_1k"] = best_of(indexed, repeat)
+
+        sample = names[:SCAN_SAMPLE]
+
+        def scan():
+            for n in sample:
+                resolve_struct_member_addr(elf, dw, symmap, n)
+        res["resolve_scan_1k"] = best_of(scan, 1) * (len(names) / len(sample))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            a2l = write_a2l(SynthSpec(**dict(asdict(spec), params=n)), Path(workdir) / f"synth_{n}.a2l")
+
+            def e2e():
+                idx = ElfIndex(str(elf_path))
+                try:
+                    process_a2l(a2l, Path(tmp) / "out.a2l", idx.elf, idx.symmap, Path(tmp) / "out.csv",
+                                idx.dwarfinfo, idx.var_dies)
+                finally:
+                    idx.close()
+            res[f"end_to_end_{n}"] = best_of(e2e, repeat if n <= 100000 else 1)
+            log(f"  end_to_end_{n}: {res[f'end_to_end_{n}']:.3f} s")
+    return res
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """(ad, şimdi, baseline, oran, regresyon_mu) listesi."""
+    rows = []
+    for name, now in results.items():
+        base = baseline.get(name)
+        ratio = now / base if base else None
+        rows.append((name, now, base, ratio, ratio is not None and ratio > 1.0 + tolerance))
+    return rows
+
+
+def format_rows(rows: list) -> str:
+    lines = [f"{'benchmark':<24} {'now s':>9} {'base s':>9} {'ratio':>7}"]
+    for name, now, base, ratio, bad in rows:
+        b = "-" if base is None else f"{base:.4f}"
+        r = "-" if ratio is None else f"{ratio:.2f}"
+        lines.append(f"{name:<24} {now:>9.4f} {b:>9} {r:>7}{'  REGRESSION' if bad else ''}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="A2L adresleme benchmark'ı (baseline karşılaştırmalı)")
+    ap.add_argument("--params", default="1000,10000,100000", help="virgüllü parametre sayıları (1000000 dahil edilebilir)")
+    ap.add_argument("--cus", type=int, default=50)
+    ap.add_argument("--symbols", type=int, default=20000)
+    ap.add_argument("--depth", type=int, default=3)
+    ap.add_argument("--cc", default="gcc")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--workdir", default=WORKDIR)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.20, help="izin verilen yavaşlama oranı")
+    args = ap.parse_args(argv)
+
+    spec = SynthSpec(args.cus, args.symbols, args.depth, cc=args.cc)
+    sizes = [int(x) for x in args.params.split(",") if x.strip()]
+    results = run_benchmarks(spec, sizes, args.repeat, args.workdir)
+
+    meta = {"spec": asdict(spec), "python": platform.python_version(), "machine": platform.node(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S")}
+    base_path = Path(args.baseline)
+    baseline = {}
+    if base_path.exists():
+        data = json.loads(base_path.read_text(encoding="utf-8"))
+        if data.get("meta", {}).get("spec") != meta["spec"]:
+            print("Uyarı: baseline farklı bir sentetik spec ile alınmış")
+        baseline = data.get("results", {})
+    rows = compare(results, baseline, args.tolerance)
+    print(format_rows(rows))
+
+    if args.save_baseline:
+        base_path.parent.mkdir(parents=True, exist_ok=True)
+        base_path.write_text(json.dumps({"meta": meta, "results": results}, indent=1), encoding="utf-8")
+        print(f"Baseline kaydedildi: {base_path}")
+        return 0
+    return 1 if any(r[4] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Uçtan uca release hattı benchmark'ı (DLL/COM'suz): adresleme gerçek, TRACE32 ve Vision
+mock_t32api / mock_vision ile, gecikmeleri ayarlanabilir.
+
+Her koşu için:
+  wall              : run_release duvar süresi
+  <stage>           : stage süreleri
+  simulated         : mock'ların taklit ettiği cihaz/araç süresi (script, upload, çağrı gecikmeleri)
+  sleep             : orkestrasyonun yoklama uykuları (t32.sleep_ms + vision.sleep_ms sayaçları)
+  overshoot         : stage süresi - simüle süre; orkestrasyonun eklediği bekleme + gerçek iş
+
+  PYTHONPATH=src python -m perf.bench_pipeline --runs 3 --script-s 2 --upload-s 1.5
+"""
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+
+from a2l.hexfile import write_srec
+from a2l.elf_image import ElfImage
+from perf import timing
+from perf.synth_elf import SynthSpec, build_elf, write_a2l
+from pipeline.release import ReleaseConfig, StageContext, run_release
+from pipeline.workers import WorkerPool
+from t32 import t32, mock_t32api
+from vision import ati_vision, mock_vision
+
+WORKDIR = "bench_work"
+
+
+def make_inputs(workdir: str, params: int) -> tuple:
+    """Sentetik ELF + A2L + uygulama S19 + BOOT S19."""
+    spec = SynthSpec(cus=10, symbols=2000, depth=2, params=params)
+    elf = build_elf(spec, workdir)
+    a2l = write_a2l(spec, Path(workdir) / f"synth_{params}.a2l")
+    s19 = Path(workdir) / "app.s19"
+    boot = Path(workdir) / "boot.s19"
+    with ElfImage(elf) as img:
+        write_srec(s19, [(a, bytes(mv)) for a, mv in img.load_chunks()], "APP")
+    write_srec(boot, [(0x100, bytes(range(256)) * 4)], "BOOT")
+    return str(elf), str(a2l), str(s19), str(boot)
+
+
+def install_mocks(args) -> tuple:
+    rcl_mode, port, packlen = t32.read_config(t32.CONFIG_PATH)
+    api = mock_t32api.MockT32Api(boot_delay_s=args.boot_s, script_time_s=args.script_s,
+                                 call_latency_s=args.t32_latency_s, program_on_do=True)
+    # t32_exe yok -> launch() TRACE32 başlatmaz; get_session() aynı oturumu döndürür
+    t32.set_session(t32.T32Session(rcl_mode, port, packlen, api_loader=lambda: api))
+    vis = mock_vision.MockVision(upload_s=args.upload_s, open_s=args.open_s, import_s=args.import_s,
+                                 save_s=args.save_s, call_latency_s=args.com_latency_s)
+    ati_vision.set_session(ati_vision.VisionSession(dispatch=vis.dispatch, com_init=False))
+    return api, vis
+
+
+def run_once(cfg: ReleaseConfig, pool: WorkerPool, api, vis) -> dict:
+    t_sim0, v_sim0 = api.simulated_s, vis.simulated_s
+    timing.enable()
+    timing.reset()
+    res = run_release(cfg, StageContext(log=lambda m: None), pool=pool)
+    _, counters = timing.snapshot()
+    timing.enable(False)
+    if not res.ok:
+        raise RuntimeError(f"pipeline failed: {res.errors} skipped={res.skipped}")
+    row = {"wall": res.wall_s}
+    for name, (t0, t1) in res.timings.items():
+        row[name] = t1 - t0
+    row["flash_simulated"] = api.simulated_s - t_sim0
+    row["vision_simulated"] = vis.simulated_s - v_sim0
+    row["flash_sleep"] = counters.get("t32.sleep_ms", 0) / 1000.0
+    row["vision_sleep"] = counters.get("vision.sleep_ms", 0) / 1000.0
+    row["flash_overshoot"] = row.get("flash", 0.0) - row["flash_simulated"]
+    row["vision_overshoot"] = row.get("vision", 0.0) - row["vision_simulated"]
+    row["t32_calls"] = sum(api.calls.values())
+    return row
+
+
+def format_rows(rows: list) -> str:
+    keys = ["wall", "address", "flash", "flash_simulated", "flash_sleep", "flash_overshoot",
+            "vision", "vision_simulated", "vision_sleep", "vision_overshoot", "bundle"]
+    lines = [f"{'run':>3} " + " ".join(f"{k:>16}" for k in keys)]
+    for i, r in enumerate(rows, 1):
+        lines.append(f"{i:>3} " + " ".join(f"{r.get(k, 0.0):>16.3f}" for k in keys))
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Mock TRACE32/Vision ile uçtan uca release benchmark'ı")
+    ap.add_argument("--runs", type=int, default=3, help="ilk koşu soğuk, sonrakiler sıcak oturumla")
+    ap.add_argument("--params", type=int, default=10000)
+    ap.add_argument("--boot-s", type=float, default=0.5, help="TRACE32 açılış süresi")
+    ap.add_argument("--script-s", type=float, default=2.0, help="startup.cmm (flash) süresi")
+    ap.add_argument("--t32-latency-s", type=float, default=0.0005, help="her T32_* çağrısı")
+    ap.add_argument("--upload-s", type=float, default=1.5)
+    ap.add_argument("--open-s", type=float, default=0.3)
+    ap.add_argument("--import-s", type=float, default=0.2)
+    ap.add_argument("--save-s", type=float, default=0.1)
+    ap.add_argument("--com-latency-s", type=float, default=0.001)
+    ap.add_argument("--workdir", default=WORKDIR)
+    ap.add_argument("--json", default="", help="sonuçları JSON olarak yaz")
+    args = ap.parse_args(argv)
+
+    elf, a2l, s19, boot = make_inputs(args.workdir, args.params)
+    api, vis = install_mocks(args)
+    rows = []
+    pool = WorkerPool()
+    try:
+        with tempfile.TemporaryDirectory() as out:
+            cfg = ReleaseConfig(a2l, s19, boot, elf, out, "1", resume=False, history=False,
+                                vst_out=str(Path(out) / "bench.vst"))
+            for _ in range(args.runs):
+                rows.append(run_once(cfg, pool, api, vis))
+    finally:
+        pool.shutdown()
+    print(format_rows(rows))
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=1), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
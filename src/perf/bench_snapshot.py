@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Snapshot/diff benchmark'ı (t32/snapshot.py), mock_t32api üzerinden.
+N nesneli adreslenmiş A2L üretilir, mock belleğe rastgele değerler yüklenir; iki snapshot
+arasında --changes nesne değiştirilir. Ölçülenler: A2L okuma, capture, kaydet/yükle, diff.
+
+  PYTHONPATH=src python -m perf.bench_snapshot --params 50000 --latency-s 0.0002
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+from t32 import t32, bulkmem, mock_t32api, snapshot
+
+BASE = 0x40000000
+
+
+def write_addressed_a2l(path: Path, n: int, seed: int = 1) -> list:
+    """CHARACTERISTIC (FLOAT32 VALUE, 8'li VAL_BLK) ve MEASUREMENT (UWORD) karışık; (addr, size) listesi."""
+    rnd = random.Random(seed)
+    layout, addr = [], BASE
+    with path.open("w", encoding="utf-8") as f:
+        f.write('ASAP2_VERSION 1 61\n/begin PROJECT P ""\n/begin MODULE M ""\n'
+                "/begin RECORD_LAYOUT Scalar_FLOAT32 FNC_VALUES 1 FLOAT32_IEEE COLUMN_DIR DIRECT /end RECORD_LAYOUT\n")
+        for k in range(n):
+            addr += rnd.choice((0, 0, 4, 8, 16, 128))      # yer yer boşluklu yerleşim
+            if k % 3 == 2:
+                f.write(f'/begin MEASUREMENT M{k} "" UWORD NO_COMPU_METHOD 0 0 0 65535 '
+                        f"ECU_ADDRESS 0x{addr:X} /end MEASUREMENT\n")
+                size = 2
+            elif k % 10 == 0:
+                f.write(f'/begin CHARACTERISTIC C{k} "" VAL_BLK 0x{addr:X} Scalar_FLOAT32 0 NO_COMPU_METHOD 0 100 '
+                        f"NUMBER 8 /end CHARACTERISTIC\n")
+                size = 32
+            else:
+                f.write(f'/begin CHARACTERISTIC C{k} "" VALUE 0x{addr:X} Scalar_FLOAT32 0 NO_COMPU_METHOD 0 100 '
+                        f"/end CHARACTERISTIC\n")
+                size = 4
+            layout.append((addr, size))
+            addr += size
+        f.write("/end MODULE\n/end PROJECT\n")
+    return layout
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Mock TRACE32 ile snapshot/diff benchmark'ı")
+    ap.add_argument("--params", type=int, default=50000)
+    ap.add_argument("--changes", type=int, default=100, help="iki snapshot arasında değiştirilen nesne")
+    ap.add_argument("--latency-s", type=float, default=0.0002, help="her T32_* çağrısı")
+    ap.add_argument("--packlen", default="1024", help="UDP PACKLEN (okuma bloğu)")
+    args = ap.parse_args(argv)
+
+    api = mock_t32api.MockT32Api(call_latency_s=args.latency_s)
+    sess = t32.T32Session("UDP", "20000", args.packlen, api_loader=lambda: api)
+    sess.ensure()
+    rnd = random.Random(2)
+    times = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        a2l = Path(tmp) / "addressed.a2l"
+        layout = write_addressed_a2l(a2l, args.params)
+        end = layout[-1][0] + layout[-1][1]
+        api.load([(BASE, os.urandom(end - BASE))])
+
+        t0 = time.perf_counter()
+        items = snapshot.read_plan_items(a2l.read_text(encoding="utf-8"))
+        times["read_a2l"] = time.perf_counter() - t0
+
+        stats = bulkmem.BulkStats()
+        t0 = time.perf_counter()
+        s1 = snapshot.capture(sess, items, stats=stats)
+        times["capture"] = time.perf_counter() - t0
+
+        for addr, size in rnd.sample(layout, args.changes):
+            api.write(addr, os.urandom(size))
+        s2 = snapshot.capture(sess, items)
+
+        t0 = time.perf_counter()
+        snapshot.save(s1, Path(tmp) / "a.snap")
+        snapshot.save(s2, Path(tmp) / "b.snap")
+        a, b = snapshot.load(Path(tmp) / "a.snap"), snapshot.load(Path(tmp) / "b.snap")
+        times["save_load_x2"] = time.perf_counter() - t0
+        size = (Path(tmp) / "a.snap").stat().st_size
+
+        t0 = time.perf_counter()
+        d = snapshot.diff(a, b)
+        times["diff"] = time.perf_counter() - t0
+
+    print(f"{len(items)} nesne, {stats.ranges} aralık, {stats.calls} T32_ReadMemory, {stats.bytes} byte, "
+          f"snapshot {size / 1e6:.2f} MB, simüle gecikme {api.simulated_s:.2f} s")
+    for k, v in times.items():
+        print(f"  {k:<14} {v:8.3f} s")
+    print(f"  diff: {len(d.changes)} farklı (beklenen <= {args.changes})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
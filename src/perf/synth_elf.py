@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Sentetik ELF + marker'lı A2L üretici (adresleme motoru benchmark'ı için).
+C kaynakları üretilip yerel (ya da --cc ile verilen çapraz) derleyiciyle -g derlenir:
+  - cus      : derleme birimi (CU) sayısı
+  - symbols  : toplam global skaler sayısı (CU'lara dağıtılır)
+  - depth    : iç içe struct derinliği (DWARF tip ağacı büyüklüğü)
+A2L: N parametre; her biri bir skalere, Struct.member'a ya da Array[idx].member'a işaret eder
+(semboller tekrar kullanılabilir, 1M parametre için 1M sembol gerekmez).
+
+  PYTHONPATH=src python -m perf.synth_elf --out bench_work --cus 50 --symbols 20000 --params 100000
+"""
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+STRUCTS_PER_CU = 4
+ARRAY_LEN = 8
+
+
+@dataclass
+class SynthSpec:
+    cus: int = 20
+    symbols: int = 5000
+    depth: int = 2
+    params: int = 10000
+    struct_ratio: float = 0.3       # parametrelerin struct/array üyesi olan oranı
+    missing_ratio: float = 0.01     # ELF'te olmayan isim oranı (MISSING satırları)
+    cc: str = "gcc"
+    dwarf: int = 4                  # hedef toolchain'ler genelde DWARF 2-4 üretir
+
+    def key(self) -> str:
+        d = asdict(self)
+        d.pop("params"); d.pop("struct_ratio"); d.pop("missing_ratio")
+        return hashlib.blake2b(json.dumps(d, sort_keys=True).encode(), digest_size=6).hexdigest()
+
+
+def _struct_defs(depth: int) -> str:
+    out = ["typedef struct { float a; unsigned short b; unsigned char c[4]; } Leaf0;"]
+    for d in range(1, depth + 1):
+        out.append(f"typedef struct {{ float a; unsigned int b; Leaf{d - 1} inner; float arr[4]; }} Leaf{d};")
+    return "\n".join(out) + "\n"
+
+
+def _cu_source(spec: SynthSpec, cu: int, n_scalars: int) -> str:
+    lines = [f"/* synthetic CU {cu} */", _struct_defs(spec.depth)]
+    for i in range(n_scalars):
+        lines.append(f"volatile float s{cu}_{i} = {i}.0f;")
+    for k in range(STRUCTS_PER_CU):
+        lines.append(f"Leaf{spec.depth} st{cu}_{k};")
+        lines.append(f"Leaf{spec.depth} ar{cu}_{k}[{ARRAY_LEN}];")
+    if cu == 0:
+        # @REG_START@/@REG_SIZE@ satırı için kalibrasyon bölümü
+        lines.append('float cal_block[64] __attribute__((section(".cal_seg_ram"))) = {1.0f};')
+        lines.append("void _start(void) { for (;;) {} }")
+    return "\n".join(lines) + "\n"
+
+
+def build_elf(spec: SynthSpec, workdir: str) -> Path:
+    """ELF'i üretir (aynı spec için önbellekten). Dönen: ELF yolu."""
+    work = Path(workdir) / f"elf_{spec.key()}"
+    elf = work / "synth.elf"
+    if elf.exists():
+        return elf
+    if shutil.which(spec.cc) is None:
+        raise RuntimeError(f"Derleyici bulunamadı: {spec.cc}")
+    src = work / "src"
+    src.mkdir(parents=True, exist_ok=True)
+    per_cu = [spec.symbols // spec.cus + (1 if i < spec.symbols % spec.cus else 0) for i in range(spec.cus)]
+    files = []
+    for cu, n in enumerate(per_cu):
+        p = src / f"cu{cu}.c"
+        p.write_text(_cu_source(spec, cu, n), encoding="utf-8")
+        files.append(str(p))
+    tmp = work / "synth.elf.tmp"
+    cmd = [spec.cc, f"-gdwarf-{spec.dwarf}", "-O0", "-fno-common", "-nostdlib", "-static", "-Wl,-e,_start",
+           "-o", str(tmp)] + files
+    subprocess.run(cmd, check=True)
+    os.replace(tmp, elf)
+    (work / "spec.json").write_text(json.dumps(asdict(spec), indent=1), encoding="utf-8")
+    return elf
+
+
+def param_names(spec: SynthSpec):
+    """A2L marker isimleri: skaler, Struct.member, Array[idx].member ve eksik semboller."""
+    per_cu = [spec.symbols // spec.cus + (1 if i < spec.symbols % spec.cus else 0) for i in range(spec.cus)]
+    scalars = [(cu, i) for cu, n in enumerate(per_cu) for i in range(n)]
+    members = ("a", "b", "inner", "arr") if spec.depth > 0 else ("a", "b", "c")
+    n_struct = int(spec.params * spec.struct_ratio)
+    n_missing = int(spec.params * spec.missing_ratio)
+    for k in range(spec.params):
+        if k < n_missing:
+            yield f"missing_{k}"
+        elif k < n_missing + n_struct:
+            cu, s, m = k % spec.cus, (k // spec.cus) % STRUCTS_PER_CU, members[k % len(members)]
+            if k % 2:
+                yield f"ar{cu}_{s}[{k % ARRAY_LEN}].{m}"
+            else:
+                yield f"st{cu}_{s}.{m}"
+        else:
+            cu, i = scalars[k % len(scalars)]
+            yield f"s{cu}_{i}"
+
+
+def write_a2l(spec: SynthSpec, path: str) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.write('ASAP2_VERSION 1 61\n/begin PROJECT P ""\n/begin MODULE M ""\n')
+        f.write("/begin MOD_PAR \"\"\n /begin MEMORY_SEGMENT CAL_SEG_RAM \"\" DATA RAM INTERN\n"
+                "  CAL_SEG_RAM @REG_START@ @REG_SIZE@ -1 -1 -1 -1 -1\n /end MEMORY_SEGMENT\n/end MOD_PAR\n")
+        for k, name in enumerate(param_names(spec)):
+            f.write(f'/begin CHARACTERISTIC P{k} "" VALUE 0x0 /* @ECU_Address@{name}@ */ '
+                    f"Scalar_FLOAT32 0 NO_COMPU_METHOD 0 100\n/end CHARACTERISTIC\n")
+        f.write("/end MODULE\n/end PROJECT\n")
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sentetik ELF/A2L üretici")
+    ap.add_argument("--out", default="bench_work")
+    ap.add_argument("--cus", type=int, default=20)
+    ap.add_argument("--symbols", type=int, default=5000)
+    ap.add_argument("--depth", type=int, default=2)
+    ap.add_argument("--params", type=int, default=10000)
+    ap.add_argument("--cc", default="gcc", help="derleyici (ör. powerpc-eabivle-gcc)")
+    ap.add_argument("--dwarf", type=int, default=4)
+    args = ap.parse_args()
+    spec = SynthSpec(args.cus, args.symbols, args.depth, args.params, cc=args.cc, dwarf=args.dwarf)
+    elf = build_elf(spec, args.out)
+    a2l = write_a2l(spec, Path(args.out) / f"synth_{args.params}.a2l")
+    print(f"ELF: {elf}\nA2L: {a2l}")
+
+
+if __name__ == "__main__":
+    main()
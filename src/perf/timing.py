@@ -0,0 +1,167 @@
+"""
+Hafif span/sayaç kaydı (Chrome trace-event JSON'a aktarılabilir).
+
+    from perf import timing
+    with timing.span("process_a2l", lines=n):
+        ...
+    timing.count("a2l.resolved")
+
+Kapalıyken span() paylaşılan boş bir context döndürür, count() hemen döner; maliyet bir
+global okuma. Açmak için RELEASE_TRACE=1 ortam değişkeni ya da timing.enable().
+Alt süreçler drain() ile olaylarını döndürür, ana süreç merge() ile birleştirir.
+"""
+import os
+import json
+import time
+import functools
+import threading
+from typing import Optional
+
+ENABLED = os.environ.get("RELEASE_TRACE", "") not in ("", "0")
+
+_LOCK = threading.Lock()
+_EVENTS = []            # Chrome "X" olayları
+_COUNTERS = {}
+
+
+def enable(flag: bool = True) -> None:
+    global ENABLED
+    ENABLED = bool(flag)
+
+
+def _now_us() -> float:
+    # perf_counter sistem genelinde monoton: süreçler arası olaylar aynı eksende kalır
+    return time.perf_counter() * 1e6
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        end = _now_us()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        ev = {"name": self.name, "ph": "X", "ts": self.start, "dur": end - self.start,
+              "pid": os.getpid(), "tid": threading.get_ident()}
+        if self.args:
+            ev["args"] = self.args
+        with _LOCK:
+            _EVENTS.append(ev)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+def span(name: str, **args):
+    """İç içe kullanılabilir; kapalıyken no-op."""
+    if not ENABLED:
+        return _NULL
+    return _Span(name, args)
+
+
+def traced(name: Optional[str] = None):
+    """Fonksiyonu span ile saran dekoratör."""
+    def deco(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not ENABLED:
+                return fn(*a, **kw)
+            with _Span(label, {}):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+
+def count(name: str, n: int = 1) -> None:
+    if not ENABLED:
+        return
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+
+
+def reset() -> None:
+    with _LOCK:
+        _EVENTS.clear()
+        _COUNTERS.clear()
+
+
+def drain() -> tuple:
+    """(olaylar, sayaçlar) döndürür ve kaydı boşaltır."""
+    with _LOCK:
+        ev, ct = list(_EVENTS), dict(_COUNTERS)
+        _EVENTS.clear()
+        _COUNTERS.clear()
+    return ev, ct
+
+
+def merge(events: list, counters: dict) -> None:
+    with _LOCK:
+        _EVENTS.extend(events)
+        for k, v in counters.items():
+            _COUNTERS[k] = _COUNTERS.get(k, 0) + v
+
+
+def snapshot() -> tuple:
+    with _LOCK:
+        return list(_EVENTS), dict(_COUNTERS)
+
+
+def export_chrome(path: str) -> None:
+    """chrome://tracing / Perfetto ile açılabilen JSON."""
+    events, counters = snapshot()
+    base = min((e["ts"] for e in events), default=0.0)
+    out = [dict(e, ts=e["ts"] - base) for e in events]
+    if counters:
+        out.append({"name": "counters", "ph": "C", "ts": 0, "pid": os.getpid(), "tid": 0, "args": counters})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": out, "displayTimeUnit": "ms"}, f)
+
+
+def summary() -> dict:
+    """span adı -> (çağrı, toplam_s, maks_s)"""
+    events, _ = snapshot()
+    agg = {}
+    for e in events:
+        n, tot, mx = agg.get(e["name"], (0, 0.0, 0.0))
+        d = e["dur"] / 1e6
+        agg[e["name"]] = (n + 1, tot + d, max(mx, d))
+    return agg
+
+
+def summary_table() -> str:
+    agg = summary()
+    _, counters = snapshot()
+    lines = [f"{'span':<32} {'calls':>6} {'total s':>9} {'mean ms':>9} {'max ms':>9}"]
+    for name, (n, tot, mx) in sorted(agg.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"{name:<32} {n:>6} {tot:>9.3f} {1000 * tot / n:>9.1f} {1000 * mx:>9.1f}")
+    for name, v in sorted(counters.items()):
+        lines.append(f"{'# ' + name:<32} {v:>6}")
+    return "\n".join(lines)
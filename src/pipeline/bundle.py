@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Release paketi: çıktılar tek .tar.gz + manifest (boyut, sha256).
+  - Hash'ler parçalı okumayla, thread havuzunda paralel hesaplanır (hashlib büyük bloklarda GIL'i bırakır).
+  - Manifest arşivin ilk üyesi olur ve arşivin yanına ayrıca yazılır.
+  - tar akışı BLOCK_SIZE'lık bloklara bölünür, her blok thread'lerde ayrı bir gzip üyesi olarak
+    sıkıştırılır (pigz benzeri). Çok üyeli gzip standarttır; tar, gzip ve tarfile doğrudan açar.
+
+  PYTHONPATH=src python -m pipeline.bundle --out pj1_release_1234.tar.gz a.a2l b.s19 ...
+  PYTHONPATH=src python -m pipeline.bundle --verify pj1_release_1234.tar.gz
+"""
+import os
+import io
+import sys
+import json
+import time
+import gzip
+import hashlib
+import tarfile
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from perf import timing
+
+HASH_CHUNK = 1 << 20
+BLOCK_SIZE = 4 << 20
+LEVEL = 6
+MANIFEST_NAME = "MANIFEST.json"
+
+
+def default_workers() -> int:
+    return min(8, os.cpu_count() or 2)
+
+
+def hash_file(path: str, chunk: int = HASH_CHUNK) -> tuple:
+    """(boyut, sha256 hex); dosya parça parça okunur."""
+    h = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(chunk), b""):
+            h.update(buf)
+            size += len(buf)
+    return size, h.hexdigest()
+
+
+def build_manifest(files: dict, workers: int = 0, executor: ThreadPoolExecutor = None) -> dict:
+    """files: arşiv adı -> yol. Dosyalar paralel hash'lenir."""
+    names = sorted(files)
+    with timing.span("bundle.hash", files=len(names)):
+        if executor is None:
+            with ThreadPoolExecutor(workers or default_workers()) as ex:
+                digests = list(ex.map(lambda n: hash_file(files[n]), names))
+        else:
+            digests = list(executor.map(lambda n: hash_file(files[n]), names))
+    return {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "algorithm": "sha256",
+            "files": [{"name": n, "size": s, "sha256": d} for n, (s, d) in zip(names, digests)]}
+
+
+class _GzipBlockWriter:
+    """tarfile'ın yazdığı akışı bloklara ayırıp paralel sıkıştırır; üyeler sırayla out'a yazılır."""
+
+    def __init__(self, out, executor: ThreadPoolExecutor, level: int, block_size: int, max_inflight: int):
+        self.out, self.ex, self.level = out, executor, level
+        self.block_size, self.max_inflight = block_size, max_inflight
+        self.buf = bytearray()
+        self.pending = deque()
+        self.raw_bytes = 0
+
+    def write(self, b) -> int:
+        self.buf += b
+        while len(self.buf) >= self.block_size:
+            self._submit(bytes(self.buf[:self.block_size]))
+            del self.buf[:self.block_size]
+        return len(b)
+
+    def _submit(self, block: bytes):
+        self.raw_bytes += len(block)
+        self.pending.append(self.ex.submit(gzip.compress, block, self.level, mtime=0))
+        # Bellek sınırı: en fazla max_inflight blok beklesin
+        self._drain(self.max_inflight)
+
+    def _drain(self, keep: int):
+        while len(self.pending) > keep:
+            self.out.write(self.pending.popleft().result())
+
+    def close(self):
+        if self.buf:
+            self._submit(bytes(self.buf))
+            self.buf.clear()
+        self._drain(0)
+
+
+class _ProgressReader(io.RawIOBase):
+    def __init__(self, f, on_read):
+        self.f, self.on_read = f, on_read
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = self.f.readinto(b)
+        self.on_read(n or 0)
+        return n
+
+
+def write_bundle(archive: str, files: dict, manifest_out: str = "", level: int = LEVEL, workers: int = 0,
+                 block_size: int = BLOCK_SIZE, progress: Optional[Callable[[int, int], None]] = None,
+                 cancel: Optional[Callable[[], bool]] = None) -> dict:
+    """
+    files: arşiv adı -> yol. Arşiv .tmp'ye yazılıp yerine taşınır. Manifest'i döndürür.
+    progress(arşivlenen bayt, toplam bayt); cancel() True dönerse RuntimeError.
+    """
+    archive = Path(archive)
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    tmp = archive.with_name(archive.name + ".tmp")
+    n = workers or default_workers()
+    with ThreadPoolExecutor(n, thread_name_prefix="bundle") as ex:
+        manifest = build_manifest(files, executor=ex)
+        blob = json.dumps(manifest, indent=1).encode("utf-8")
+        total = sum(e["size"] for e in manifest["files"])
+        done = [0]
+
+        def on_read(k):
+            done[0] += k
+            if cancel is not None and cancel():
+                raise RuntimeError("Bundle packaging cancelled")
+            if progress: progress(done[0], total)
+
+        try:
+            with timing.span("bundle.archive", bytes=total), open(tmp, "wb") as out:
+                gz = _GzipBlockWriter(out, ex, level, block_size, 2 * n)
+                with tarfile.open(fileobj=gz, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                    ti = tarfile.TarInfo(MANIFEST_NAME)
+                    ti.size, ti.mtime = len(blob), int(time.time())
+                    tar.addfile(ti, io.BytesIO(blob))
+                    for e in manifest["files"]:
+                        path = files[e["name"]]
+                        ti = tar.gettarinfo(path, arcname=e["name"])
+                        if ti.size != e["size"]:
+                            raise RuntimeError(f"{path} hash'lendikten sonra değişti")
+                        with open(path, "rb") as f:
+                            tar.addfile(ti, io.BufferedReader(_ProgressReader(f, on_read), HASH_CHUNK))
+                gz.close()
+            os.replace(tmp, archive)
+        except BaseException:
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+    timing.count("bundle.bytes", total)
+    if manifest_out:
+        Path(manifest_out).write_bytes(blob)
+    return manifest
+
+
+def verify_bundle(archive: str) -> list:
+    """Arşivdeki dosyaları manifest'e göre doğrular; hatalı üye adlarını döndürür."""
+    bad = []
+    with tarfile.open(archive, "r:gz") as tar:
+        manifest = json.load(tar.extractfile(MANIFEST_NAME))
+        for e in manifest["files"]:
+            h = hashlib.sha256()
+            f = tar.extractfile(e["name"])
+            for buf in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(buf)
+            if h.hexdigest() != e["sha256"]:
+                bad.append(e["name"])
+    return bad
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Release paketi (.tar.gz + sha256 manifest)")
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--out", help="arşiv yolu (.tar.gz)")
+    ap.add_argument("--level", type=int, default=LEVEL)
+    ap.add_argument("--workers", type=int, default=0)
+    ap.add_argument("--verify", default="", help="var olan arşivi manifest'e göre doğrula")
+    args = ap.parse_args(argv)
+    if args.verify:
+        bad = verify_bundle(args.verify)
+        print("OK" if not bad else "Hatalı: " + ", ".join(bad))
+        return 1 if bad else 0
+    if not args.out or not args.files:
+        ap.error("--out ve en az bir dosya gerekli")
+    t0 = time.perf_counter()
+    m = write_bundle(args.out, {Path(p).name: p for p in args.files}, args.out + ".manifest.json",
+                     args.level, args.workers)
+    size = sum(e["size"] for e in m["files"])
+    print(f"{args.out}: {len(m['files'])} dosya, {size / 1e6:.1f} MB -> "
+          f"{os.path.getsize(args.out) / 1e6:.1f} MB, {time.perf_counter() - t0:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Stage checkpoint'leri: <output_dir>/.release_checkpoints/<stage>.json
+Her kayıt stage'in girdi anahtarını (girdi dosya hash'leri + parametreler + bağımlı
+stage anahtarları), çıktısını ve ürettiği dosyaların hash'lerini tutar. Yeniden
+çalıştırmada anahtar aynıysa ve çıktı dosyaları değişmemişse stage atlanır.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Optional
+
+CHECKPOINT_DIR = ".release_checkpoints"
+
+_digest_cache = {}          # (path, size, mtime_ns) -> hash; aynı ELF'i iki stage hash'lemesin
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """Dosya içeriği hash'i; dosya yoksa ''."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    ck = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _digest_lock:
+        if ck in _digest_cache:
+            return _digest_cache[ck]
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    with _digest_lock:
+        _digest_cache[ck] = h.hexdigest()
+    return _digest_cache[ck]
+
+
+def stage_key(files: dict, params: dict = None, deps: dict = None) -> str:
+    """files: ad -> yol (içerik hash'lenir), params: düz değerler, deps: stage -> anahtar."""
+    blob = json.dumps({"files": {k: file_digest(v) for k, v in files.items()},
+                       "params": params or {}, "deps": deps or {}}, sort_keys=True)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    stage: str
+    key: str
+    output: Any = None
+    files: dict = field(default_factory=dict)     # üretilen dosya -> hash
+    finished: str = ""
+
+
+class CheckpointStore:
+    def __init__(self, output_dir: str):
+        self.dir = Path(output_dir) / CHECKPOINT_DIR
+
+    def path(self, stage: str) -> Path:
+        return self.dir / f"{stage}.json"
+
+    def load(self, stage: str) -> Optional[Checkpoint]:
+        try:
+            with self.path(stage).open("r", encoding="utf-8") as f:
+                return Checkpoint(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def valid(self, stage: str, key: str) -> Optional[Checkpoint]:
+        """Anahtar tutuyor ve çıktı dosyaları yerinde/değişmemişse checkpoint'i döndürür."""
+        cp = self.load(stage)
+        if cp is None or cp.key != key:
+            return None
+        if any(file_digest(p) != h for p, h in cp.files.items()):
+            return None
+        return cp
+
+    def invalidate(self, stage: str) -> None:
+        try:
+            self.path(stage).unlink()
+        except FileNotFoundError:
+            pass
+
+    def save(self, stage: str, key: str, output: Any = None, files: list = ()) -> Checkpoint:
+        cp = Checkpoint(stage, key, output, {str(p): file_digest(str(p)) for p in files if p},
+                        time.strftime("%Y-%m-%d %H:%M:%S"))
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path(stage).with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(asdict(cp), f, indent=1)
+        os.replace(tmp, self.path(stage))
+        return cp
+
+    def clear(self) -> None:
+        for p in self.dir.glob("*.json"):
+            p.unlink()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Headless release çalıştırıcı (CI / laboratuvar için, Qt gerektirmez).
+
+  PYTHONPATH=src python -m pipeline.cli --a2l in.a2l --elf app.elf --out-dir out --svn 1234 \\
+      --s19 app.s19 --boot boot.s19 [--project project1] [--skip-flash] [--skip-vision] [--skip-bundle] \\
+      [--no-resume] [--resume-flash] [--target-id ID] [--trace]
+
+Backend'ler (elftools, TRACE32 DLL, Vision COM) yalnızca stage'leri çalışınca yüklenir.
+"""
+import argparse
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from pipeline.release import ReleaseConfig, StageContext, run_release
+
+
+def _log(msg: str) -> None:
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}", flush=True)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Software release hattı (adresleme -> flash -> Vision), GUI'siz")
+    ap.add_argument("--a2l", required=True, help="marker'lı giriş A2L")
+    ap.add_argument("--elf", required=True)
+    ap.add_argument("--out-dir", required=True)
+    ap.add_argument("--svn", required=True, help="SVN numarası (çıktı adlarında kullanılır)")
+    ap.add_argument("--s19", default="", help="Vision için S19")
+    ap.add_argument("--boot", default="", help="TRACE32 için BOOT S19")
+    ap.add_argument("--project", default="project1")
+    ap.add_argument("--skip-flash", action="store_true")
+    ap.add_argument("--skip-vision", action="store_true")
+    ap.add_argument("--skip-bundle", action="store_true", help="çıktıları .tar.gz olarak paketleme")
+    ap.add_argument("--no-resume", action="store_true", help="checkpoint'leri yok say, tüm stage'leri çalıştır")
+    ap.add_argument("--resume-flash", action="store_true",
+                    help="aynı ELF/BOOT/config.t32/hedef için flash'ı da checkpoint'ten atla")
+    ap.add_argument("--target-id", default="", help="hedef ECU kimliği (flash checkpoint'i ve delta kaydı için)")
+    ap.add_argument("--trace", action="store_true", help="stage zamanlama trace'i (release_trace.json) üret")
+    ap.add_argument("--history-db", default="", help="koşu geçmişi SQLite dosyası (varsayılan: ~/.software_release_tool)")
+    ap.add_argument("--no-history", action="store_true")
+    return ap
+
+
+def config_from_args(args) -> ReleaseConfig:
+    return ReleaseConfig(
+        a2l_path=args.a2l, s19_path=args.s19, boot_path=args.boot, elf_path=args.elf,
+        output_dir=args.out_dir, svn_number=str(args.svn), project=args.project,
+        flash=not args.skip_flash, vision=not args.skip_vision, bundle=not args.skip_bundle,
+        resume=not args.no_resume, resume_flash=args.resume_flash, target_id=args.target_id, trace=args.trace,
+        history=not args.no_history, history_db=args.history_db,
+    )
+
+
+def validate(cfg: ReleaseConfig) -> str:
+    if not Path(cfg.a2l_path).is_file(): return f"A2L bulunamadı: {cfg.a2l_path}"
+    if not Path(cfg.elf_path).is_file(): return f"ELF bulunamadı: {cfg.elf_path}"
+    if not str(cfg.svn_number).isdigit(): return "SVN ID sayısal bir değer olmalı."
+    if cfg.flash and not Path(cfg.boot_path).is_file(): return f"BOOT bulunamadı: {cfg.boot_path}"
+    if cfg.vision and not Path(cfg.s19_path).is_file(): return f"S19 bulunamadı: {cfg.s19_path}"
+    return ""
+
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    cfg = config_from_args(args)
+    err = validate(cfg)
+    if err:
+        _log(f"VALIDATION ERROR: {err}")
+        return 2
+    Path(cfg.output_dir).mkdir(parents=True, exist_ok=True)
+
+    def on_event(kind, stage, data):
+        if kind == "failed":
+            _log(f"Stage FAILED: {stage}: {data}")
+            _log("".join(traceback.format_exception(type(data), data, data.__traceback__)))
+        else:
+            _log(f"Stage {kind}: {stage}")
+
+    res = run_release(cfg, StageContext(log=_log, status=lambda m: _log(f"-- {m}")), on_event=on_event)
+    for name, (t0, t1) in res.timings.items():
+        if t1 is not None:
+            _log(f"  {name:<8} {t1 - t0:7.1f} s")
+    _log(f"Pipeline {'OK' if res.ok else 'FAILED'} in {res.wall_s:.1f} s")
+    return 0 if res.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
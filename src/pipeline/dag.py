@@ -0,0 +1,110 @@
+"""
+Küçük bağımlılık grafiği (DAG) zamanlayıcı.
+Her Stage, bağımlı olduğu stage'lerin çıktılarıyla çağrılır; bağımlılıkları hazır olan
+stage'ler aynı anda çalışır. Hata alan stage'in bağımlıları atlanır, bağımsız olanlar sürer.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[dict], Any]           # fn({dep_adı: dep_çıktısı}) -> çıktı
+    deps: tuple = ()
+
+
+@dataclass
+class DagResult:
+    outputs: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)      # stage -> exception
+    skipped: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)     # stage -> (başlangıç, bitiş) monotonic
+    wall_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.skipped
+
+
+def _check(stages: list[Stage]):
+    names = {s.name for s in stages}
+    if len(names) != len(stages):
+        raise ValueError("Stage adları tekil olmalı")
+    for s in stages:
+        for d in s.deps:
+            if d not in names:
+                raise ValueError(f"{s.name}: bilinmeyen bağımlılık {d}")
+    # Döngü kontrolü (Kahn)
+    indeg = {s.name: len(s.deps) for s in stages}
+    users = {s.name: [t.name for t in stages if s.name in t.deps] for s in stages}
+    ready = [n for n, d in indeg.items() if d == 0]
+    seen = 0
+    while ready:
+        n = ready.pop(); seen += 1
+        for u in users[n]:
+            indeg[u] -= 1
+            if indeg[u] == 0: ready.append(u)
+    if seen != len(stages):
+        raise ValueError("Stage grafiğinde döngü var")
+
+
+def run_dag(stages: list[Stage], on_event: Optional[Callable[[str, str, Any], None]] = None,
+            executor: ThreadPoolExecutor = None) -> DagResult:
+    """
+    on_event(tür, stage, veri): tür 'start' | 'done' | 'failed' | 'skipped'.
+    executor verilirse (kalıcı havuz) onu kullanır, yoksa stage sayısı kadar thread açar.
+    """
+    _check(stages)
+    res = DagResult()
+    t0 = time.monotonic()
+    pending = {s.name: s for s in stages}
+    running = {}
+    lock = threading.Lock()
+    own = executor is None
+    ex = executor or ThreadPoolExecutor(max_workers=max(len(stages), 1), thread_name_prefix="stage")
+
+    def emit(kind, name, data=None):
+        if on_event: on_event(kind, name, data)
+
+    def call(stage: Stage, inputs: dict):
+        with lock:
+            res.timings[stage.name] = (time.monotonic(), None)
+        try:
+            return stage.fn(inputs)
+        finally:
+            with lock:
+                res.timings[stage.name] = (res.timings[stage.name][0], time.monotonic())
+
+    try:
+        while pending or running:
+            # Hazır olanları başlat, bağımlılığı düşenleri atla
+            for name, st in list(pending.items()):
+                if any(d in res.errors or d in res.skipped for d in st.deps):
+                    del pending[name]
+                    res.skipped.append(name)
+                    emit("skipped", name)
+                elif all(d in res.outputs for d in st.deps):
+                    del pending[name]
+                    emit("start", name)
+                    running[ex.submit(call, st, {d: res.outputs[d] for d in st.deps})] = name
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                exc = fut.exception()
+                if exc is None:
+                    res.outputs[name] = fut.result()
+                    emit("done", name, res.outputs[name])
+                else:
+                    res.errors[name] = exc
+                    emit("failed", name, exc)
+    finally:
+        if own:
+            ex.shutdown(wait=True)
+    res.wall_s = time.monotonic() - t0
+    return res
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Release koşu geçmişi (SQLite).
+Her run_release sonunda bir satır: girdiler + hash'ler, stage süreleri, RESOLVED/MISSING
+sayıları ve sonuç. Proje bazında trend/yüzdelik görünümü:
+
+  PYTHONPATH=src python -m pipeline.history --project project1 [--last 30] [--db path]
+"""
+import os
+import csv
+import sys
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from pipeline.checkpoint import file_digest
+
+HISTORY_DB = os.environ.get("RELEASE_HISTORY_DB",
+                            str(Path.home() / ".software_release_tool" / "history.sqlite3"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT NOT NULL,
+    project TEXT NOT NULL,
+    svn TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    wall_s REAL,
+    a2l_path TEXT, a2l_hash TEXT,
+    elf_path TEXT, elf_hash TEXT, elf_size INTEGER,
+    s19_path TEXT, s19_hash TEXT,
+    boot_path TEXT, boot_hash TEXT,
+    resolved INTEGER, missing INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,          -- done | failed | skipped | resumed
+    duration_s REAL
+);
+CREATE INDEX IF NOT EXISTS runs_project ON runs(project, id);
+"""
+
+
+def connect(db_path: str = HISTORY_DB) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(db_path, timeout=10)
+    con.executescript(SCHEMA)
+    return con
+
+
+def csv_counts(csv_path) -> tuple:
+    """Adresleme CSV'sinden (RESOLVED, MISSING) sayıları; CSV yoksa (None, None)."""
+    try:
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    except OSError:
+        return None, None
+    return (sum(r.get("Result") == "RESOLVED" for r in rows),
+            sum(r.get("Result") == "MISSING" for r in rows))
+
+
+def record_run(cfg, res, resumed=(), db_path: str = HISTORY_DB) -> int:
+    """cfg: ReleaseConfig, res: DagResult. Yeni run id'sini döndürür."""
+    from pipeline.release import output_paths
+    resolved, missing = csv_counts(output_paths(cfg)[1]) if "address" in res.outputs else (None, None)
+    elf_size = os.path.getsize(cfg.elf_path) if os.path.exists(cfg.elf_path) else None
+    error = "; ".join(f"{n}: {e}" for n, e in res.errors.items())[:2000]
+    con = connect(db_path)
+    try:
+        with con:
+            cur = con.execute(
+                "INSERT INTO runs (started, project, svn, ok, wall_s, a2l_path, a2l_hash, elf_path, elf_hash,"
+                " elf_size, s19_path, s19_hash, boot_path, boot_hash, resolved, missing, error)"
+                " VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (time.strftime("%Y-%m-%d %H:%M:%S"), cfg.project, str(cfg.svn_number), int(res.ok), res.wall_s,
+                 cfg.a2l_path, file_digest(cfg.a2l_path), cfg.elf_path, file_digest(cfg.elf_path), elf_size,
+                 cfg.s19_path, file_digest(cfg.s19_path), cfg.boot_path, file_digest(cfg.boot_path),
+                 resolved, missing, error))
+            run_id = cur.lastrowid
+            rows = []
+            for name, (t0, t1) in res.timings.items():
+                if name in resumed:
+                    continue
+                status = "failed" if name in res.errors else "done"
+                rows.append((run_id, name, status, None if t1 is None else t1 - t0))
+            rows += [(run_id, n, "resumed", 0.0) for n in resumed]
+            rows += [(run_id, n, "skipped", None) for n in res.skipped]
+            con.executemany("INSERT INTO stages VALUES (?,?,?,?)", rows)
+        return run_id
+    finally:
+        con.close()
+
+
+def percentile(values: list, p: float) -> Optional[float]:
+    if not values:
+        return None
+    v = sorted(values)
+    k = (len(v) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(v) - 1)
+    return v[lo] + (v[hi] - v[lo]) * (k - lo)
+
+
+def trends(project: str, last: int = 30, db_path: str = HISTORY_DB) -> dict:
+    """{'runs': [...son koşular...], 'stages': {stage: (n, p50, p90, max)}, 'regressions': [...]}"""
+    con = connect(db_path)
+    try:
+        runs = con.execute(
+            "SELECT id, started, svn, ok, wall_s, elf_size, resolved, missing FROM runs"
+            " WHERE project=? ORDER BY id DESC LIMIT ?", (project, last)).fetchall()[::-1]
+        ids = [r[0] for r in runs]
+        durs = {}
+        if ids:
+            q = ("SELECT stage, duration_s FROM stages WHERE status='done' AND duration_s IS NOT NULL"
+                 f" AND run_id IN ({','.join('?' * len(ids))})")
+            for stage, d in con.execute(q, ids):
+                durs.setdefault(stage, []).append(d)
+    finally:
+        con.close()
+    stages = {s: (len(v), percentile(v, 50), percentile(v, 90), max(v)) for s, v in durs.items()}
+    # MISSING sayısı bir önceki başarılı adreslemeye göre arttıysa işaretle
+    regressions, prev = [], None
+    for r in runs:
+        if r[7] is None:
+            continue
+        if prev is not None and r[7] > prev[7]:
+            regressions.append(f"SVN {r[2]}: MISSING {prev[7]} -> {r[7]} (önceki SVN {prev[2]})")
+        prev = r
+    return {"runs": runs, "stages": stages, "regressions": regressions}
+
+
+def format_trends(project: str, t: dict) -> str:
+    def f(x): return "-" if x is None else f"{x:.2f}"
+    lines = [f"Project {project}: {len(t['runs'])} run(s)", "",
+             f"{'stage':<10} {'n':>4} {'p50 s':>8} {'p90 s':>8} {'max s':>8}"]
+    for s, (n, p50, p90, mx) in sorted(t["stages"].items()):
+        lines.append(f"{s:<10} {n:>4} {f(p50):>8} {f(p90):>8} {f(mx):>8}")
+    lines += ["", f"{'started':<19} {'svn':>8} {'ok':>3} {'wall s':>8} {'elf MB':>7} {'resolved':>9} {'missing':>8}"]
+    for _, started, svn, ok, wall, size, res_n, miss_n in t["runs"]:
+        mb = "-" if size is None else f"{size / 1e6:.1f}"
+        lines.append(f"{started:<19} {svn:>8} {'Y' if ok else 'N':>3} {f(wall):>8} {mb:>7}"
+                     f" {'-' if res_n is None else res_n:>9} {'-' if miss_n is None else miss_n:>8}")
+    if t["regressions"]:
+        lines += ["", "MISSING regressions:"] + [f"  {r}" for r in t["regressions"]]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Release koşu geçmişi: stage süre trendleri ve MISSING regresyonları")
+    ap.add_argument("--project", default="project1")
+    ap.add_argument("--last", type=int, default=30)
+    ap.add_argument("--db", default=HISTORY_DB)
+    args = ap.parse_args(argv)
+    if not Path(args.db).exists():
+        print(f"Geçmiş veritabanı yok: {args.db}")
+        return 1
+    print(format_trends(args.project, trends(args.project, args.last, args.db)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
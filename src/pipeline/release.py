@@ -0,0 +1,311 @@
+"""
+Sürüm (release) hattı: A2L adresleme, TRACE32 flash ve Vision paketleme stage'leri.
+Gerçek girdiler:
+  address : A2L + ELF           -> adreslenmiş A2L
+  flash   : ELF + BOOT          -> (hedef flashlanmış)
+  vision  : adreslenmiş A2L + S19, flash tamamlanmış olmalı
+  bundle  : adreslenmiş A2L/CSV, VST/CAL, S19, BOOT -> <proje>_release_<svn>.tar.gz + manifest
+Adresleme ve flash birbirinden bağımsızdır ve aynı anda çalışır; Vision ikisini bekler.
+
+Backend modülleri (elftools, t32 ctypes, Vision COM) yalnızca ilgili stage çalışınca
+import edilir; sadece adresleme yapan bir iş Qt/COM/DLL olmadan başlar.
+
+Her stage bitince output_dir'e checkpoint yazar (pipeline/checkpoint.py); resume açıksa
+girdileri değişmemiş ve tamamlanmış stage'ler yeniden çalıştırılmaz. Flash'ın anahtarı
+config.t32 ve target_id'yi de içerir, yine de yalnız resume_flash ile atlanır.
+
+trace açıksa (cfg.trace ya da RELEASE_TRACE=1) span/sayaçlar output_dir/release_trace.json'a
+(Chrome trace) yazılır ve özet tablo log'a basılır. Her koşu SQLite geçmişine eklenir.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from pipeline.dag import Stage, run_dag, DagResult
+from pipeline.checkpoint import CheckpointStore, stage_key
+from perf import timing
+
+TRACE_FILE = "release_trace.json"
+
+
+@dataclass
+class ReleaseConfig:
+    a2l_path: str
+    s19_path: str
+    boot_path: str
+    elf_path: str
+    output_dir: str
+    svn_number: str
+    project: str = "project1"
+    flash: bool = True
+    vision: bool = True
+    resume: bool = True         # False: checkpoint'ler yok sayılır (yine de yazılır)
+    resume_flash: bool = False  # flash checkpoint'i yalnız açıkça istenirse kullanılır (ECU değişmiş olabilir)
+    target_id: str = ""         # hedef kimliği (ECU/kart etiketi); flash anahtarına ve delta kaydına girer
+    trace: bool = False         # span/sayaç kaydı + Chrome trace çıktısı
+    history: bool = True        # koşuyu SQLite geçmişine ekle (pipeline/history.py)
+    history_db: str = ""        # boş: history.HISTORY_DB
+    vst_out: str = ""           # boş: ati_vision.VST_OUT
+    bundle: bool = True         # çıktıları .tar.gz + manifest olarak paketle (pipeline/bundle.py)
+
+
+def project_short_name(project: str) -> str:
+    # "project1" -> "pj1"
+    return "pj" + project[len("project"):] if project.startswith("project") else project
+
+
+def output_paths(cfg: ReleaseConfig) -> tuple[Path, Path]:
+    name = project_short_name(cfg.project)
+    out_dir = Path(cfg.output_dir)
+    return out_dir / f"{name}_ecu_{cfg.svn_number}.a2l", out_dir / f"{name}_ecu_{cfg.svn_number}.csv"
+
+
+def bundle_paths(cfg: ReleaseConfig) -> tuple[Path, Path]:
+    base = f"{project_short_name(cfg.project)}_release_{cfg.svn_number}"
+    out_dir = Path(cfg.output_dir)
+    return out_dir / f"{base}.tar.gz", out_dir / f"{base}.manifest.json"
+
+
+def release_artifacts(cfg: ReleaseConfig, vision_out=None) -> dict:
+    """Arşiv adı -> yol; var olmayan dosyalar atlanır."""
+    out_a2l, out_csv = output_paths(cfg)
+    cands = [("a2l", out_a2l), ("a2l", out_csv), ("s19", cfg.s19_path)]
+    if cfg.flash:
+        cands.append(("boot", cfg.boot_path))
+    cands += [("vision", p) for p in (vision_out or ()) if p]
+    return {f"{kind}/{Path(p).name}": str(p) for kind, p in cands if Path(p).is_file()}
+
+
+class StageContext:
+    """Stage'lerin log/durum/ilerleme bildirimi ve iptal kontrolü için ortak arayüz."""
+
+    def __init__(self, log: Callable[[str], None] = print, status: Callable[[str], None] = None,
+                 progress: Callable[[str, int], None] = None, cancel: Callable[[], bool] = None):
+        self.log = log
+        self.status = status or (lambda m: None)
+        self._progress = progress
+        self._last = {}
+        self.cancel = cancel or (lambda: False)
+
+    def progress(self, stage: str, pct: int):
+        # Aynı yüzdeyi tekrar bildirme (sık çağrılan geri çağrılar için)
+        if self._progress and self._last.get(stage) != pct:
+            self._last[stage] = pct
+            self._progress(stage, pct)
+
+
+def stage_address(cfg: ReleaseConfig, ctx: StageContext) -> str:
+    from a2l.main_a2l import process_a2l
+    from a2l import elf_index
+
+    out_a2l, out_csv = output_paths(cfg)
+    ctx.status("A2L addressing started")
+    ctx.progress("address", 5)
+    ctx.log(f"Input A2L : {cfg.a2l_path}")
+    ctx.log(f"Input ELF : {cfg.elf_path}")
+    ctx.log(f"Output A2L: {out_a2l}")
+    ctx.log(f"Output CSV: {out_csv}")
+    ctx.progress("address", 10)
+
+    # ELF indeksi: GUI'de ELF seçilince arka planda kurulmuş olabilir
+    ctx.status("Loading ELF & symbols")
+    if elf_index.cached(cfg.elf_path) is not None:
+        ctx.log("ELF index: prefetched index reused")
+    idx = elf_index.get_index(cfg.elf_path, lambda pct: ctx.progress("address", 10 + 30 * pct // 100), ctx.cancel)
+    ctx.progress("address", 40)
+
+    # A2L işlem (iptal her PROGRESS_EVERY_LINES satırda yoklanır)
+    ctx.status("Resolving ECU addresses in A2L")
+    process_a2l(Path(cfg.a2l_path), out_a2l, idx.elf, idx.symmap, out_csv, idx.dwarfinfo, idx.var_dies,
+                progress=lambda done, total: ctx.progress("address", 40 + 55 * done // max(total, 1)),
+                cancel=ctx.cancel)
+    ctx.progress("address", 100)
+    ctx.log(f"A2L addressing OK. Output: {out_a2l}")
+    return str(out_a2l)
+
+
+def stage_flash(cfg: ReleaseConfig, ctx: StageContext) -> None:
+    from t32 import t32, verify
+
+    ctx.status("TRACE32 flashing started")
+    ctx.log(f"TRACE32: flashing BOOT -> {cfg.boot_path}")
+    ctx.log(f"TRACE32: flashing ELF -> {cfg.elf_path}")
+    last = [None]
+
+    def on_progress(p):
+        ctx.progress("flash", p.percent)
+        if p.stage and p.stage != last[0]:
+            last[0] = p.stage
+            ctx.status(f"TRACE32: {p.stage}")
+            ctx.log(f"TRACE32 [{p.percent:3d}% {p.elapsed_s:6.1f}s] {p.message}")
+
+    # CPU doğrulamadan sonra başlatılır: çalışan kod RAM/.data içeriğini değiştirmeden karşılaştır
+    t32.run_flash(cfg.elf_path, cfg.boot_path, on_progress=on_progress, cancel=ctx.cancel,
+                  target=cfg.target_id, start=False)
+
+    # İçerik doğrulama: hedefte checksum, sadece uyuşmayan bölgeler okunur
+    ctx.status("Verifying flash (on-target checksums)")
+    sess = t32.get_session()
+    report = verify.verify_flash(sess, cfg.elf_path, cfg.boot_path)
+    ctx.log(report.summary())
+    if not report.ok:
+        raise RuntimeError(f"Flash verification failed: {len(report.mismatches)} mismatching region(s)")
+    sess.cmd("go", "Go command failed")
+    ctx.progress("flash", 100)
+    ctx.log("TRACE32 flash OK")
+
+
+def stage_vision(cfg: ReleaseConfig, addressed_a2l: str, ctx: StageContext):
+    from vision import ati_vision
+
+    ctx.status("Vision is starting...")
+    ctx.log(f"Vision S19-> {cfg.s19_path}")
+    ctx.log(f"Vision A2L-> {addressed_a2l}")
+    kw = {"vst_out": cfg.vst_out} if cfg.vst_out else {}
+    result = ati_vision.ecu_connection_on_vision(addressed_a2l, cfg.s19_path, cancel=ctx.cancel, **kw)
+    ctx.progress("vision", 100)
+    ctx.log("VISION OK")
+    return result
+
+
+def stage_bundle(cfg: ReleaseConfig, vision_out, ctx: StageContext) -> list:
+    from pipeline import bundle
+
+    archive, manifest = bundle_paths(cfg)
+    files = release_artifacts(cfg, vision_out)
+    ctx.status("Packaging release bundle")
+    ctx.log(f"Bundle: {len(files)} file(s) -> {archive}")
+    m = bundle.write_bundle(str(archive), files, str(manifest),
+                            progress=lambda done, total: ctx.progress("bundle", 100 * done // max(total, 1)),
+                            cancel=ctx.cancel)
+    ctx.progress("bundle", 100)
+    ctx.log(f"Bundle OK: {sum(e['size'] for e in m['files']) / 1e6:.1f} MB -> "
+            f"{archive.stat().st_size / 1e6:.1f} MB, manifest {manifest}")
+    return [str(archive), str(manifest)]
+
+
+class _Resumable:
+    """Stage fonksiyonunu checkpoint kontrolü ile sarar; anahtarlar bağımlı stage'lere zincirlenir."""
+
+    def __init__(self, cfg: ReleaseConfig, ctx: StageContext, resumed: list = None):
+        self.cfg = cfg
+        self.ctx = ctx
+        self.store = CheckpointStore(cfg.output_dir)
+        self.keys = {}
+        self.resumed = resumed if resumed is not None else []
+
+    def wrap(self, name: str, run, inputs, outputs=lambda out: (), resume: bool = True):
+        """
+        run(inp) -> çıktı, inputs(inp) -> (files, params, deps), outputs(çıktı) -> üretilen dosyalar.
+        resume=False: checkpoint yazılır ama stage hiç atlanmaz.
+        """
+        def fn(inp):
+            files, params, deps = inputs(inp)
+            key = stage_key(files, params, {d: self.keys[d] for d in deps})
+            self.keys[name] = key
+            cp = self.store.valid(name, key) if self.cfg.resume and resume else None
+            if cp is not None:
+                self.ctx.log(f"{name}: checkpoint geçerli ({cp.finished}), stage atlandı")
+                self.ctx.progress(name, 100)
+                timing.count("stages.resumed")
+                self.resumed.append(name)
+                return cp.output
+            self.store.invalidate(name)     # yarıda kalırsa eski kayıt geçerli sayılmasın
+            with timing.span(f"stage.{name}"):
+                out = run(inp)
+            self.store.save(name, key, out, outputs(out))
+            return out
+        return fn
+
+
+def flash_inputs(cfg: ReleaseConfig) -> tuple:
+    # Aynı dosyalar başka bir ECU'ya / başka bir TRACE32 portuna flashlanıyorsa anahtar değişsin
+    from t32 import t32
+    return ({"elf": cfg.elf_path, "boot": cfg.boot_path, "t32_config": t32.CONFIG_PATH},
+            {"target": cfg.target_id}, ())
+
+
+def build_release_stages(cfg: ReleaseConfig, ctx: StageContext, pool=None, resumed: list = None) -> list[Stage]:
+    """
+    pool (pipeline.workers.WorkerPool) verilirse stage'ler onun lane'lerinde çalışır.
+    resumed: checkpoint'ten atlanan stage adları buraya eklenir.
+    """
+    rs = _Resumable(cfg, ctx, resumed)
+
+    def call(lane, fn, *args):
+        return pool.run(lane, fn, *args) if pool is not None else fn(*args, ctx)
+
+    stages = [Stage("address", rs.wrap(
+        "address", lambda inp: call("address", stage_address, cfg),
+        lambda inp: ({"a2l": cfg.a2l_path, "elf": cfg.elf_path},
+                     {"svn": cfg.svn_number, "project": cfg.project}, ()),
+        lambda out: output_paths(cfg)))]
+    vision_deps = ["address"]
+    if cfg.flash:
+        stages.append(Stage("flash", rs.wrap(
+            "flash", lambda inp: call("t32", stage_flash, cfg), lambda inp: flash_inputs(cfg),
+            resume=cfg.resume_flash)))
+        vision_deps.append("flash")
+    if cfg.vision:
+        # Vision çıktısı (vst, cal) JSON'dan liste olarak döner
+        stages.append(Stage("vision", rs.wrap(
+            "vision", lambda inp: call("vision", stage_vision, cfg, inp["address"]),
+            lambda inp: ({"s19": cfg.s19_path, "a2l": inp["address"]}, {"project": cfg.project}, vision_deps),
+            lambda out: out), tuple(vision_deps)))
+    if cfg.bundle:
+        # Dispatch thread'inde çalışır; hash/sıkıştırma kendi thread havuzunda
+        bundle_deps = ("address", "vision") if cfg.vision else ("address",)
+        stages.append(Stage("bundle", rs.wrap(
+            "bundle", lambda inp: stage_bundle(cfg, inp.get("vision"), ctx),
+            lambda inp: ({"s19": cfg.s19_path, "boot": cfg.boot_path if cfg.flash else ""},
+                         {"svn": cfg.svn_number, "project": cfg.project}, bundle_deps),
+            lambda out: out), bundle_deps))
+    return stages
+
+
+def run_release(cfg: ReleaseConfig, ctx: Optional[StageContext] = None, on_event=None,
+                executor=None, pool=None) -> DagResult:
+    ctx = ctx or StageContext()
+    was_enabled = timing.ENABLED
+    trace = cfg.trace or was_enabled
+    if trace:
+        timing.enable()
+        timing.reset()
+    resumed = []
+    try:
+        if pool is None:
+            res = run_dag(build_release_stages(cfg, ctx, resumed=resumed), on_event=on_event, executor=executor)
+        else:
+            pool.bind(ctx)
+            try:
+                res = run_dag(build_release_stages(cfg, ctx, pool, resumed), on_event=on_event,
+                              executor=executor or pool.dispatch)
+            finally:
+                pool.flush()        # süreç worker'ının log ve trace olayları da gelsin
+                pool.bind(None)
+    finally:
+        if trace:
+            report_trace(cfg, ctx)
+            timing.enable(was_enabled)
+    if cfg.history:
+        record_history(cfg, res, resumed, ctx)
+    return res
+
+
+def record_history(cfg: ReleaseConfig, res: DagResult, resumed: list, ctx: StageContext) -> None:
+    # Geçmiş yazılamaması koşuyu bozmaz
+    from pipeline import history
+    try:
+        history.record_run(cfg, res, resumed, cfg.history_db or history.HISTORY_DB)
+    except Exception as e:
+        ctx.log(f"Run history could not be written: {e}")
+
+
+def report_trace(cfg: ReleaseConfig, ctx: StageContext) -> None:
+    path = Path(cfg.output_dir) / TRACE_FILE
+    try:
+        timing.export_chrome(str(path))
+        ctx.log(f"Trace: {path} (chrome://tracing / Perfetto)")
+    except OSError as e:
+        ctx.log(f"Trace yazılamadı: {e}")
+    ctx.log("Timing summary:\n" + timing.summary_table())
@@ -0,0 +1,171 @@
+"""
+Kalıcı backend worker havuzu.
+- "address": CPU ağırlıklı ELF/A2L işi ayrı süreçte (ProcessPoolExecutor); GUI ile GIL yarışı yok.
+- "t32" / "vision": I/O ağırlıklı oturumlar için tek thread'li, uzun ömürlü executor'lar
+  (TRACE32 ve Vision COM oturumları aynı thread'de sıcak kalır).
+Stage'lerin log/durum/ilerleme bildirimleri tek bir kuyruğa yazılır; pompa thread'i bunları
+o anki koşunun StageContext'ine iletir. Kurulum (süreç başlatma, import'lar) oturum başına bir kez.
+"""
+import sys
+import queue
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from perf import timing
+
+LANES = ("address", "t32", "vision")
+
+_WORKER_QUEUE = None        # süreç worker'ında: olay kuyruğu
+_WORKER_CANCEL = None       # süreç worker'ında: iptal bayrağı (mp.Event)
+
+
+class QueueContext:
+    """StageContext ile aynı arayüz; bildirimleri olay kuyruğuna yazar."""
+
+    def __init__(self, q, cancel):
+        self._q = q
+        self.cancel = cancel
+        self._last = {}
+
+    def log(self, msg: str):
+        self._q.put(("log", str(msg)))
+
+    def status(self, msg: str):
+        self._q.put(("status", str(msg)))
+
+    def progress(self, stage: str, pct: int):
+        if self._last.get(stage) != int(pct):
+            self._last[stage] = int(pct)
+            self._q.put(("progress", stage, int(pct)))
+
+
+def _init_process(q, cancel_evt):
+    global _WORKER_QUEUE, _WORKER_CANCEL
+    _WORKER_QUEUE, _WORKER_CANCEL = q, cancel_evt
+
+
+def _warmup():
+    # Ağır import'lar ilk koşudan önce ödensin
+    import elftools.elf.elffile   # noqa: F401
+    import a2l.main_a2l           # noqa: F401
+    return True
+
+
+def _prefetch_elf(path):
+    from a2l import elf_index
+    return elf_index.prefetch(path)
+
+
+def _call_in_process(fn, args, trace=False):
+    from perf import timing
+    timing.enable(trace)
+    timing.reset()
+    try:
+        return fn(*args, QueueContext(_WORKER_QUEUE, _WORKER_CANCEL.is_set))
+    finally:
+        if trace:
+            _WORKER_QUEUE.put(("trace",) + timing.drain())
+
+
+class WorkerPool:
+    def __init__(self, address_workers: int = 1, warmup: bool = True):
+        self._events = mp.Queue()
+        self._cancel_evt = mp.Event()
+        self._ctx = None
+        self._synced = {}
+        self._ctx_lock = threading.Lock()
+        self._proc = ProcessPoolExecutor(max_workers=address_workers, initializer=_init_process,
+                                         initargs=(self._events, self._cancel_evt))
+        self._threads = {lane: ThreadPoolExecutor(max_workers=1, thread_name_prefix=lane)
+                         for lane in ("t32", "vision")}
+        # DAG'ın bekleme thread'leri ve koşunun kendisi için
+        self.dispatch = ThreadPoolExecutor(max_workers=len(LANES) + 1, thread_name_prefix="dag")
+        self._closed = threading.Event()
+        self._pump = threading.Thread(target=self._pump_loop, name="worker-events", daemon=True)
+        self._pump.start()
+        if warmup:
+            self._proc.submit(_warmup)
+
+    # --- olaylar
+    def _pump_loop(self):
+        while not self._closed.is_set():
+            ctx = self._ctx
+            if ctx is not None and ctx.cancel() and not self._cancel_evt.is_set():
+                self._cancel_evt.set()
+            try:
+                ev = self._events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            ctx = self._ctx
+            kind = ev[0]
+            if ctx is None and kind not in ("sync", "trace"):
+                continue
+            if kind == "log": ctx.log(ev[1])
+            elif kind == "status": ctx.status(ev[1])
+            elif kind == "progress": ctx.progress(ev[1], ev[2])
+            elif kind == "trace": timing.merge(ev[1], ev[2])
+            elif kind == "sync": self._synced.pop(ev[1]).set()
+
+    def bind(self, ctx) -> None:
+        """Bir koşunun StageContext'ini bağlar (aynı anda tek koşu)."""
+        with self._ctx_lock:
+            if ctx is not None and self._ctx is not None:
+                raise RuntimeError("WorkerPool: önceki koşu hâlâ devam ediyor")
+            self._cancel_evt.clear()
+            self._ctx = ctx
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Kuyruktaki bildirimler bağlı koşuya iletilene kadar bekler."""
+        evt = threading.Event()
+        token = id(evt)
+        self._synced[token] = evt
+        self._events.put(("sync", token))
+        evt.wait(timeout)
+
+    def run(self, lane: str, fn, *args):
+        """fn(*args, ctx) çağrısını ilgili lane'de çalıştırır ve sonucunu bekler."""
+        if lane == "address":
+            return self._proc.submit(_call_in_process, fn, args, timing.ENABLED).result()
+        ctx = QueueContext(self._events, self._ctx.cancel if self._ctx else (lambda: False))
+        return self._threads[lane].submit(fn, *args, ctx).result()
+
+    def prefetch_elf(self, path: str):
+        """ELF indeksini adresleme sürecinde spekülatif olarak kurdurur (beklenmez)."""
+        return self._proc.submit(_prefetch_elf, path)
+
+    def submit(self, fn, *args):
+        return self.dispatch.submit(fn, *args)
+
+    def shutdown(self):
+        # Sıcak oturumları kendi thread'lerinde kapat
+        if "vision.ati_vision" in sys.modules:
+            self._threads["vision"].submit(sys.modules["vision.ati_vision"].close_session).result()
+        if "t32.t32" in sys.modules:
+            self._threads["t32"].submit(sys.modules["t32.t32"].close_session).result()
+        for ex in self._threads.values():
+            ex.shutdown(wait=True)
+        self.dispatch.shutdown(wait=True)
+        self._proc.shutdown(wait=True)
+        self._closed.set()
+        self._pump.join(timeout=1.0)
+
+
+_POOL: Optional[WorkerPool] = None
+
+
+def get_pool() -> WorkerPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = WorkerPool()
+    return _POOL
+
+
+def close_pool():
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL = None
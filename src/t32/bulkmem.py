@@ -0,0 +1,129 @@
+"""
+Toplu bellek okuma/yazma (TRACE32 legacy API üzerinden).
+İstekler (adres, boy) adrese göre sıralanır, aradaki boşluk gap eşiğinin altındaysa
+tek aralıkta birleştirilir; her aralık PACKLEN'e göre bölünerek minimum sayıda
+T32_ReadMemory/T32_WriteMemory çağrısı yapılır. Sonuçlar tek bir tampon üzerinden,
+istek başına kopyasız memoryview olarak döner.
+"""
+import ctypes
+from dataclasses import dataclass, field
+
+from t32 import t32
+
+ACCESS_ED = 0x20        # normal data memory, CPU çalışırken de (ED:) — bkz. a2l/memaccess.py
+DEFAULT_GAP = 64        # bu kadar byte'tan küçük boşluklar tek okumaya katılır
+TCP_BLOCK = 0x4000      # TCP'de PACKLEN yok; çağrı başına üst sınır
+
+
+@dataclass
+class MemRange:
+    start: int
+    size: int
+    members: list = field(default_factory=list)     # [(istek_index, aralık_içi_ofset, boy)]
+
+
+def plan_ranges(requests: list[tuple[int, int]], gap: int = DEFAULT_GAP) -> list[MemRange]:
+    """(addr, size) isteklerini sıralayıp gap eşiği içinde birleştirir."""
+    order = sorted(range(len(requests)), key=lambda k: requests[k][0])
+    ranges: list[MemRange] = []
+    for k in order:
+        addr, size = requests[k]
+        if size <= 0: continue
+        cur = ranges[-1] if ranges else None
+        if cur is not None and addr <= cur.start + cur.size + gap:
+            cur.size = max(cur.size, addr + size - cur.start)
+        else:
+            cur = MemRange(addr, size)
+            ranges.append(cur)
+        cur.members.append((k, addr - cur.start, size))
+    return ranges
+
+
+def block_size(sess: t32.T32Session) -> int:
+    if sess.rcl_mode == "UDP":
+        return int(sess.packlen or 1024)
+    return TCP_BLOCK
+
+
+def _declare(api):
+    # memaccess.py ile aynı imzalar; mock nesnelerde argtypes yok, atlanır
+    for fn in (api.T32_ReadMemory, api.T32_WriteMemory):
+        if hasattr(fn, "argtypes"):
+            fn.argtypes = [ctypes.c_uint32, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+            fn.restype = ctypes.c_int
+
+
+@dataclass
+class BulkStats:
+    requests: int = 0
+    ranges: int = 0
+    calls: int = 0
+    bytes: int = 0
+
+
+def read_bulk(sess: t32.T32Session, requests: list[tuple[int, int]], access: int = ACCESS_ED,
+              gap: int = DEFAULT_GAP, block: int = 0, stats: BulkStats = None):
+    """
+    (buffer, views) döner: buffer tüm aralıkları ardışık tutan tek bytearray,
+    views[i] -> requests[i] için memoryview (boy 0 ise boş view).
+    """
+    api = sess.api
+    _declare(api)
+    block = block or block_size(sess)
+    ranges = plan_ranges(requests, gap)
+    buf = bytearray(sum(r.size for r in ranges))
+    mv = memoryview(buf)
+    views = [mv[0:0]] * len(requests)
+    calls = 0
+    pos = 0
+    for r in ranges:
+        ofs = 0
+        while ofs < r.size:
+            n = min(block, r.size - ofs)
+            cbuf = (ctypes.c_char * n).from_buffer(buf, pos + ofs)
+            with sess.lock:
+                rc = api.T32_ReadMemory(r.start + ofs, access, cbuf, n)
+            del cbuf
+            calls += 1
+            if rc != 0:
+                raise RuntimeError(f"T32_ReadMemory failed rc={rc} @0x{r.start + ofs:08X} ({n} byte)")
+            ofs += n
+        for k, rofs, size in r.members:
+            views[k] = mv[pos + rofs:pos + rofs + size]
+        pos += r.size
+    if stats is not None:
+        stats.requests += len(requests); stats.ranges += len(ranges)
+        stats.calls += calls; stats.bytes += len(buf)
+    return buf, views
+
+
+def write_bulk(sess: t32.T32Session, writes: list[tuple[int, bytes]], access: int = ACCESS_ED,
+               block: int = 0, stats: BulkStats = None) -> None:
+    """
+    (addr, data) yazımları. Yalnızca bitişik/çakışan yazımlar birleştirilir (gap=0):
+    aradaki bilinmeyen byte'ları hedefe yazmak güvenli değildir. Çakışmada sonraki kazanır.
+    """
+    api = sess.api
+    _declare(api)
+    block = block or block_size(sess)
+    ranges = plan_ranges([(a, len(d)) for a, d in writes], gap=0)
+    calls = total = 0
+    for r in ranges:
+        buf = bytearray(r.size)
+        for k, rofs, size in sorted(r.members, key=lambda m: m[0]):
+            buf[rofs:rofs + size] = writes[k][1]
+        ofs = 0
+        while ofs < r.size:
+            n = min(block, r.size - ofs)
+            cbuf = (ctypes.c_char * n).from_buffer(buf, ofs)
+            with sess.lock:
+                rc = api.T32_WriteMemory(r.start + ofs, access, cbuf, n)
+            del cbuf
+            calls += 1
+            if rc != 0:
+                raise RuntimeError(f"T32_WriteMemory failed rc={rc} @0x{r.start + ofs:08X} ({n} byte)")
+            ofs += n
+        total += r.size
+    if stats is not None:
+        stats.requests += len(writes); stats.ranges += len(ranges)
+        stats.calls += calls; stats.bytes += total
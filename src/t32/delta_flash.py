@@ -0,0 +1,200 @@
+"""
+Delta flash: yalnızca içeriği değişen flash sektörlerini silip programlar.
+- Hedef başına son flashlanan imajın sektör hash kaydı tutulur (flash_state/<hedef>.sectors.json).
+- Yeni imaj (BOOT S19 + ELF PT_LOAD) sektör haritasıyla karşılaştırılır.
+- Değişen sektörler için bir delta S19 ve onu yükleyen PRACTICE scripti üretilir;
+  startup.cmm &DELTA doluysa tam flash yerine bu scripti çalıştırır.
+
+Sektör haritası dosyası (satır başına bir sektör, ';' yorum):
+    0x00800000 0x4000
+    0x00804000 0x4000
+"""
+import os
+import json
+import hashlib
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from a2l.elf_image import ElfImage
+from a2l.hexfile import coalesce, read_srec, write_srec
+from t32 import t32
+
+STATE_DIR = os.path.join(t32.PROJECT_DIR, "flash_state")
+ERASED_BYTE = 0xFF
+
+
+def load_sector_map(path) -> list[tuple[int, int]]:
+    sectors = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for raw in f:
+            line = raw.split(";", 1)[0].split("#", 1)[0].replace(",", " ").strip()
+            if not line: continue
+            start, size = line.split()[:2]
+            sectors.append((int(start, 0), int(size, 0)))
+    sectors.sort()
+    return sectors
+
+
+def load_image(elf_path: Optional[str] = None, s19_paths: tuple = ()) -> list[tuple[int, bytes]]:
+    """BOOT/S19 dosyaları + ELF yükleme segmentleri -> tek imaj (ELF, S19'un üzerine yazar)."""
+    chunks = []
+    for p in s19_paths:
+        if p: chunks.extend(read_srec(Path(p)))
+    if elf_path:
+        with ElfImage(Path(elf_path)) as img:
+            chunks.extend((a, bytes(mv)) for a, mv in img.load_chunks())
+    return coalesce(chunks)
+
+
+def sector_bytes(image: list[tuple[int, bytes]], start: int, size: int, _starts=None) -> Optional[bytes]:
+    """Sektörün imajdaki içeriği (boşluklar 0xFF). İmajla hiç kesişmiyorsa None."""
+    starts = _starts or [a for a, _ in image]
+    i = max(bisect_right(starts, start) - 1, 0)
+    buf = None
+    end = start + size
+    while i < len(image) and image[i][0] < end:
+        a, d = image[i]
+        lo, hi = max(a, start), min(a + len(d), end)
+        if lo < hi:
+            if buf is None: buf = bytearray([ERASED_BYTE]) * size
+            buf[lo - start:hi - start] = memoryview(d)[lo - a:hi - a]
+        i += 1
+    return bytes(buf) if buf is not None else None
+
+
+def sector_hashes(image, sectors) -> dict:
+    starts = [a for a, _ in image]
+    out = {}
+    for start, size in sectors:
+        data = sector_bytes(image, start, size, starts)
+        out[f"0x{start:08X}"] = hashlib.blake2b(data, digest_size=16).hexdigest() if data else "erased"
+    return out
+
+
+def record_path(target: str, state_dir: str = STATE_DIR) -> str:
+    return os.path.join(state_dir, f"{target}.sectors.json")
+
+
+def load_record(target: str, state_dir: str = STATE_DIR) -> dict:
+    try:
+        with open(record_path(target, state_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_record(target: str, hashes: dict, state_dir: str = STATE_DIR) -> None:
+    os.makedirs(state_dir, exist_ok=True)
+    tmp = record_path(target, state_dir) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+    os.replace(tmp, record_path(target, state_dir))
+
+
+def invalidate_record(target: str, state_dir: str = STATE_DIR) -> None:
+    try:
+        os.remove(record_path(target, state_dir))
+    except OSError:
+        pass
+
+
+def invalidate_all(state_dir: str = STATE_DIR) -> None:
+    """Hedefi bilinmeyen tam flash sonrası: tüm sektör kayıtları geçersiz."""
+    try:
+        names = os.listdir(state_dir)
+    except OSError:
+        return
+    for n in names:
+        if n.endswith(".sectors.json"):
+            invalidate_record(n[:-len(".sectors.json")], state_dir)
+
+
+@dataclass
+class DeltaPlan:
+    sectors: list                                   # tüm harita
+    hashes: dict                                    # yeni imaj hashleri
+    changed: list = field(default_factory=list)     # [(start, size)]
+
+    @property
+    def changed_bytes(self) -> int:
+        return sum(s for _, s in self.changed)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(s for _, s in self.sectors)
+
+
+def plan_delta(image, sectors, record: dict) -> DeltaPlan:
+    hashes = sector_hashes(image, sectors)
+    plan = DeltaPlan(sectors, hashes)
+    for start, size in sectors:
+        key = f"0x{start:08X}"
+        if record.get(key) != hashes[key]:
+            plan.changed.append((start, size))
+    return plan
+
+
+def _ranges(changed):
+    """Bitişik sektörleri tek aralıkta birleştirir (daha az FLASH.ReProgram komutu)."""
+    out = []
+    for start, size in changed:
+        if out and out[-1][0] + out[-1][1] == start:
+            out[-1] = (out[-1][0], out[-1][1] + size)
+        else:
+            out.append((start, size))
+    return out
+
+
+def write_delta_files(plan: DeltaPlan, image, out_dir: str, target: str) -> str:
+    """Delta S19 + PRACTICE scriptini yazar, script yolunu döner."""
+    os.makedirs(out_dir, exist_ok=True)
+    s19 = os.path.abspath(os.path.join(out_dir, f"{target}.delta.s19"))
+    cmm = os.path.abspath(os.path.join(out_dir, f"{target}.delta.cmm"))
+    starts = [a for a, _ in image]
+    chunks = []
+    for start, size in plan.changed:
+        data = sector_bytes(image, start, size, starts)
+        if data: chunks.append((start, data))
+    # Script Data.LOAD.S3record kullanır: adresten bağımsız olarak S3 kaydı yaz
+    write_srec(Path(s19), chunks, header=f"{target} delta", rtype="3")
+
+    lines = [f"; delta_flash.py tarafından üretildi: {len(plan.changed)}/{len(plan.sectors)} sektör, "
+             f"{plan.changed_bytes} / {plan.total_bytes} byte",
+             "; &ELF startup.cmm tarafından set edilir", ""]
+    if plan.changed:
+        lines.append(f'PRINT "PROGRESS 30 Delta: erasing {len(plan.changed)} sector(s)"')
+        for start, size in _ranges(plan.changed):
+            lines.append(f"FLASH.ReProgram 0x{start:08X}--0x{start + size - 1:08X} /Erase")
+        if chunks:
+            lines.append('PRINT "PROGRESS 60 Delta: programming"')
+            lines.append(f'Data.LOAD.S3record "{s19}"')
+        lines.append("FLASH.ReProgram OFF")
+    else:
+        lines.append('PRINT "Delta flash: no sector changed"')
+    # Sembol/debug bilgisi her zaman yüklenir (kod yüklemeden)
+    lines += ['DATA.LOAD.ELF "&ELF" /NOCODE /MACRO', "ENDDO", ""]
+    with open(cmm, "w", encoding="utf-8", newline="\r\n") as f:
+        f.write("\n".join(lines))
+    return cmm
+
+
+def run_delta_flash(elf_path: str, boot_path: str, sector_map: str, target: str = "default",
+                    session: t32.T32Session = None, state_dir: str = STATE_DIR,
+                    startup_cmm: str = t32.STARTUP_CMM, force_full: bool = False,
+                    on_progress=None, cancel=None) -> DeltaPlan:
+    """Delta planı çıkarır, değişen sektörleri flashlar ve başarılıysa kaydı günceller."""
+    sectors = load_sector_map(sector_map)
+    image = load_image(elf_path, (boot_path,))
+    plan = plan_delta(image, sectors, {} if force_full else load_record(target, state_dir))
+    print(f"Delta flash [{target}]: {len(plan.changed)}/{len(sectors)} sektör değişti "
+          f"({plan.changed_bytes}/{plan.total_bytes} byte)")
+    cmm = write_delta_files(plan, image, state_dir, target)
+
+    # Yarıda kalan flash sonrası eski kayda güvenilmez: önce sil, başarıda yeniden yaz
+    invalidate_record(target, state_dir)
+    t32.run_flash(elf_path, boot_path, session=session, startup_cmm=startup_cmm, delta_cmm=cmm,
+                  on_progress=on_progress, cancel=cancel)
+    save_record(target, plan.hashes, state_dir)
+    return plan
@@ -0,0 +1,138 @@
+"""
+PRACTICE script izleyici (run_flash için).
+- T32_GetPracticeState'i uyarlamalı geri çekilmeyle yoklar: mesaj değiştikçe hızlı,
+  değişmedikçe yavaş.
+- T32_GetMessage ile script mesajlarını okur; startup.cmm'deki 'PROGRESS <yüzde> <metin>'
+  satırlarından yapılandırılmış ilerleme olayları üretir.
+- Yeni mesaj gelmeyen süre stall sayılır: script çalışıyorsa RUNNING_STALL_SEC (uzun,
+  mesajsız FLASH.Program ALL'a yetecek kadar), çalışmıyor ama bitmemişse (dialog/bekleme)
+  STALL_TIMEOUT_SEC. Toplam süre SCRIPT_TIMEOUT_SEC ile sınırlı; iptal istenirse script durdurulur.
+"""
+import ctypes
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from perf import timing
+
+PROGRESS_RE = re.compile(r"PROGRESS\s+(\d{1,3})\s*(.*)", re.I)
+
+POLL_MIN_SEC = 0.05
+POLL_MAX_SEC = 1.0
+POLL_FACTOR = 1.5
+SCRIPT_TIMEOUT_SEC = 600.0
+STALL_TIMEOUT_SEC = 180.0
+RUNNING_STALL_SEC = 300.0       # en uzun mesajsız adımdan (FLASH.Program ALL) uzun olmalı
+# T32_GetPracticeState: 0 bitti, 1 çalışıyor, 2 dialog açık (kullanıcı bekleniyor)
+PRACTICE_RUNNING = 1
+
+
+class FlashAborted(RuntimeError):
+    pass
+
+
+class FlashStalled(TimeoutError):
+    pass
+
+
+@dataclass
+class FlashProgress:
+    percent: int
+    stage: str
+    message: str
+    elapsed_s: float
+    running: bool = True
+
+
+class FlashMonitor:
+    def __init__(self, sess, on_progress: Optional[Callable[[FlashProgress], None]] = None,
+                 cancel: Optional[Callable[[], bool]] = None,
+                 timeout_s: float = SCRIPT_TIMEOUT_SEC, stall_s: float = STALL_TIMEOUT_SEC,
+                 running_stall_s: float = RUNNING_STALL_SEC):
+        self.sess = sess
+        self.on_progress = on_progress
+        self.cancel = cancel
+        self.timeout_s = timeout_s
+        self.stall_s = stall_s
+        self.running_stall_s = running_stall_s
+        self.percent = 0
+        self.stage = ""
+        self.message = ""
+        self.status = 0
+        self.polls = 0
+
+    def _emit(self, t0, running=True):
+        if self.on_progress:
+            self.on_progress(FlashProgress(self.percent, self.stage, self.message,
+                                           time.monotonic() - t0, running))
+
+    def _read_message(self) -> bool:
+        """Mesaj değiştiyse True."""
+        msg = ctypes.create_string_buffer(1024)
+        status = ctypes.c_uint16(0)
+        with self.sess.lock:
+            rc = self.sess.api.T32_GetMessage(ctypes.byref(msg), ctypes.byref(status))
+        if rc != 0:
+            return False
+        text = msg.value.decode("utf-8", errors="ignore").strip()
+        self.status = status.value
+        if text == self.message:
+            return False
+        self.message = text
+        m = PROGRESS_RE.search(text)
+        if m:
+            self.percent = max(self.percent, min(int(m.group(1)), 100))
+            self.stage = m.group(2).strip() or self.stage
+        elif text:
+            self.stage = text
+        return True
+
+    def abort(self):
+        # PRACTICE 'END' çalışan tüm scriptleri sonlandırır
+        with self.sess.lock:
+            self.sess.api.T32_Cmd(b"END")
+
+    def run(self):
+        """Script bitene kadar bekler; bitince son mesaj self.message/self.status'tadır."""
+        state = ctypes.c_int(-1)
+        t0 = time.monotonic()
+        last_change = t0
+        delay = POLL_MIN_SEC
+        self._emit(t0)
+        while True:
+            with self.sess.lock:
+                rc = self.sess.api.T32_GetPracticeState(ctypes.byref(state))
+            self.polls += 1
+            timing.count("t32.polls")
+            if rc != 0:
+                raise RuntimeError(f"T32_GetPracticeState failed rc={rc}")
+
+            changed = self._read_message()
+            now = time.monotonic()
+            if changed:
+                last_change = now
+                delay = POLL_MIN_SEC
+                self._emit(t0)
+            else:
+                delay = min(delay * POLL_FACTOR, POLL_MAX_SEC)
+
+            # 0 genelde NOT_RUNNING (script bitti)
+            if state.value == 0:
+                self._emit(t0, running=False)
+                return
+
+            if self.cancel and self.cancel():
+                self.abort()
+                raise FlashAborted("Flash kullanıcı tarafından iptal edildi")
+            stall_s = self.running_stall_s if state.value == PRACTICE_RUNNING else self.stall_s
+            if now - last_change > stall_s:
+                self.abort()
+                raise FlashStalled(f"CMM stall: {stall_s:.0f} sn yeni mesaj yok "
+                                   f"(durum={state.value}, son: {self.message!r})")
+            if now - t0 > self.timeout_s:
+                self.abort()
+                raise TimeoutError("CMM timeout: script bitmedi")
+
+            timing.count("t32.sleep_ms", int(delay * 1000))
+            time.sleep(delay)
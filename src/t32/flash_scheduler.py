@@ -0,0 +1,125 @@
+"""
+Çoklu tezgah flash zamanlayıcı.
+Her hedef (config.t32 + PORT + ELF + BOOT) kendi TRACE32 instance'ına, kendi
+worker thread'inde flashlanır. Bir hedefin hatası diğerlerini durdurmaz; sonuçlar
+FlashReport altında toplanır.
+"""
+import os
+import time
+import atexit
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from t32 import t32
+
+
+@dataclass
+class FlashTarget:
+    name: str
+    config_path: str
+    elf_path: str
+    boot_path: str
+    t32_exe: str = t32.T32_EXE
+    startup_cmm: str = t32.STARTUP_CMM
+    node: str = "localhost"
+    sector_map: str = ""        # doluysa delta flash (delta_flash.py), boşsa tam flash
+
+
+@dataclass
+class FlashResult:
+    name: str
+    ok: bool
+    duration_s: float
+    error: str = ""
+
+
+@dataclass
+class FlashReport:
+    results: list = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    @property
+    def failed(self) -> list:
+        return [r for r in self.results if not r.ok]
+
+    def summary(self) -> str:
+        lines = [f"{len(self.results) - len(self.failed)}/{len(self.results)} hedef OK, toplam {self.wall_s:.1f} sn"]
+        for r in self.results:
+            lines.append(f"  {r.name}: {'OK' if r.ok else 'FAILED'} ({r.duration_s:.1f} sn) {r.error}".rstrip())
+        return "\n".join(lines)
+
+
+# Port -> kalıcı oturum (tek hedefli get_session ile aynı mantık, hedef başına)
+_SESSIONS: dict = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def session_for(target: FlashTarget, api_loader=t32.load_legacy_api) -> t32.T32Session:
+    new = t32.T32Session.from_config(target.config_path, target.t32_exe, api_loader=api_loader,
+                                     node=target.node, single_instance=False)
+    key = (new.node, new.port)
+    with _SESSIONS_LOCK:
+        s = _SESSIONS.get(key)
+        if s is None or (s.rcl_mode, s.packlen) != (new.rcl_mode, new.packlen):
+            if s is not None: s.close()
+            s = _SESSIONS[key] = new
+        return s
+
+
+def close_sessions():
+    with _SESSIONS_LOCK:
+        for s in _SESSIONS.values():
+            s.close()
+        _SESSIONS.clear()
+
+
+atexit.register(close_sessions)
+
+
+def _flash_one(target: FlashTarget, api_loader, log: Optional[Callable[[str], None]]) -> FlashResult:
+    t0 = time.monotonic()
+    try:
+        sess = session_for(target, api_loader)
+        if log: log(f"[{target.name}] PORT={sess.port} flashing {os.path.basename(target.elf_path)}")
+        if target.sector_map:
+            from t32 import delta_flash
+            plan = delta_flash.run_delta_flash(target.elf_path, target.boot_path, target.sector_map,
+                                               target.name, session=sess, startup_cmm=target.startup_cmm)
+            if log: log(f"[{target.name}] delta: {len(plan.changed)}/{len(plan.sectors)} sectors")
+        else:
+            # target: tam flash yalnız bu hedefin delta kaydını geçersiz kılar
+            t32.run_flash(target.elf_path, target.boot_path, session=sess, startup_cmm=target.startup_cmm,
+                          target=target.name)
+        if log: log(f"[{target.name}] OK")
+        return FlashResult(target.name, True, time.monotonic() - t0)
+    except Exception as e:
+        if log: log(f"[{target.name}] FAILED: {e}\n{traceback.format_exc()}")
+        return FlashResult(target.name, False, time.monotonic() - t0, str(e))
+
+
+def flash_targets(targets: list[FlashTarget], api_loader=t32.load_legacy_api,
+                  log: Optional[Callable[[str], None]] = None) -> FlashReport:
+    """Tüm hedefleri eşzamanlı flashlar (instance başına bir worker)."""
+    ports = {}
+    for tg in targets:
+        key = (tg.node, t32.read_config(tg.config_path)[1])
+        if key in ports:
+            raise ValueError(f"{tg.name} ve {ports[key]} aynı TRACE32 portunu kullanıyor: {key[1]}")
+        ports[key] = tg.name
+
+    t0 = time.monotonic()
+    report = FlashReport()
+    if not targets:
+        return report
+    with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="t32flash") as ex:
+        futs = [ex.submit(_flash_one, tg, api_loader, log) for tg in targets]
+        report.results = [f.result() for f in futs]
+    report.wall_s = time.monotonic() - t0
+    return report
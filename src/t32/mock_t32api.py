@@ -0,0 +1,186 @@
+"""
+t32api (legacy ctypes) yerine geçen, süreç içi sahte TRACE32.
+DLL'siz ortamda (Linux/CI) T32Session ve run_flash akışını denemek için:
+
+    from t32 import t32, mock_t32api
+    api = mock_t32api.MockT32Api(boot_delay_s=0.3)
+    sess = t32.T32Session("TCP", "20000", None, api_loader=lambda: api)   # t32_exe yok -> başlatma yok
+    t32.run_flash("app.elf", "boot.s19", session=sess)
+
+Gecikmeler: boot_delay_s (T32_Init başarısız döner), script_time_s (DO süresi),
+call_latency_s (her T32_* çağrısı, DLL/TCP gidiş-dönüşü), cmd_latency_s (T32_Cmd ek).
+program_on_do=True ise DO ile &ELF/&BOOT imajı belleğe yazılır (verify_flash geçer).
+simulated_s: çağrılarda harcanan yapay gecikme toplamı.
+"""
+import ctypes
+import re
+import threading
+import time
+import zlib
+
+
+MACRO_RE = re.compile(r'^&(\w+)="(.*)"$')
+DATA_SUM_RE = re.compile(r"^Data\.SUM\s+(0x[0-9A-Fa-f]+)--(0x[0-9A-Fa-f]+)\s*/CRC32", re.I)
+
+
+def _deref(ref):
+    # ctypes.byref(...) -> CArgObject; asıl nesne _obj içinde
+    return getattr(ref, "_obj", ref)
+
+
+class MockT32Api:
+    """T32_* fonksiyon yüzeyini taklit eder. Dönüş kodları legacy API ile aynı (0 = OK)."""
+
+    def __init__(self, boot_delay_s: float = 0.0, script_time_s: float = 0.0, message: str = "File loaded",
+                 call_latency_s: float = 0.0, cmd_latency_s: float = 0.0, program_on_do: bool = False):
+        self.boot_delay_s = boot_delay_s
+        self.script_time_s = script_time_s
+        self.message = message
+        self.call_latency_s = call_latency_s
+        self.cmd_latency_s = cmd_latency_s
+        self.program_on_do = program_on_do
+        self.simulated_s = 0.0
+        self.macros = {}
+        self.config = {}
+        self.commands = []
+        self.memory = {}
+        self.calls = {}
+        self._t0 = time.monotonic()
+        self._script_end = 0.0
+        self._inited = False
+        self._lock = threading.Lock()
+        self._sum = 0
+        self._eval = 0
+
+    def _count(self, name, latency: float = 0.0):
+        latency += self.call_latency_s
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.simulated_s += latency
+        if latency > 0:
+            time.sleep(latency)
+
+    # --- bağlantı --------------------------------------------------------
+    def T32_Config(self, key: bytes, value: bytes):
+        self._count("T32_Config")
+        self.config[key.decode()] = value.decode()
+        return 0
+
+    def T32_Init(self):
+        self._count("T32_Init")
+        if time.monotonic() - self._t0 < self.boot_delay_s:
+            return -1
+        self._inited = True
+        return 0
+
+    def T32_Attach(self, dev):
+        self._count("T32_Attach")
+        return 0 if self._inited else -1
+
+    def T32_Ping(self):
+        self._count("T32_Ping")
+        return 0 if self._inited else -1
+
+    def T32_Exit(self):
+        self._count("T32_Exit")
+        self._inited = False
+        return 0
+
+    # --- komut / PRACTICE ------------------------------------------------
+    def T32_Cmd(self, cmd: bytes):
+        self._count("T32_Cmd", self.cmd_latency_s)
+        if not self._inited: return -1
+        text = cmd.decode("utf-8", errors="ignore")
+        self.commands.append(text)
+        mm = MACRO_RE.match(text)
+        if mm:
+            self.macros[mm.group(1).upper()] = mm.group(2)
+        if text.upper().startswith("DO "):
+            self._script_end = time.monotonic() + self.script_time_s
+            with self._lock:
+                self.simulated_s += self.script_time_s
+            if self.program_on_do:
+                self._program()
+        m = DATA_SUM_RE.match(text)
+        if m:
+            a, b = int(m.group(1), 16), int(m.group(2), 16)
+            self._sum = zlib.crc32(self.read(a, b - a + 1))
+        elif text.upper().startswith("EVAL DATA.SUM()"):
+            self._eval = self._sum
+        return 0
+
+    def _program(self):
+        # startup.cmm'nin yaptığını taklit et: BOOT + ELF imajını belleğe yaz
+        from t32.delta_flash import load_image
+        elf, boot = self.macros.get("ELF"), self.macros.get("BOOT")
+        self.load(load_image(elf or None, (boot,) if boot else ()))
+
+    def T32_EvalGet(self, value_ref):
+        self._count("T32_EvalGet")
+        _deref(value_ref).value = self._eval
+        return 0
+
+    def T32_Stop(self):
+        self._count("T32_Stop")
+        self._script_end = 0.0
+        return 0
+
+    def T32_GetPracticeState(self, state_ref):
+        self._count("T32_GetPracticeState")
+        _deref(state_ref).value = 1 if time.monotonic() < self._script_end else 0
+        return 0
+
+    def T32_GetMessage(self, msg_ref, status_ref):
+        self._count("T32_GetMessage")
+        buf = _deref(msg_ref)
+        text = self.message
+        now = time.monotonic()
+        if now < self._script_end and self.script_time_s > 0:
+            # Script çalışırken startup.cmm gibi 'PROGRESS <yüzde>' mesajları üret
+            done = 1.0 - (self._script_end - now) / self.script_time_s
+            text = f"PROGRESS {int(done * 10) * 10} Flashing"
+        data = text.encode("utf-8")[:len(buf) - 1]
+        ctypes.memmove(buf, data + b"\0", len(data) + 1)
+        _deref(status_ref).value = 0
+        return 0
+
+    # --- bellek (seyrek, 4 KiB sayfalar) ---------------------------------
+    PAGE = 0x1000
+
+    def _page(self, addr):
+        pg = self.memory.get(addr // self.PAGE)
+        if pg is None:
+            pg = self.memory[addr // self.PAGE] = bytearray(b"\xff") * self.PAGE   # silinmiş flash gibi
+        return pg
+
+    def read(self, address, size) -> bytes:
+        out = bytearray()
+        while size > 0:
+            ofs = address % self.PAGE
+            n = min(size, self.PAGE - ofs)
+            out += self._page(address)[ofs:ofs + n]
+            address += n; size -= n
+        return bytes(out)
+
+    def write(self, address, data: bytes):
+        mv = memoryview(data)
+        while len(mv):
+            ofs = address % self.PAGE
+            n = min(len(mv), self.PAGE - ofs)
+            self._page(address)[ofs:ofs + n] = mv[:n]
+            address += n; mv = mv[n:]
+
+    def load(self, chunks):
+        """[(addr, bytes)] imajını belleğe yazar (flashlanmış hedef gibi)."""
+        for addr, data in chunks:
+            self.write(addr, data)
+
+    def T32_ReadMemory(self, address, access, buf, size):
+        self._count("T32_ReadMemory")
+        ctypes.memmove(buf, self.read(address, size), size)
+        return 0
+
+    def T32_WriteMemory(self, address, access, buf, size):
+        self._count("T32_WriteMemory")
+        self.write(address, ctypes.string_at(buf, size))
+        return 0
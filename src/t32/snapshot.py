@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Çalışan ECU'dan adres -> değer snapshot'ı ve iki snapshot'ın karşılaştırması.
+- Adreslenmiş A2L'deki MEASUREMENT / CHARACTERISTIC / AXIS_PTS nesneleri (a2l_objects.read_items)
+  adrese göre sıralanır; bulkmem okuma planı yakın nesneleri birleştirir, ED: (CPU çalışırken) okunur.
+- Dosya sütun bazlı: isimler, türler, adres dizisi, boy dizisi ve tek ham byte tamponu.
+- Diff: yerleşim aynıysa ham tamponlar DIFF_BLOCK'luk bloklar halinde karşılaştırılır, yalnız
+  farklı bloklardaki nesnelere inilir; yerleşim farklıysa (başka A2L) isimle eşlenir.
+
+  PYTHONPATH=src python -m t32.snapshot capture --a2l pj1_ecu_1234.a2l --out before.snap
+  PYTHONPATH=src python -m t32.snapshot diff before.snap after.snap [--csv diff.csv]
+"""
+import sys
+import csv
+import json
+import time
+import struct
+import argparse
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from a2l.a2l_objects import read_items
+from t32 import t32, bulkmem
+from perf import timing
+
+MAGIC = b"ECUSNAP1"
+KINDS = ("CHARACTERISTIC", "MEASUREMENT", "AXIS_PTS")
+DIFF_BLOCK = 4096
+# Snapshot'ta aradaki boşluğu okumak ayrı bir çağrıdan ucuz: bulkmem varsayılanından geniş birleştir
+SNAPSHOT_GAP = 256
+
+
+@dataclass
+class Snapshot:
+    names: list
+    kinds: bytes                # KINDS indeksi, nesne başına 1 byte
+    addrs: array                # 'Q'
+    sizes: array                # 'I'
+    raw: bytes                  # değerler addrs sırasıyla art arda
+    meta: dict = field(default_factory=dict)
+    _offsets: array = field(default=None, repr=False, compare=False)
+
+    def __len__(self):
+        return len(self.names)
+
+    def offsets(self) -> array:
+        """raw içindeki başlangıç ofsetleri (son eleman toplam boy)."""
+        if self._offsets is None:
+            ofs, pos = array("Q", [0]) * (len(self.sizes) + 1), 0
+            for i, s in enumerate(self.sizes):
+                pos += s
+                ofs[i + 1] = pos
+            self._offsets = ofs
+        return self._offsets
+
+    def value(self, i: int) -> bytes:
+        o = self.offsets()
+        return self.raw[o[i]:o[i + 1]]
+
+
+def read_plan_items(a2l_text: str, kinds: tuple = KINDS) -> list:
+    """Adresi ve boyu bilinen nesneler, adres sırasıyla."""
+    items = [it for it in read_items(a2l_text, kinds) if it.address and it.size]
+    items.sort(key=lambda it: (it.address, it.name))
+    return items
+
+
+def capture(sess: t32.T32Session, items: list, access: int = bulkmem.ACCESS_ED, gap: int = SNAPSHOT_GAP,
+            stats: bulkmem.BulkStats = None, meta: dict = None) -> Snapshot:
+    with timing.span("snapshot.capture", items=len(items)):
+        _, views = bulkmem.read_bulk(sess, [(it.address, it.size) for it in items], access, gap, stats=stats)
+        raw = b"".join(views)
+    m = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "access": access}
+    m.update(meta or {})
+    return Snapshot([it.name for it in items], bytes(KINDS.index(it.kind) for it in items),
+                    array("Q", (it.address for it in items)), array("I", (it.size for it in items)), raw, m)
+
+
+def _le(a: array) -> bytes:
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def save(snap: Snapshot, path: str) -> None:
+    names = "\n".join(snap.names).encode("utf-8")
+    cols = [names, snap.kinds, _le(snap.addrs), _le(snap.sizes), snap.raw]
+    hdr = json.dumps({"count": len(snap), "meta": snap.meta,
+                      "sections": dict(zip(("names", "kinds", "addrs", "sizes", "raw"), map(len, cols)))})
+    tmp = Path(str(path) + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(hdr)))
+        f.write(hdr.encode("utf-8"))
+        for c in cols:
+            f.write(c)
+    tmp.replace(path)
+
+
+def load(path: str) -> Snapshot:
+    data = Path(path).read_bytes()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Snapshot dosyası değil: {path}")
+    pos = len(MAGIC) + 4
+    (n,) = struct.unpack_from("<I", data, len(MAGIC))
+    hdr = json.loads(data[pos:pos + n])
+    pos += n
+    cols = {}
+    for name in ("names", "kinds", "addrs", "sizes", "raw"):
+        size = hdr["sections"][name]
+        cols[name] = data[pos:pos + size]
+        pos += size
+    addrs, sizes = array("Q"), array("I")
+    addrs.frombytes(cols["addrs"])
+    sizes.frombytes(cols["sizes"])
+    if sys.byteorder == "big":
+        addrs.byteswap(); sizes.byteswap()
+    names = cols["names"].decode("utf-8").split("\n") if hdr["count"] else []
+    return Snapshot(names, cols["kinds"], addrs, sizes, cols["raw"], hdr.get("meta", {}))
+
+
+@dataclass
+class Change:
+    name: str
+    kind: str
+    address: int
+    old: bytes
+    new: bytes
+    note: str = ""
+
+
+@dataclass
+class SnapshotDiff:
+    changes: list = field(default_factory=list)
+    added: list = field(default_factory=list)       # yalnız yeni snapshot'ta olan isimler
+    removed: list = field(default_factory=list)
+    compared: int = 0
+
+
+def diff(a: Snapshot, b: Snapshot, block: int = DIFF_BLOCK) -> SnapshotDiff:
+    with timing.span("snapshot.diff", items=len(b)):
+        if a.names == b.names and a.addrs == b.addrs and a.sizes == b.sizes:
+            return _diff_same_layout(a, b, block)
+        return _diff_by_name(a, b)
+
+
+def _diff_same_layout(a: Snapshot, b: Snapshot, block: int) -> SnapshotDiff:
+    res = SnapshotDiff(compared=len(b))
+    ofs = b.offsets()
+    ra, rb = a.raw, b.raw
+    last = -1
+    for s in range(0, len(rb), block):
+        e = s + block
+        if ra[s:e] == rb[s:e]:
+            continue
+        # Blokla kesişen nesneler; birden fazla bloğa yayılan nesne bir kez raporlanır
+        i = max(bisect_right(ofs, s) - 1, last + 1)
+        while i < len(b) and ofs[i] < e:
+            if ra[ofs[i]:ofs[i + 1]] != rb[ofs[i]:ofs[i + 1]]:
+                res.changes.append(Change(b.names[i], KINDS[b.kinds[i]], b.addrs[i], a.value(i), b.value(i)))
+            last = i
+            i += 1
+    return res
+
+
+def _diff_by_name(a: Snapshot, b: Snapshot) -> SnapshotDiff:
+    res = SnapshotDiff()
+    old = {n: i for i, n in enumerate(a.names)}
+    seen = set()
+    for j, n in enumerate(b.names):
+        i = old.get(n)
+        if i is None:
+            res.added.append(n)
+            continue
+        seen.add(n)
+        res.compared += 1
+        va, vb = a.value(i), b.value(j)
+        note = "" if a.addrs[i] == b.addrs[j] else f"moved from 0x{a.addrs[i]:X}"
+        if va != vb or note:
+            res.changes.append(Change(n, KINDS[b.kinds[j]], b.addrs[j], va, vb, note))
+    res.removed = [n for n in a.names if n not in seen]
+    return res
+
+
+def format_diff(d: SnapshotDiff, limit: int = 50) -> str:
+    lines = [f"{d.compared} nesne karşılaştırıldı: {len(d.changes)} farklı, "
+             f"{len(d.added)} yeni, {len(d.removed)} silinmiş"]
+    for c in d.changes[:limit]:
+        lines.append(f"  {c.name:<40} 0x{c.address:08X} {c.old.hex():>16} -> {c.new.hex():<16} {c.note}")
+    if len(d.changes) > limit:
+        lines.append(f"  ... {len(d.changes) - limit} fark daha (--csv ile tamamı)")
+    return "\n".join(lines)
+
+
+def write_diff_csv(d: SnapshotDiff, path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["ParameterName", "Kind", "Address", "Old", "New", "Note"])
+        for c in d.changes: w.writerow([c.name, c.kind, f"0x{c.address:X}", c.old.hex(), c.new.hex(), c.note])
+        for n in d.added: w.writerow([n, "", "", "", "", "ADDED"])
+        for n in d.removed: w.writerow([n, "", "", "", "", "REMOVED"])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="ECU değer snapshot'ı (TRACE32, ED:) ve snapshot karşılaştırma")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("capture", help="adreslenmiş A2L'deki nesneleri çalışan ECU'dan oku")
+    c.add_argument("--a2l", required=True)
+    c.add_argument("--out", required=True)
+    c.add_argument("--gap", type=int, default=SNAPSHOT_GAP, help="birleştirme boşluğu (byte)")
+    c.add_argument("--kinds", default=",".join(KINDS))
+    d = sub.add_parser("diff", help="iki snapshot'ı karşılaştır")
+    d.add_argument("old")
+    d.add_argument("new")
+    d.add_argument("--csv", default="")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "capture":
+        items = read_plan_items(Path(args.a2l).read_text(encoding="utf-8", errors="ignore"),
+                                tuple(k for k in args.kinds.split(",") if k))
+        sess = t32.get_session()
+        sess.ensure()
+        stats = bulkmem.BulkStats()
+        t0 = time.perf_counter()
+        snap = capture(sess, items, gap=args.gap, stats=stats, meta={"a2l": str(args.a2l)})
+        save(snap, args.out)
+        print(f"{len(snap)} nesne, {stats.ranges} aralık, {stats.calls} okuma, {stats.bytes} byte "
+              f"-> {args.out} ({time.perf_counter() - t0:.2f} s)")
+        return 0
+    res = diff(load(args.old), load(args.new))
+    print(format_diff(res))
+    if args.csv:
+        write_diff_csv(res, args.csv)
+    return 1 if res.changes or res.added or res.removed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,8 +17,13 @@ import time
 import ctypes
 import subprocess
 import sys
+import atexit
+import threading
 from pathlib import Path
 
+from t32.flash_monitor import FlashMonitor
+from perf import timing
+
 # --- KULLANICI AYARLARI (tek sefer) ------------------------------------------
 # PowerPC için t32mppc.exe, ARM için t32marm.exe kullanın.
 TRACE32_INSTALL = r"D:\T32"  # T32 kurulum kökü (ör: D:\T32)
@@ -35,9 +40,12 @@ CONFIG_PATH = os.path.join(PROJECT_DIR, "config.t32")
 # (opsiyonel) başlangıç scripti istiyorsanız buraya koyun:
 STARTUP_CMM = os.path.join(PROJECT_DIR, "startup.cmm")  # yoksa otomatik atlanır
 
-# TRACE32 açıldıktan sonra kaç sn beklensin (GUI/port hazır için)
-BOOT_SLEEP_SEC = 5.0
+# TRACE32 açıldıktan sonra API hazır olana kadar en fazla kaç sn beklensin
 API_TIMEOUT_SEC = 20.0
+# Hazırlık yoklaması (T32_Ping) için geri çekilme: ilk bekleme, çarpan, üst sınır
+READY_POLL_MIN_SEC = 0.05
+READY_POLL_MAX_SEC = 1.0
+READY_POLL_FACTOR = 2.0
 # ----------------------------------------------------------------------------
 
 
@@ -89,16 +97,18 @@ def read_config(path):
     return rcl, port, packlen
 
 
-def start_trace32_with_config(t32_exe, cfg_path, workdir):
+def start_trace32_with_config(t32_exe, cfg_path, workdir, check_running=True):
+    # check_running: aynı exe çalışıyorsa başlatma (tek tezgah). Çoklu instance'ta False verilir.
     exe_name = os.path.basename(t32_exe).lower()
     try:
-        out = subprocess.check_output(
-            ["tasklist", "/FI", f"IMAGENAME eq {exe_name}"],
-            universal_newlines=True
-        )
-        if exe_name in out.lower():
-            print("TRACE32 already running.")
-            return None
+        if check_running:
+            out = subprocess.check_output(
+                ["tasklist", "/FI", f"IMAGENAME eq {exe_name}"],
+                universal_newlines=True
+            )
+            if exe_name in out.lower():
+                print("TRACE32 already running.")
+                return None
     except Exception:
         pass
         
@@ -109,117 +119,265 @@ def start_trace32_with_config(t32_exe, cfg_path, workdir):
     return proc
 
 
-def connect_via_legacy_api(rcl_mode, port, packlen, timeout_s=API_TIMEOUT_SEC):
-    """
-    Legacy t32api64.dll ile bağlan.
-    TCP ise PACKLEN gönderme, UDP ise PACKLEN zorunlu.
-    """
+def load_legacy_api():
+    """t32api64.dll'i yükler (WinDLL -> stdcall). Testlerde yerine mock verilebilir."""
     os.add_dll_directory(DLL_DIR)
-    dll_path = os.path.join(DLL_DIR, "t32api64.dll")
-    # WinDLL -> stdcall
-    t32api = ctypes.WinDLL(dll_path)
+    return ctypes.WinDLL(os.path.join(DLL_DIR, "t32api64.dll"))
 
-    # Temiz başlangıç (güvenlik)
-    try:
-        t32api.T32_Exit()
-    except Exception:
-        pass
 
-    t32api.T32_Config(b"NODE=", b"localhost")
-    t32api.T32_Config(b"PORT=", port.encode("ascii"))
+# Legacy API DLL'i süreç başına tek bir global durum tutar. Birden fazla TRACE32
+# instance'ı channel mekanizmasıyla (T32_SetChannel) ayrılır; her çağrı bu kilit
+# altında kendi channel'ını seçerek yapılır.
+API_LOCK = threading.RLock()
 
-    if rcl_mode == "UDP":
-        t32api.T32_Config(b"PACKLEN=", (packlen or "1024").encode("ascii"))
-    # TCP'de PACKLEN gönderME
 
-    start = time.time()
-    while True:
-        rc = t32api.T32_Init()
-        if rc == 0 and t32api.T32_Attach(1) == 0 and t32api.T32_Ping() == 0:
-            print(f"TRACE32 API bağlantısı OK ({rcl_mode}:{port})")
-            return t32api
+class _ChannelLock:
+    """'with sess.lock:' -> global API kilidini al + oturumun channel'ını seç."""
 
-        if time.time() - start > timeout_s:
-            raise RuntimeError(f"API bağlantı zaman aşımı (mode={rcl_mode}, port={port}). "
-                               f"T32_Init rc={rc}")
-        time.sleep(0.5)
+    def __init__(self, sess):
+        self.sess = sess
 
+    def __enter__(self):
+        API_LOCK.acquire()
+        try:
+            if self.sess.channel is not None:
+                self.sess.api.T32_SetChannel(self.sess.channel)
+        except Exception:
+            API_LOCK.release()
+            raise
+        return self
 
-def run_flash(elf_path: str, boot_path: str):
- # 1) config.t32'yi oku
-    rcl_mode, port, packlen = read_config(CONFIG_PATH)
-    print(f"config.t32 -> RCL={rcl_mode} PORT={port}"
-          + (f" PACKLEN={packlen}" if rcl_mode == "UDP" else ""))
+    def __exit__(self, *exc):
+        API_LOCK.release()
 
-    # 2) TRACE32'yi proje config'iyle başlat
-    start_trace32_with_config(T32_EXE, CONFIG_PATH, PROJECT_DIR)
 
-    # 3) GUI/port hazır için kısa bekleme
-    time.sleep(BOOT_SLEEP_SEC)
+class T32Session:
+    """
+    TRACE32 Remote API bağlantısını çalıştırmalar arasında açık tutar.
+    - Hazırlık sabit sleep yerine T32_Init/Attach/Ping + üstel geri çekilme ile beklenir.
+    - Bağlantı yalnızca close() çağrılınca (T32_Exit) kapatılır.
+    """
 
-    # 4) Legacy API ile bağlan
-    t32 = connect_via_legacy_api(rcl_mode, port, packlen)
+    def __init__(self, rcl_mode, port, packlen, node="localhost", api_loader=load_legacy_api,
+                 config_path=None, t32_exe=None, workdir=None, single_instance=True):
+        self.rcl_mode = rcl_mode
+        self.port = str(port)
+        self.packlen = packlen
+        self.node = node
+        self._api_loader = api_loader
+        # TRACE32'yi gerektiğinde başlatmak için (t32_exe None ise başlatma yapılmaz)
+        self.config_path = config_path
+        self.t32_exe = t32_exe
+        self.workdir = workdir
+        self.single_instance = single_instance
+        self.api = None
+        self.channel = None
+        self.connected = False
+        self.lock = _ChannelLock(self)
+
+    def _open_channel(self):
+        """API channel destekliyorsa bu oturuma ayrı bir channel ayırır."""
+        api = self.api
+        if self.channel is not None or not hasattr(api, "T32_GetChannelSize"):
+            return
+        with API_LOCK:
+            self.channel = ctypes.create_string_buffer(api.T32_GetChannelSize())
+            api.T32_GetChannelDefaults(self.channel)
+            api.T32_SetChannel(self.channel)
+
+    def _configure(self):
+        api = self.api
+        api.T32_Config(b"NODE=", self.node.encode("ascii"))
+        api.T32_Config(b"PORT=", self.port.encode("ascii"))
+        if self.rcl_mode == "UDP":
+            api.T32_Config(b"PACKLEN=", (self.packlen or "1024").encode("ascii"))
+        # TCP'de PACKLEN gönderME
+
+    @classmethod
+    def from_config(cls, config_path, t32_exe=T32_EXE, workdir=None, api_loader=load_legacy_api,
+                    node="localhost", single_instance=True):
+        rcl_mode, port, packlen = read_config(config_path)
+        return cls(rcl_mode, port, packlen, node=node, api_loader=api_loader, config_path=config_path,
+                   t32_exe=t32_exe, workdir=workdir or os.path.dirname(os.path.abspath(config_path)),
+                   single_instance=single_instance)
+
+    def launch(self):
+        """Oturum canlı değilse TRACE32'yi kendi config.t32'siyle başlatır."""
+        if not (self.t32_exe and self.config_path) or self.is_alive():
+            return None
+        if not self.single_instance:
+            # Çoklu instance: exe adına bakılamaz; bu porttan cevap geliyorsa zaten açıktır
+            try:
+                self.wait_ready(timeout_s=READY_POLL_MAX_SEC)
+                return None
+            except RuntimeError:
+                pass
+        return start_trace32_with_config(self.t32_exe, self.config_path, self.workdir,
+                                         check_running=self.single_instance)
+
+    def is_alive(self) -> bool:
+        with self.lock:
+            if not self.connected: return False
+            try:
+                return self.api.T32_Ping() == 0
+            except Exception:
+                return False
+
+    @timing.traced("t32.wait_ready")
+    def wait_ready(self, timeout_s=API_TIMEOUT_SEC):
+        """T32_Init + Attach + Ping başarılı olana kadar geri çekilmeli yoklar."""
+        if self.api is None:
+            self.api = self._api_loader()
+            self._open_channel()
+        delay = READY_POLL_MIN_SEC
+        start = time.monotonic()
+        while True:
+            with self.lock:
+                # Temiz başlangıç: yarım kalmış bağlantıyı bırak
+                try:
+                    self.api.T32_Exit()
+                except Exception:
+                    pass
+                self._configure()
+                rc = self.api.T32_Init()
+                ok = rc == 0 and self.api.T32_Attach(1) == 0 and self.api.T32_Ping() == 0
+            if ok:
+                self.connected = True
+                print(f"TRACE32 API bağlantısı OK ({self.rcl_mode}:{self.port}) "
+                      f"{time.monotonic() - start:.2f} sn")
+                return self.api
+            if time.monotonic() - start > timeout_s:
+                raise RuntimeError(f"API bağlantı zaman aşımı (mode={self.rcl_mode}, port={self.port}). "
+                                   f"T32_Init rc={rc}")
+            # Bekleme kilit dışında: diğer instance'ların çağrılarını bloklamaz
+            timing.count("t32.sleep_ms", int(delay * 1000))
+            time.sleep(delay)
+            delay = min(delay * READY_POLL_FACTOR, READY_POLL_MAX_SEC)
+
+    def ensure(self, timeout_s=API_TIMEOUT_SEC):
+        """Bağlantı canlıysa aynen kullanır, değilse yeniden bağlanır."""
+        if self.is_alive():
+            return self.api
+        self.connected = False
+        return self.wait_ready(timeout_s)
+
+    def cmd(self, text: str, what: str = "T32_Cmd failed"):
+        timing.count("t32.cmd")
+        with self.lock:
+            rc = self.api.T32_Cmd(text.encode("utf-8"))
+        if rc < 0:
+            raise RuntimeError(f"{what} (rc={rc})")
+        return rc
+
+    def close(self):
+        with self.lock:
+            if self.api is not None and self.connected:
+                try:
+                    self.api.T32_Exit()
+                except Exception:
+                    pass
+            self.connected = False
 
-    # 5) Program/Message Area'ya yaz
-    msg = 'PRINT "Python connected via project config.t32"'
-    rc = t32.T32_Cmd(msg.encode("utf-8"))
-    if rc < 0:
-        raise RuntimeError("T32_Cmd hata: Remote API iletişim sorunu")
 
-    elf_path = os.path.abspath(elf_path)
-    boot_path = os.path.abspath(boot_path)
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
 
-    rc = t32.T32_Cmd(f'&ELF="{elf_path}"'.encode("utf-8"))
-    if rc < 0:
-        raise RuntimeError("T32_Cmd failed while setting &ELF")
 
-    rc = t32.T32_Cmd(f'&BOOT="{boot_path}"'.encode("utf-8"))
-    if rc < 0:
-        raise RuntimeError("T32_Cmd failed while setting &BOOT")
+def get_session(config_path=CONFIG_PATH, api_loader=load_legacy_api) -> T32Session:
+    """Süreç boyunca tek, kalıcı oturum. Port/mod değişirse eskisi kapatılır."""
+    global _SESSION
+    new = T32Session.from_config(config_path, T32_EXE, PROJECT_DIR, api_loader=api_loader)
+    with _SESSION_LOCK:
+        s = _SESSION
+        if s is not None and (s.rcl_mode, s.port, s.packlen) != (new.rcl_mode, new.port, new.packlen):
+            s.close()
+            s = None
+        if s is None:
+            s = _SESSION = new
+        return s
 
-    rc = t32.T32_Cmd(f'DO "{STARTUP_CMM}"'.encode("utf-8"))
-    if rc < 0:
-        raise RuntimeError("T32_Cmd failed while starting startup.cmm")
-    
-    state = ctypes.c_int(-1)
-    timeout_s = 600.0
-    t0 = time.time()
 
-    while True:
-        rc = t32.T32_GetPracticeState(ctypes.byref(state))
-        if rc != 0:
-            raise RuntimeError(f"T32_GetPracticeState failed rc={rc}")
+def set_session(sess: T32Session) -> None:
+    """Kalıcı oturumu dışarıdan verir (ör. mock_t32api ile benchmark/CI)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None and _SESSION is not sess:
+            _SESSION.close()
+        _SESSION = sess
 
-        # 0 genelde NOT_RUNNING (script bitti)
-        if state.value == 0:
-            break
 
-        if time.time() - t0 > timeout_s:
-            raise TimeoutError("CMM timeout: script bitmedi")
+def close_session():
+    """Kalıcı oturumu isteğe bağlı olarak kapatır (T32_Exit)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
 
-        time.sleep(0.1)
 
+atexit.register(close_session)
+
+
+def connect_via_legacy_api(rcl_mode, port, packlen, timeout_s=API_TIMEOUT_SEC):
+    """
+    Legacy t32api64.dll ile bağlan.
+    TCP ise PACKLEN gönderme, UDP ise PACKLEN zorunlu.
+    """
+    return T32Session(rcl_mode, port, packlen).wait_ready(timeout_s)
 
-    # 6) cmm dogru bitti mi kontrol ##
-    msg = ctypes.create_string_buffer(1024)
-    status = ctypes.c_uint16(0)
 
-    if t32.T32_GetMessage(ctypes.byref(msg), ctypes.byref(status)) == 0:
-        text = msg.value.decode("utf-8", errors="ignore").lower()
+@timing.traced("t32.run_flash")
+def run_flash(elf_path: str, boot_path: str, session: T32Session = None, startup_cmm: str = STARTUP_CMM,
+              delta_cmm: str = "", on_progress=None, cancel=None, target: str = "", start: bool = True):
+    """
+    target: tam flash'ta geçersiz kılınacak delta kaydı (delta_flash.py); boşsa tüm kayıtlar.
+    start=False: CPU durdurulmuş bırakılır ('go' gönderilmez); doğrulama çalışan CPU'nun
+    değiştirdiği RAM/.data bölgelerini yanlış hata saymasın diye önce yapılıp sonra go verilir.
+    """
+ # 1) config.t32'yi oku + kalıcı oturumu al
+    sess = session or get_session(CONFIG_PATH)
+    print(f"config.t32 -> RCL={sess.rcl_mode} PORT={sess.port}"
+          + (f" PACKLEN={sess.packlen}" if sess.rcl_mode == "UDP" else ""))
+
+    # 2) Oturum canlı değilse TRACE32'yi proje config'iyle başlat,
+    # 3) sabit bekleme yerine T32_Ping ile hazır olmasını bekle
+    sess.launch()
+    sess.ensure()
+
+    # 5) Program/Message Area'ya yaz
+    sess.cmd('PRINT "Python connected via project config.t32"', "T32_Cmd hata: Remote API iletişim sorunu")
 
-        if (status.value & 0x0002) or (status.value & 0x0010):
-            raise RuntimeError(f"TRACE32 error (status=0x{status.value:04X}): {text}")
+    elf_path = os.path.abspath(elf_path)
+    boot_path = os.path.abspath(boot_path)
+
+    sess.cmd(f'&ELF="{elf_path}"', "T32_Cmd failed while setting &ELF")
+    sess.cmd(f'&BOOT="{boot_path}"', "T32_Cmd failed while setting &BOOT")
+    # Boş ise startup.cmm tam flash yapar; doluysa sadece değişen sektörler (delta_flash.py)
+    delta_cmm = os.path.abspath(delta_cmm) if delta_cmm else ""
+    if not delta_cmm:
+        # Tam flash hedefin içeriğini değiştirir: sonraki delta flash eski kayda güvenmesin
+        from t32 import delta_flash
+        if target: delta_flash.invalidate_record(target, delta_flash.STATE_DIR)
+        else: delta_flash.invalidate_all(delta_flash.STATE_DIR)
+    sess.cmd(f'&DELTA="{delta_cmm}"', "T32_Cmd failed while setting &DELTA")
+    sess.cmd(f'DO "{startup_cmm}"', "T32_Cmd failed while starting startup.cmm")
+
+    # PRACTICE durumunu uyarlamalı yokla, ilerleme/mesajları yayınla (flash_monitor.py)
+    mon = FlashMonitor(sess, on_progress=on_progress, cancel=cancel)
+    with timing.span("t32.practice_script", delta=bool(delta_cmm)):
+        mon.run()
+
+    # 6) cmm dogru bitti mi kontrol ##
+    text = mon.message.lower()
+    if (mon.status & 0x0002) or (mon.status & 0x0010):
+        raise RuntimeError(f"TRACE32 error (status=0x{mon.status:04X}): {text}")
 
-        if "not found" in text or "error" in text:
-            raise RuntimeError(f"TRACE32 error message: {text}")
+    if "not found" in text or "error" in text:
+        raise RuntimeError(f"TRACE32 error message: {text}")
 
-    time.sleep(0.5)
-    rc = t32.T32_Cmd(b"go")
-    if rc < 0:
-        raise RuntimeError("Go command failed")
-    
-    # 7) Kapat veya açık bırak (örnek kapatıyor)
-    time.sleep(20)
-    t32.T32_Exit()
-    print("Mesaj gönderildi ve bağlantı temiz kapatıldı.")
+    if start:
+        sess.cmd("go", "Go command failed")
 
+    # 7) Bağlantı açık kalır; bir sonraki run_flash aynı oturumu kullanır.
+    #    Kapatmak için close_session().
+    print("Flash tamamlandı, TRACE32 oturumu açık bırakıldı.")
@@ -0,0 +1,117 @@
+"""
+Flash sonrası doğrulama: tam okuma yerine hedef üzerinde checksum.
+- Beklenen imaj (BOOT S19 + ELF PT_LOAD) host'ta bölgelere ayrılıp CRC32'si hesaplanır.
+- Her bölge için TRACE32'ye 'Data.SUM <aralık> /CRC32' yaptırılır, sonuç T32_EvalGet ile alınır.
+- Yalnızca uyuşmayan bölgeler ikiye bölünerek daraltılır; en küçük parçalar okunup
+  byte bazında karşılaştırılır.
+"""
+import ctypes
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+from t32 import t32, bulkmem
+from t32.delta_flash import load_image, load_sector_map, sector_bytes
+
+REGION_MAX = 0x10000        # host/target checksum bölge boyu üst sınırı
+LEAF_SIZE = 0x100           # bu boyun altında bölme yerine okuma yapılır
+
+
+@dataclass
+class Mismatch:
+    address: int
+    size: int
+    first_diff: Optional[int] = None     # ilk farklı byte adresi (okuma yapıldıysa)
+
+
+@dataclass
+class VerifyReport:
+    regions: int = 0
+    checksum_calls: int = 0
+    read_bytes: int = 0
+    mismatches: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def summary(self) -> str:
+        s = (f"Verify: {self.regions} bölge, {self.checksum_calls} checksum, "
+             f"{self.read_bytes} byte okuma -> {'OK' if self.ok else f'{len(self.mismatches)} HATA'}")
+        for m in self.mismatches[:20]:
+            fd = f" ilk fark 0x{m.first_diff:08X}" if m.first_diff is not None else ""
+            s += f"\n  0x{m.address:08X} +0x{m.size:X}{fd}"
+        return s
+
+
+def expected_regions(image, sectors=None, region_max: int = REGION_MAX) -> list[tuple[int, bytes]]:
+    """Sektör haritası verilirse sektör bazında (boşluklar 0xFF), yoksa imaj parçaları bölünerek."""
+    out = []
+    if sectors:
+        starts = [a for a, _ in image]
+        for start, size in sectors:
+            data = sector_bytes(image, start, size, starts)
+            if data is not None: out.append((start, data))
+        return out
+    for addr, data in image:
+        for ofs in range(0, len(data), region_max):
+            out.append((addr + ofs, data[ofs:ofs + region_max]))
+    return out
+
+
+def target_crc32(sess: t32.T32Session, addr: int, size: int) -> int:
+    value = ctypes.c_uint32(0)
+    with sess.lock:
+        rc = sess.api.T32_Cmd(f"Data.SUM 0x{addr:08X}--0x{addr + size - 1:08X} /CRC32".encode("ascii"))
+        if rc == 0:
+            rc = sess.api.T32_Cmd(b"EVAL Data.SUM()")
+        if rc == 0:
+            rc = sess.api.T32_EvalGet(ctypes.byref(value))
+    if rc != 0:
+        raise RuntimeError(f"Data.SUM failed rc={rc} @0x{addr:08X}")
+    return value.value
+
+
+def _narrow(sess, addr: int, data: bytes, report: VerifyReport, access: int):
+    """
+    Checksum'ı tutmayan aralığı ikiye bölerek daraltır. Tekrar bakışta fark bulunamazsa
+    (kararsız okuma, hâlâ değişen hedef) aralığın tamamı hatalı sayılır.
+    """
+    found = len(report.mismatches)
+    if len(data) <= LEAF_SIZE:
+        _, views = bulkmem.read_bulk(sess, [(addr, len(data))], access)
+        got = views[0]
+        report.read_bytes += len(data)
+        diff = next((i for i in range(len(data)) if got[i] != data[i]), None)
+        if diff is not None:
+            report.mismatches.append(Mismatch(addr, len(data), addr + diff))
+    else:
+        half = (len(data) // 2 + 3) & ~3
+        for a, d in ((addr, data[:half]), (addr + half, data[half:])):
+            report.checksum_calls += 1
+            if target_crc32(sess, a, len(d)) != zlib.crc32(d):
+                _narrow(sess, a, d, report, access)
+    if len(report.mismatches) == found:
+        report.mismatches.append(Mismatch(addr, len(data)))
+
+
+def verify_regions(sess: t32.T32Session, regions, access: int = bulkmem.ACCESS_ED,
+                   locate: bool = True) -> VerifyReport:
+    report = VerifyReport(regions=len(regions))
+    for addr, data in regions:
+        report.checksum_calls += 1
+        if target_crc32(sess, addr, len(data)) == zlib.crc32(data):
+            continue
+        if locate:
+            _narrow(sess, addr, bytes(data), report, access)
+        else:
+            report.mismatches.append(Mismatch(addr, len(data)))
+    return report
+
+
+def verify_flash(sess: t32.T32Session, elf_path: str, boot_path: str = "", sector_map: str = "",
+                 locate: bool = True) -> VerifyReport:
+    image = load_image(elf_path, (boot_path,) if boot_path else ())
+    sectors = load_sector_map(sector_map) if sector_map else None
+    sess.ensure()
+    return verify_regions(sess, expected_regions(image, sectors), locate=locate)
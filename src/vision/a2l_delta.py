@@ -0,0 +1,188 @@
+"""
+Artımlı Vision strateji güncellemesi.
+Yeni adreslenmiş A2L, .vst'ye en son import edilen A2L'nin nesne indeksiyle
+(<vst>.a2l_index.json: nesne -> hash) karşılaştırılır:
+- Değişen/eklenen veri nesneleri, onların isimle başvurduğu (AXIS_PTS_REF, INPUT_QUANTITY,
+  CURVE_AXIS_REF...) değişmemiş nesneler (geçişli) ve tüm destek bloklarını (RECORD_LAYOUT,
+  COMPU_METHOD...) içeren küçültülmüş bir A2L yazılır ve ReplaceExistingItems ile import edilir.
+- Veri dışı tüm bloklar (COMPU_METHOD, RECORD_LAYOUT, MOD_PAR, MEMORY_SEGMENT...) tek bir
+  "destek" hash'inde toplanır; bu hash değişirse, nesne silinmişse ya da önceki durum
+  bilinmiyorsa tam import'a düşülür (StrategyFileInterface'te belgelenmiş bir silme yok).
+"""
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+from a2l.a2l_objects import parse_blocks, iter_objects
+from vision import ati_vision
+
+# Diff'lenen veri nesneleri; diğer tüm bloklar küçültülmüş A2L'de aynen kalır
+DATA_KINDS = ("CHARACTERISTIC", "MEASUREMENT", "AXIS_PTS", "FUNCTION", "GROUP")
+
+# Başvuru hedefi olarak izlenen türler; FUNCTION/GROUP yalnız isimle gruplar, küçültülmüş
+# A2L'ye üyelerini çekmez
+REF_KINDS = ("CHARACTERISTIC", "MEASUREMENT", "AXIS_PTS")
+
+# İndekste veri dışı blokların ortak hash'i
+SUPPORT_KEY = "@support"
+
+
+def index_path(vst_path: str) -> str:
+    return os.path.abspath(vst_path) + ".a2l_index.json"
+
+
+def _digest(text: str) -> str:
+    body = " ".join(text.split())
+    return hashlib.blake2b(body.encode("utf-8", "ignore"), digest_size=12).hexdigest()
+
+
+def object_index(text: str, blocks: list = None) -> dict:
+    """'KIND NAME' -> (hash, start, end)"""
+    idx = {}
+    for blk in iter_objects(parse_blocks(text) if blocks is None else blocks, DATA_KINDS):
+        idx[f"{blk.kind} {blk.name}"] = (_digest(text[blk.start:blk.end]), blk.start, blk.end)
+    return idx
+
+
+def _tokens(blk):
+    yield from blk.tokens
+    for c in blk.children:
+        yield from _tokens(c)
+
+
+def object_refs(blocks: list) -> dict:
+    """'KIND NAME' -> başvurduğu REF_KINDS nesnelerinin anahtarları."""
+    objs = list(iter_objects(blocks, DATA_KINDS))
+    by_name = {}
+    for blk in objs:
+        if blk.kind in REF_KINDS:
+            by_name.setdefault(blk.name, []).append(f"{blk.kind} {blk.name}")
+    refs = {}
+    for blk in objs:
+        key = f"{blk.kind} {blk.name}"
+        refs[key] = {r for t in _tokens(blk) if t != blk.name for r in by_name.get(t, ())} - {key}
+    return refs
+
+
+def with_references(keys: set, refs: dict) -> set:
+    """keys + geçişli olarak başvurulan tüm nesneler."""
+    out, todo = set(keys), list(keys)
+    while todo:
+        for r in refs.get(todo.pop(), ()):
+            if r not in out:
+                out.add(r)
+                todo.append(r)
+    return out
+
+
+def support_digest(text: str, idx: dict) -> str:
+    """Veri nesneleri çıkarıldıktan sonra kalan metnin (destek blokları, başlık) hash'i."""
+    parts, pos = [], 0
+    for _, s, e in sorted(idx.values(), key=lambda v: v[1]):
+        parts.append(text[pos:s])
+        pos = e
+    parts.append(text[pos:])
+    return _digest(" ".join(parts))
+
+
+def load_index(vst_path: str) -> Optional[dict]:
+    try:
+        with open(index_path(vst_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass
+class StrategyUpdate:
+    mode: str                                       # "full" | "incremental" | "unchanged"
+    hashes: dict                                    # yeni indeks (commit_index ile yazılır)
+    changed: list = field(default_factory=list)
+    added: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)
+    referenced: list = field(default_factory=list)  # değişmemiş ama başvuru yüzünden eklenenler
+    reduced_a2l: str = ""
+
+
+def diff_index(old: dict, new: dict):
+    changed = [k for k in new if k in old and old[k] != new[k]]
+    added = [k for k in new if k not in old]
+    deleted = [k for k in old if k not in new]
+    return changed, added, deleted
+
+
+def write_reduced_a2l(text: str, idx: dict, keep: set, out_path: str) -> None:
+    """Değişmeyen veri nesnelerinin metin aralıklarını çıkararak A2L yazar."""
+    drop = sorted((s, e) for k, (_, s, e) in idx.items() if k not in keep)
+    parts, pos = [], 0
+    for s, e in drop:
+        parts.append(text[pos:s])
+        pos = e
+    parts.append(text[pos:])
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+
+
+def _ensure_loaded(vs, strat, vst_path: str) -> bool:
+    """strat önceki VST'yi tutuyor mu; tutmuyorsa diskteki VST'yi açmayı dener."""
+    vst_path = os.path.abspath(vst_path)
+    if vst_path in vs.loaded_vsts:
+        return True
+    if os.path.exists(vst_path) and hasattr(strat, "Open"):
+        try:
+            strat.Open(vst_path)
+            vs.loaded_vsts.add(vst_path)
+            return True
+        except Exception as e:
+            print("VST açılamadı, tam import yapılacak:", e)
+    return False
+
+
+def update_strategy(vs, a2l_path: str, vst_path: str, incremental: bool = True) -> Optional[StrategyUpdate]:
+    """A2L'yi stratejiye import eder (mümkünse artımlı). Başarısızsa None."""
+    strat = vs.strategy_interface(vst_path)
+    with open(a2l_path, "r", encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+    blocks = parse_blocks(text)
+    idx = object_index(text, blocks)
+    hashes = {k: v[0] for k, v in idx.items()}
+    hashes[SUPPORT_KEY] = support_digest(text, idx)
+
+    old = load_index(vst_path) if incremental else None
+    if old is not None and old.get(SUPPORT_KEY) != hashes[SUPPORT_KEY]:
+        print("Destek blokları değişti, tam import yapılacak")
+        old = None
+    if old is not None and _ensure_loaded(vs, strat, vst_path):
+        changed, added, deleted = diff_index(old, hashes)
+        upd = StrategyUpdate("incremental", hashes, changed, added, deleted)
+        if not (changed or added or deleted):
+            upd.mode = "unchanged"
+            print("A2L değişmedi, strateji import atlandı ✅")
+            return upd
+        if not deleted:
+            keep = with_references(set(changed) | set(added), object_refs(blocks))
+            upd.referenced = sorted(keep - set(changed) - set(added))
+            upd.reduced_a2l = os.path.abspath(vst_path) + ".delta.a2l"
+            write_reduced_a2l(text, idx, keep, upd.reduced_a2l)
+            print(f"Artımlı A2L import: {len(changed)} değişen, {len(added)} yeni, "
+                  f"{len(upd.referenced)} başvurulan")
+            if ati_vision.import_a2l(strat, upd.reduced_a2l, replace=True):
+                return upd
+            print("Artımlı import başarısız, tam import deneniyor")
+        else:
+            print(f"{len(deleted)} nesne silinmiş, tam import yapılacak")
+
+    if not ati_vision.import_a2l(strat, a2l_path):
+        return None
+    return StrategyUpdate("full", hashes)
+
+
+def commit_index(upd: StrategyUpdate, vst_path: str) -> None:
+    """VST başarıyla kaydedildikten sonra çağrılır."""
+    tmp = index_path(vst_path) + ".tmp"
+    os.makedirs(os.path.dirname(tmp), exist_ok=True)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(upd.hashes, f, indent=0, sort_keys=True)
+    os.replace(tmp, index_path(vst_path))
@@ -1,9 +1,10 @@
 # make_vst.py — A2L -> VST (UI'siz, doğrudan StrategyFileInterface)
 import os
-import pythoncom
-import win32com.client
 import time
-from win32com.client import VARIANT
+import threading
+from dataclasses import dataclass
+
+from perf import timing
 # >>> BURAYI DÜZENLE
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 VST_OUT    = os.path.join(SCRIPT_DIR, "out", "MyECU.vst")  # çıkış .vst
@@ -17,12 +18,185 @@ S19_PATH   = os.path.join(SCRIPT_DIR, "example.s19") #s19 dosyası.
 os.makedirs(OUT_DIR, exist_ok=True)
 UPLOADED_VST = os.path.join(OUT_DIR, "MyECU.vst")
 
+# VISION_DEVICE_STATE_CODES
+VISION_DEVICE_ONLINE = 5
+VISION_DEVICE_UPLOADING = 9
+
+STATE_POLL_MIN_SEC = 0.05
+STATE_POLL_MAX_SEC = 1.0
+ONLINE_WAIT_SEC = 1.0          # Online=True sonrası (eskiden sabit sleep(1))
+UPLOAD_STALL_SEC = 50.0        # upload dışı durumda en fazla bekleme (eski 50 x 1 sn)
+UPLOAD_TIMEOUT_SEC = 600.0
+
+
+def _com():
+    """pythoncom + win32com.client'i ilk ihtiyaçta yükler (Linux'ta modül import edilebilsin)."""
+    import pythoncom
+    import win32com.client
+    return pythoncom, win32com.client
+
+
+def _missing():
+    try:
+        return _com()[0].Missing
+    except ImportError:
+        return None
+
+
+def com_dispatch(progid: str, ensure: bool = False):
+    _, client = _com()
+    return client.gencache.EnsureDispatch(progid) if ensure else client.DispatchEx(progid)
+
+
+class VisionCancelled(RuntimeError):
+    pass
+
+
+class VisionSession:
+    """
+    Vision COM nesnelerini (StrategyFileInterface, ProjectInterface) ve açılan projeyi
+    sürümler arasında canlı tutar. Her VST'nin kendi StrategyFileInterface'i vardır; bir
+    cihaza eklenmiş strateji başka bir işin import'uyla değişmez.
+    COM nesneleri oluşturuldukları thread'e bağlıdır; oturum yalnız hep aynı thread'den
+    kullanıldığında yeniden kullanılır (pipeline'da kalıcı "vision" lane'i, workers.py).
+    dispatch: (progid, ensure) -> nesne. Linux'ta aynı metot yüzeyine sahip sahte nesne verilebilir.
+    """
+
+    def __init__(self, dispatch=com_dispatch, com_init: bool = True):
+        self._dispatch = dispatch
+        self._com_init = com_init
+        self._inited = False
+        self.owner_thread = None
+        self._strats = {}           # VST yolu -> StrategyFileInterface
+        self.loaded_vsts = set()    # stratejisi diskteki VST'yi tutan VST yolları (artımlı import için)
+        self.prj = None
+        self.prj_path = None
+        self._devices = {}
+        self._attached = set()      # (cihaz, VST yolu): AddStrategy yapılmış
+
+    def open(self):
+        if self._inited: return self
+        if self._com_init:
+            _com()[0].CoInitialize()    #for COM(component Object Model - Vision Comminication method)
+        self._inited = True
+        self.owner_thread = threading.get_ident()
+        return self
+
+    def strategy_interface(self, vst_path: str = VST_OUT):
+        self.open()
+        key = os.path.abspath(vst_path)
+        strat = self._strats.get(key)
+        if strat is None:
+            # Doğrudan StrategyFileInterface'e bağlan (VST başına ayrı nesne)
+            strat = self._strats[key] = self._dispatch("Vision.StrategyFileInterface", False)
+            print("✅ StrategyFileInterface bağli.")
+        return strat
+
+    def project(self, prj_path: str):
+        """Proje zaten açıksa yeniden açmaz."""
+        self.open()
+        if self.prj is None:
+            self.prj = self._dispatch("Vision.ProjectInterface", True)
+            print("✅ ProjectInterface bağli.")
+        prj_path = os.path.abspath(prj_path)
+        if self.prj_path != prj_path:
+            open_base_project(self.prj, prj_path)
+            self.prj_path = prj_path
+            self._devices.clear()
+            self._attached.clear()
+        return self.prj
+
+    def device(self, name: str):
+        dev = self._devices.get(name)
+        if dev is None:
+            dev = self._devices[name] = self.prj.FindDevice(name)
+        return dev
+
+    def attach_strategy(self, name: str, dev, strat, vst_path: str):
+        """Strateji cihaza bu proje açıkken henüz eklenmediyse AddStrategy yapar."""
+        key = (name, os.path.abspath(vst_path))
+        if key not in self._attached:
+            dev.AddStrategy(strat)
+            self._attached.add(key)
+
+    def wait_state(self, dev, done_states, timeout_s: float, stall_s: float = None,
+                   busy_states=(), cancel=None):
+        """
+        dev.State done_states'ten birine gelene kadar bekler. Olay aboneliği yok: durum
+        uyarlamalı aralıklarla yoklanır (değişince STATE_POLL_MIN_SEC, sonra STATE_POLL_MAX_SEC'e
+        kadar ikiye katlanır). busy_states dışındaki durumlarda stall_s aşılırsa vazgeçer.
+        Son durumu döner. cancel() True dönerse VisionCancelled.
+        """
+        delay = STATE_POLL_MIN_SEC
+        t0 = last_busy = time.monotonic()
+        last = None
+        while True:
+            state = dev.State
+            timing.count("vision.state_polls")
+            now = time.monotonic()
+            if state != last:
+                if state == VISION_DEVICE_UPLOADING: print("Upload devam ediyor...")
+                elif state not in done_states: print(f"Durum: {state}")
+                last = state
+                delay = STATE_POLL_MIN_SEC
+            if state in done_states:
+                return state
+            if state in busy_states:
+                last_busy = now
+            elif stall_s is not None and now - last_busy > stall_s:
+                return state
+            if now - t0 > timeout_s:
+                return state
+            if cancel is not None and cancel():
+                raise VisionCancelled(f"Vision beklemesi iptal edildi (durum: {state})")
+            time.sleep(delay)
+            timing.count("vision.sleep_ms", int(delay * 1000))
+            delay = min(delay * 2, STATE_POLL_MAX_SEC)
+
+    def close(self):
+        """Oturumu isteğe bağlı kapatır."""
+        self._devices.clear()
+        self._attached.clear()
+        self._strats.clear()
+        self.loaded_vsts.clear()
+        self.prj = None
+        self.prj_path = None
+        if self._inited and self._com_init:
+            _com()[0].CoUninitialize()
+        self._inited = False
+
+
+_SESSION = None
+
+
+def get_session() -> VisionSession:
+    global _SESSION
+    if _SESSION is None or (_SESSION.owner_thread not in (None, threading.get_ident())):
+        # COM nesneleri thread'e bağlı: farklı thread için yeni oturum
+        _SESSION = VisionSession()
+    return _SESSION
+
+
+def set_session(vs: VisionSession) -> None:
+    """Oturumu dışarıdan verir (ör. mock_vision ile benchmark/CI)."""
+    global _SESSION
+    _SESSION = vs
+
+
+def close_session():
+    global _SESSION
+    if _SESSION is not None:
+        _SESSION.close()
+        _SESSION = None
+
+
 def ensure_dir(p):
     d = os.path.dirname(p)
     if d and not os.path.exists(d):
         os.makedirs(d, exist_ok=True)
 
-def import_a2l(strat, a2l_path):
+def import_a2l(strat, a2l_path, replace: bool = False):
+    # replace=False: tam import (mevcutları sil). replace=True: artımlı, sadece gelenleri değiştir
     strat.SetASAP2ImportProperties2(
                 "",  # StrategyPreset
                 True,   # ImportFunctions
@@ -30,9 +204,9 @@ def import_a2l(strat, a2l_path):
                 False,  # IgnoreMemoryRegions
                 False,  # ExtendLimits
                 True,   # EnforceLimits
-                True,   # DeleteExistingItems
-                False,   # ReplaceExistingItems
-                True,   # ClearDeviceSettings
+                not replace,   # DeleteExistingItems
+                replace,   # ReplaceExistingItems
+                not replace,   # ClearDeviceSettings
                 True,   # AllowBrackets
                 True,   # OrganizeDataItemInGroups
                 False,  # UseDisplayIdentifiers
@@ -81,7 +255,6 @@ def save_vst(strat, out_path):
     return False
 
 def export_calib(strat, out_path):
-    import os, pythoncom
     out_path = os.path.abspath(str(out_path))
     if not out_path.lower().endswith(".cal"):
         out_path += ".cal"
@@ -91,8 +264,8 @@ def export_calib(strat, out_path):
         ExportFileName=out_path,
         FilterFileName="",            # filtre yok
         ModificationSource="",        # kaynak filtresi yok
-        ModificationFromDateTime=pythoncom.Missing,  # tarihleri tamamen atla
-        ModificationToDateTime=pythoncom.Missing
+        ModificationFromDateTime=_missing(),  # tarihleri tamamen atla
+        ModificationToDateTime=_missing()
     )
     return True
 
@@ -100,7 +273,10 @@ def open_base_project(prj, PRJ_PATH):
     prj.Open(PRJ_PATH)
     
 
-def ecu_connection_on_vision(addressed_a2l_path: str, s19_path: str):
+@timing.traced("vision.package")
+def ecu_connection_on_vision(addressed_a2l_path: str, s19_path: str, session: VisionSession = None,
+                             incremental: bool = True, vst_out: str = VST_OUT, cal_out: str = "",
+                             prj_path: str = PRJ_OUT, device_name: str = "PCM", cancel=None):
 
     if not os.path.exists(addressed_a2l_path):
         raise FileNotFoundError(f"A2L bulunamadı: {addressed_a2l_path}")
@@ -108,76 +284,135 @@ def ecu_connection_on_vision(addressed_a2l_path: str, s19_path: str):
     if not os.path.exists(s19_path):
         raise FileNotFoundError(f"S19 bulunamadı: {s19_path}")
     
-    pythoncom.CoInitialize()    #for COM(component Object Model - Vision Comminication method)
-    try:
-        # Doğrudan StrategyFileInterface'e bağlan
-        strat = win32com.client.DispatchEx("Vision.StrategyFileInterface")
-        print("✅ StrategyFileInterface bağli.")
-
-        prj = win32com.client.gencache.EnsureDispatch("Vision.ProjectInterface")
-        print("✅ ProjectInterface bağli.")
-        
-        if not import_a2l(strat, addressed_a2l_path):
-            raise RuntimeError("A2L import edilemedi (Import başarisiz).")
-        
-        if not import_s19(strat, s19_path):
-            raise RuntimeError("S19 import edilemedi (Import başarisiz).")
-        
-        # VST kaydet
-        if not save_vst(strat, VST_OUT):
-            raise RuntimeError("VST kaydedilemedi (SaveAs/Save başarisiz).")
-        
-        open_base_project(prj,PRJ_OUT)
-
-        pcm = prj.FindDevice("PCM")
-        pcm.AddStrategy(strat)
-        
-        pcm.EnableAutoDownload = False
-        pcm.DisableAutoSync = True
-        prj.Online = True
-        
-        time.sleep(1)
-        vst_path = os.path.abspath(VST_OUT)
-        pcm.UploadActiveStrategy(vst_path)
-        breakCount = 0
-        
-        while True:
-            state = pcm.State  # VISION_DEVICE_STATE_CODES
-            if state == 9:  # VISION_DEVICE_UPLOADING
-                print("Upload devam ediyor...")
-            elif state == 5:  # VISION_DEVICE_ONLINE
-                print("✅ Upload tamamlandı.")
-                break
-            else:
-                print(f"Durum: {state}")
-                breakCount+=1
-                time.sleep(1)
-                if breakCount == 50:
-                    break
-
-        
-        strategy = pcm.ActiveStrategy
-        strategy.ActiveCalibration = "[BASE CALIBRATION]"
+    # COM nesneleri + açık proje sürümler arasında korunur (VisionSession)
+    vs = session or get_session()
+    strat = vs.strategy_interface(vst_out)
+
+    # Artımlı modda yalnızca değişen A2L nesneleri import edilir (a2l_delta.py)
+    from vision import a2l_delta
+    with timing.span("vision.import_a2l", incremental=incremental) as sp:
+        upd = a2l_delta.update_strategy(vs, addressed_a2l_path, vst_out, incremental=incremental)
+        if upd is not None: sp.set(mode=upd.mode, changed=len(upd.changed) + len(upd.added))
+    if upd is None:
+        raise RuntimeError("A2L import edilemedi (Import başarisiz).")
+
+    with timing.span("vision.import_s19"):
+        ok = import_s19(strat, s19_path)
+    if not ok:
+        raise RuntimeError("S19 import edilemedi (Import başarisiz).")
+
+    # VST kaydet
+    with timing.span("vision.save_vst"):
+        ok = save_vst(strat, vst_out)
+    if not ok:
+        raise RuntimeError("VST kaydedilemedi (SaveAs/Save başarisiz).")
+    vs.loaded_vsts.add(os.path.abspath(vst_out))
+    a2l_delta.commit_index(upd, vst_out)
+
+    prj = vs.project(prj_path)
+
+    pcm = vs.device(device_name)
+    vs.attach_strategy(device_name, pcm, strat, vst_out)
+
+    pcm.EnableAutoDownload = False
+    pcm.DisableAutoSync = True
+    prj.Online = True
+
+    vs.wait_state(pcm, (VISION_DEVICE_ONLINE,), ONLINE_WAIT_SEC, cancel=cancel)
+    vst_path = os.path.abspath(vst_out)
+    pcm.UploadActiveStrategy(vst_path)
 
+    with timing.span("vision.upload_wait"):
+        state = vs.wait_state(pcm, (VISION_DEVICE_ONLINE,), UPLOAD_TIMEOUT_SEC, stall_s=UPLOAD_STALL_SEC,
+                              busy_states=(VISION_DEVICE_UPLOADING,), cancel=cancel)
+    if state == VISION_DEVICE_ONLINE:
+        print("✅ Upload tamamlandı.")
+    else:
+        print(f"⚠️ Upload beklemesi sonlandı, durum: {state}")
+
+    strategy = pcm.ActiveStrategy
+    strategy.ActiveCalibration = "[BASE CALIBRATION]"
+
+    if cal_out:
+        cal_path = os.path.abspath(cal_out)
+        ensure_dir(cal_path)
+    else:
         vst_dir  = os.path.dirname(strategy.FileName)      # :contentReference[oaicite:6]{index=6}
         vst_name = os.path.splitext(os.path.basename(strategy.FileName))[0]
         cal_path = os.path.join(vst_dir, f"{vst_name}.cal")
 
-        cal_path = os.path.join(vst_dir, f"{vst_name}.cal")
 
+    # 3) SaveAs (çalışan kalibrasyonu yeni isimle kaydet)
+    rc = strategy.ActiveCalibrationSaveAs(cal_path)     # :contentReference[oaicite:7]{index=7}
+    print("ActiveCalibrationSaveAs rc =", rc)
 
-        # 3) SaveAs (çalışan kalibrasyonu yeni isimle kaydet)
-        rc = strategy.ActiveCalibrationSaveAs(cal_path)     # :contentReference[oaicite:7]{index=7}
-        print("ActiveCalibrationSaveAs rc =", rc)
+    save_vst(strat, vst_out)
+    #prj.Save()
 
-        save_vst(strat, VST_OUT)
-        #prj.Save()
+    print(f"✅ Bitti.\n VST: {vst_out}")
+    return vst_path, cal_path
 
-        print(f"✅ Bitti.\n VST: {VST_OUT}")
-    finally:
-        pythoncom.CoUninitialize()
+
+@dataclass
+class VisionJob:
+    a2l_path: str
+    s19_path: str
+    vst_out: str
+    cal_out: str = ""
+    device_name: str = "PCM"
+    prj_path: str = PRJ_OUT
+
+
+@dataclass
+class VisionJobResult:
+    job: VisionJob
+    ok: bool
+    duration_s: float
+    vst_path: str = ""
+    cal_path: str = ""
+    error: str = ""
+
+
+def package_batch(jobs: list, session: VisionSession = None, incremental: bool = True) -> list:
+    """
+    Birden fazla projeyi tek Vision oturumunda paketler. İşler base projeye göre
+    gruplanır; her base proje yalnızca bir kez açılır. Bir işin hatası diğerlerini durdurmaz.
+    """
+    vs = session or get_session()
+    order = sorted(range(len(jobs)), key=lambda k: os.path.abspath(jobs[k].prj_path))
+    results = [None] * len(jobs)
+    for k in order:
+        job = jobs[k]
+        t0 = time.monotonic()
+        print(f"--- Vision job {k + 1}/{len(jobs)}: {job.device_name} -> {job.vst_out}")
+        try:
+            vst, cal = ecu_connection_on_vision(job.a2l_path, job.s19_path, session=vs, incremental=incremental,
+                                                vst_out=job.vst_out, cal_out=job.cal_out,
+                                                prj_path=job.prj_path, device_name=job.device_name)
+            results[k] = VisionJobResult(job, True, time.monotonic() - t0, vst, cal)
+        except Exception as e:
+            print(f"❌ Vision job başarisiz: {e}")
+            results[k] = VisionJobResult(job, False, time.monotonic() - t0, error=str(e))
+    return results
 
 def main():
-    ecu_connection_on_vision(A2L_PATH,S19_PATH)
+    import argparse, json
+    ap = argparse.ArgumentParser(description="A2L + S19 -> VST/CAL (Vision)")
+    ap.add_argument("--batch", default=None,
+                    help="iş listesi JSON: [{a2l_path, s19_path, vst_out, cal_out, device_name, prj_path}, ...]")
+    args = ap.parse_args()
+    try:
+        if args.batch:
+            with open(args.batch, "r", encoding="utf-8") as f:
+                jobs = [VisionJob(**d) for d in json.load(f)]
+            results = package_batch(jobs)
+            for r in results:
+                print(f"{'OK ' if r.ok else 'ERR'} {r.duration_s:6.1f}s {r.job.vst_out} {r.error}")
+            if not all(r.ok for r in results):
+                raise SystemExit(1)
+        else:
+            ecu_connection_on_vision(A2L_PATH,S19_PATH)
+    finally:
+        close_session()
 if __name__ == "__main__":
     main()
\ No newline at end of file
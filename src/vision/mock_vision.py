@@ -0,0 +1,146 @@
+"""
+Vision COM yüzeyinin (StrategyFileInterface / ProjectInterface / device) süreç içi taklidi.
+Linux/CI'da VisionSession ve ecu_connection_on_vision akışını denemek için:
+
+    from vision import ati_vision, mock_vision
+    vs = ati_vision.VisionSession(dispatch=mock_vision.MockVision().dispatch, com_init=False)
+    ati_vision.ecu_connection_on_vision("addressed.a2l", "app.s19", session=vs)
+
+Gecikmeler: open_s (proje açma), upload_s (UPLOADING durumu süresi), import_s (her Import),
+save_s (her SaveAs), call_latency_s (sayılan her COM çağrısı). simulated_s: toplam yapay süre.
+"""
+import os
+import time
+
+from vision.ati_vision import VISION_DEVICE_ONLINE, VISION_DEVICE_UPLOADING
+
+VISION_DEVICE_OFFLINE = 0
+
+
+class MockStrategyFile:
+    def __init__(self, owner):
+        self._owner = owner
+        self.imports = []
+        self.import_props = None
+        self.FileName = ""
+
+    def SetASAP2ImportProperties2(self, *args):
+        self.import_props = ("ASAP2",) + args
+
+    def SetSRecordImportProperties(self, *args):
+        self.import_props = ("SREC",) + args
+
+    def Import(self, path):
+        self._owner._count("Import", self._owner.import_s)
+        if not os.path.exists(path):
+            raise RuntimeError(f"Import: dosya yok {path}")
+        self.imports.append((os.path.abspath(path), self.import_props))
+
+    def SaveAs(self, path):
+        self._owner._count("SaveAs", self._owner.save_s)
+        self.FileName = os.path.abspath(path)
+        with open(self.FileName, "w", encoding="utf-8") as f:
+            f.write(f"; mock VST\n; imports={len(self.imports)}\n")
+
+    def ExportCalibration(self, **kw):
+        with open(kw["ExportFileName"], "w", encoding="utf-8") as f:
+            f.write("; mock CAL\n")
+
+
+class MockActiveStrategy:
+    def __init__(self, file_name):
+        self.FileName = file_name
+        self.ActiveCalibration = ""
+
+    def ActiveCalibrationSaveAs(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"; mock CAL from {self.ActiveCalibration}\n")
+        return 0
+
+
+class MockDevice:
+    def __init__(self, owner, name):
+        self._owner = owner
+        self.Name = name
+        self.EnableAutoDownload = True
+        self.DisableAutoSync = False
+        self.strategies = []
+        self.ActiveStrategy = None
+        self._upload_end = 0.0
+
+    def AddStrategy(self, strat):
+        self.strategies.append(strat)
+
+    def UploadActiveStrategy(self, vst_path):
+        self._owner._count("UploadActiveStrategy")
+        self.ActiveStrategy = MockActiveStrategy(vst_path)
+        self._upload_end = time.monotonic() + self._owner.upload_s
+        self._owner.simulated_s += self._owner.upload_s
+
+    @property
+    def State(self):
+        self._owner._count("State")
+        if not self._owner.online:
+            return VISION_DEVICE_OFFLINE
+        if time.monotonic() < self._upload_end:
+            return VISION_DEVICE_UPLOADING
+        return VISION_DEVICE_ONLINE
+
+
+class MockProject:
+    def __init__(self, owner):
+        self._owner = owner
+        self.path = None
+        self._devices = {}
+
+    def Open(self, path):
+        self._owner._count("ProjectOpen", self._owner.open_s)
+        self.path = path
+        self._devices = {}
+
+    def FindDevice(self, name):
+        dev = self._devices.get(name)
+        if dev is None:
+            dev = self._devices[name] = MockDevice(self._owner, name)
+        return dev
+
+    @property
+    def Online(self):
+        return self._owner.online
+
+    @Online.setter
+    def Online(self, value):
+        self._owner.online = bool(value)
+
+    def Save(self):
+        pass
+
+
+class MockVision:
+    """dispatch(progid, ensure) ile VisionSession'a verilir. Süreler saniye cinsinden."""
+
+    def __init__(self, upload_s: float = 0.0, open_s: float = 0.0, import_s: float = 0.0,
+                 save_s: float = 0.0, call_latency_s: float = 0.0):
+        self.upload_s = upload_s
+        self.open_s = open_s
+        self.import_s = import_s
+        self.save_s = save_s
+        self.call_latency_s = call_latency_s
+        self.simulated_s = 0.0
+        self.online = False
+        self.calls = {}
+
+    def _count(self, name, latency: float = 0.0):
+        latency += self.call_latency_s
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.simulated_s += latency
+        if latency > 0:
+            time.sleep(latency)
+
+    def dispatch(self, progid: str, ensure: bool = False):
+        self._count(f"Dispatch:{progid}")
+        if progid == "Vision.StrategyFileInterface":
+            return MockStrategyFile(self)
+        if progid == "Vision.ProjectInterface":
+            return MockProject(self)
+        raise RuntimeError(f"Bilinmeyen ProgID: {progid}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller PYTHONPATH=src ile çalışır
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
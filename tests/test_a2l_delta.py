@@ -0,0 +1,72 @@
+"""Artımlı Vision strateji güncellemesi (vision/a2l_delta.py), MockVision ile."""
+import pytest
+
+from a2l.a2l_objects import parse_blocks
+from vision import a2l_delta, ati_vision, mock_vision
+
+A2L = """ASAP2_VERSION 1 61
+/begin PROJECT P ""
+/begin MODULE M ""
+/begin COMPU_METHOD CM_RPM "" RAT_FUNC "%6.1" "rpm" COEFFS 0 1 0 0 0 1 /end COMPU_METHOD
+/begin RECORD_LAYOUT RL_CURVE NO_AXIS_PTS_X 1 UWORD AXIS_PTS_X 2 UWORD INDEX_INCR DIRECT /end RECORD_LAYOUT
+/begin RECORD_LAYOUT RL_AXIS NO_AXIS_PTS_X 1 UWORD AXIS_PTS_X 2 UWORD INDEX_INCR DIRECT /end RECORD_LAYOUT
+/begin MEASUREMENT nEng "" UWORD CM_RPM 0 0 0 8000 ECU_ADDRESS 0x50000000 /end MEASUREMENT
+/begin MEASUREMENT tOil "" UWORD CM_RPM 0 0 0 200 ECU_ADDRESS 0x50000002 /end MEASUREMENT
+/begin AXIS_PTS X_nEng "" 0x40001000 nEng RL_AXIS 0 CM_RPM 8 0 8000 /end AXIS_PTS
+/begin CHARACTERISTIC C_Curve "" CURVE 0x@ADDR@ RL_CURVE 0 CM_RPM 0 100
+  /begin AXIS_DESCR COM_AXIS nEng CM_RPM 8 0 8000 AXIS_PTS_REF X_nEng /end AXIS_DESCR
+/end CHARACTERISTIC
+/begin CHARACTERISTIC C_Other "" VALUE 0x40003000 RL_CURVE 0 CM_RPM 0 100 /end CHARACTERISTIC
+/end MODULE
+/end PROJECT
+"""
+
+
+@pytest.fixture
+def vs():
+    s = ati_vision.VisionSession(dispatch=mock_vision.MockVision().dispatch, com_init=False)
+    yield s
+    s.close()
+
+
+def _update(vs, tmp_path, addr):
+    a2l, vst = tmp_path / "in.a2l", tmp_path / "out.vst"
+    a2l.write_text(A2L.replace("@ADDR@", addr), encoding="utf-8")
+    upd = a2l_delta.update_strategy(vs, str(a2l), str(vst))
+    vst.write_text("; vst\n")
+    vs.loaded_vsts.add(str(vst.resolve()))
+    a2l_delta.commit_index(upd, str(vst))
+    return upd
+
+
+def test_object_refs():
+    refs = a2l_delta.object_refs(parse_blocks(A2L))
+    assert refs["CHARACTERISTIC C_Curve"] == {"AXIS_PTS X_nEng", "MEASUREMENT nEng"}
+    assert refs["AXIS_PTS X_nEng"] == {"MEASUREMENT nEng"}
+    assert refs["CHARACTERISTIC C_Other"] == set()
+
+
+def test_changed_curve_carries_unchanged_axis(tmp_path, vs):
+    assert _update(vs, tmp_path, "40002000").mode == "full"
+    upd = _update(vs, tmp_path, "40002100")
+    assert upd.mode == "incremental"
+    assert upd.changed == ["CHARACTERISTIC C_Curve"]
+    assert upd.referenced == ["AXIS_PTS X_nEng", "MEASUREMENT nEng"]
+    reduced = (tmp_path / "out.vst.delta.a2l").read_text(encoding="utf-8")
+    for name in ("C_Curve", "X_nEng", "MEASUREMENT nEng", "CM_RPM", "RL_CURVE", "RL_AXIS"):
+        assert name in reduced
+    assert "C_Other" not in reduced and "tOil" not in reduced
+    strat = vs.strategy_interface(str(tmp_path / "out.vst"))
+    assert strat.imports[-1][0] == str(tmp_path / "out.vst.delta.a2l")
+
+
+def test_support_change_forces_full_import(tmp_path, vs):
+    _update(vs, tmp_path, "40002000")
+    a2l = tmp_path / "in.a2l"
+    a2l.write_text(A2L.replace("@ADDR@", "40002000").replace('"%6.1"', '"%8.2"'), encoding="utf-8")
+    assert a2l_delta.update_strategy(vs, str(a2l), str(tmp_path / "out.vst")).mode == "full"
+
+
+def test_unchanged_skips_import(tmp_path, vs):
+    _update(vs, tmp_path, "40002000")
+    assert _update(vs, tmp_path, "40002000").mode == "unchanged"
@@ -0,0 +1,71 @@
+"""a2l_objects /begin ... /end ayrıştırma ve cal_extract."""
+from a2l import a2l_objects, cal_extract
+
+A2L = """
+/* /begin CHARACTERISTIC Yorum "yok" /end CHARACTERISTIC */
+/begin PROJECT P ""
+  /begin MODULE M "mod /end"
+    /begin RECORD_LAYOUT RL_F32 FNC_VALUES 1 FLOAT32_IEEE ROW_DIR DIRECT /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT RL_AX NO_AXIS_PTS_X 1 UWORD AXIS_PTS_X 2 SWORD INDEX_INCR DIRECT /end RECORD_LAYOUT
+    /begin CHARACTERISTIC K_Val "tek değer" VALUE 0x1000 RL_F32 0 CM 0 10 /end CHARACTERISTIC
+    /begin CHARACTERISTIC K_Blk "" VAL_BLK 0x1010 RL_F32 0 CM 0 10 MATRIX_DIM 4 2 1 /end CHARACTERISTIC
+    /begin CHARACTERISTIC C_Curve "" CURVE 0x1100 RL_F32 0 CM 0 10
+      /begin AXIS_DESCR COM_AXIS nEng CM 6 0 8000
+        AXIS_PTS_REF X_nEng // eksen ayrı nesnede
+      /end AXIS_DESCR
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC K_NoLayout "" VALUE 0x1200 RL_YOK 0 CM 0 1 /end CHARACTERISTIC
+    /begin CHARACTERISTIC K_NoAddr "" VALUE 0 RL_F32 0 CM 0 1 /end CHARACTERISTIC
+    /begin AXIS_PTS X_nEng "" 0x1300 nEng RL_AX 0 CM 6 0 8000 /end AXIS_PTS
+    /begin MEASUREMENT nEng "" UWORD CM 1 100 0 8000 ECU_ADDRESS 0x2000 /end MEASUREMENT
+  /end MODULE
+/end PROJECT
+"""
+
+
+def test_parse_blocks_nesting():
+    roots = a2l_objects.parse_blocks(A2L)
+    assert [b.kind for b in roots] == ["PROJECT"]      # yorumdaki blok sayılmaz
+    mod = roots[0].children[0]
+    assert (mod.kind, mod.name, mod.tokens[1]) == ("MODULE", "M", '"mod /end"')
+    curve = next(b for b in a2l_objects.iter_objects(roots, ("CHARACTERISTIC",)) if b.name == "C_Curve")
+    ax = next(curve.child("AXIS_DESCR"))
+    assert ax.keyword_args("AXIS_PTS_REF", 1) == ["X_nEng"]
+    assert "//" not in " ".join(ax.tokens)
+    assert A2L[curve.start:curve.end].startswith("/begin CHARACTERISTIC C_Curve")
+    assert A2L[curve.start:curve.end].endswith("/end CHARACTERISTIC")
+    assert mod.end == A2L.index("/end MODULE") + len("/end MODULE")
+
+
+def test_read_items_sizes():
+    items = {it.name: it for it in a2l_objects.read_items(A2L, ("CHARACTERISTIC", "AXIS_PTS", "MEASUREMENT"))}
+    assert (items["K_Val"].address, items["K_Val"].size) == (0x1000, 4)
+    assert items["K_Blk"].size == 4 * 4 * 2
+    assert items["C_Curve"].size == 4 * 6
+    assert items["K_NoLayout"].size is None
+    assert items["X_nEng"].size == 2 + 2 * 6
+    assert (items["nEng"].kind, items["nEng"].address, items["nEng"].size) == ("MEASUREMENT", 0x2000, 2)
+
+
+class _Img:
+    """ElfImage yerine: yalnızca 0x1000..0x1040 aralığı .data'da."""
+    def __init__(self, data):
+        self.data = data
+
+    def read_many(self, reqs):
+        return [memoryview(self.data)[a - 0x1000:a - 0x1000 + n] if 0x1000 <= a and a + n <= 0x1040 else None
+                for a, n in reqs]
+
+
+def test_extract_calibration_and_diff():
+    img = _Img(bytes(range(0x40)))
+    chunks, report = cal_extract.extract_calibration(img, A2L)
+    status = {r[0]: r[4] for r in report}
+    assert status == {"K_Val": "EXTRACTED", "K_Blk": "EXTRACTED", "C_Curve": "NOT_IN_ELF_DATA",
+                      "X_nEng": "NOT_IN_ELF_DATA", "K_NoLayout": "UNKNOWN_SIZE", "K_NoAddr": "NO_ADDRESS"}
+    assert [(a, bytes(mv)) for a, mv in chunks] == [(0x1000, bytes(range(4))), (0x1010, bytes(range(0x10, 0x30)))]
+
+    ref = bytearray(range(0x40))
+    ref[0x12] ^= 0xFF
+    assert cal_extract.diff_against_image(chunks, [(0x1000, bytes(ref))]) == [0x1010]
+    assert cal_extract.diff_against_image(chunks, [(0x1008, bytes(0x40))]) == [0x1000, 0x1010]
@@ -0,0 +1,72 @@
+"""bulkmem: aralık planı, PACKLEN bölme ve mock_t32api üzerinden okuma/yazma."""
+import pytest
+
+from t32 import bulkmem, mock_t32api, t32
+
+
+class _LogApi(mock_t32api.MockT32Api):
+    """Her bellek çağrısını (fonksiyon, adres, boy, access) olarak kaydeder."""
+
+    def __init__(self):
+        super().__init__()
+        self.log = []
+
+    def T32_ReadMemory(self, address, access, buf, size):
+        self.log.append(("R", address, size, access))
+        return super().T32_ReadMemory(address, access, buf, size)
+
+    def T32_WriteMemory(self, address, access, buf, size):
+        self.log.append(("W", address, size, access))
+        return super().T32_WriteMemory(address, access, buf, size)
+
+
+@pytest.fixture
+def sess():
+    s = t32.T32Session("UDP", "20000", "256", api_loader=_LogApi)
+    s.ensure()
+    yield s
+    s.close()
+
+
+def test_plan_ranges_gap_merge():
+    reqs = [(0x2000, 4), (0x1000, 16), (0x1010, 8), (0x1050, 4), (0x10A0, 0), (0x1100, 4)]
+    ranges = bulkmem.plan_ranges(reqs, gap=64)
+    assert [(r.start, r.size) for r in ranges] == [(0x1000, 0x54), (0x1100, 4), (0x2000, 4)]
+    assert ranges[0].members == [(1, 0, 16), (2, 0x10, 8), (3, 0x50, 4)]
+    # gap=0: yalnızca bitişik/çakışan istekler birleşir
+    assert [(r.start, r.size) for r in bulkmem.plan_ranges(reqs, gap=0)] == \
+        [(0x1000, 0x18), (0x1050, 4), (0x1100, 4), (0x2000, 4)]
+
+
+def test_block_size():
+    assert bulkmem.block_size(t32.T32Session("UDP", "20000", "1024")) == 1024
+    assert bulkmem.block_size(t32.T32Session("TCP", "20000", None)) == bulkmem.TCP_BLOCK
+
+
+def test_read_bulk_splits_at_packlen(sess):
+    api = sess.api
+    api.write(0x4000, bytes(range(256)) * 3)
+    stats = bulkmem.BulkStats()
+    buf, views = bulkmem.read_bulk(sess, [(0x4020, 0x2E0), (0x4000, 0x10), (0x5000, 0)], stats=stats)
+    assert [(a, n) for _, a, n, _ in api.log] == [(0x4000, 256), (0x4100, 256), (0x4200, 256)]
+    assert {acc for *_, acc in api.log} == {bulkmem.ACCESS_ED}
+    assert bytes(views[0]) == (bytes(range(256)) * 3)[0x20:]
+    assert bytes(views[1]) == bytes(range(16))
+    assert len(views[2]) == 0
+    assert len(buf) == 0x300
+    assert (stats.requests, stats.ranges, stats.calls, stats.bytes) == (3, 1, 3, 0x300)
+
+
+def test_write_bulk_round_trip(sess):
+    api = sess.api
+    writes = [(0x8000, b"\x01" * 300), (0x8100, b"\x02" * 8), (0x9000, b"\x03" * 4)]
+    stats = bulkmem.BulkStats()
+    bulkmem.write_bulk(sess, writes, stats=stats)
+    assert [(a, n) for f, a, n, _ in api.log if f == "W"] == [(0x8000, 256), (0x8100, 44), (0x9000, 4)]
+    assert (stats.ranges, stats.calls, stats.bytes) == (2, 3, 304)
+    # çakışmada sonraki istek kazanır, aradaki boşluğa dokunulmaz
+    _, views = bulkmem.read_bulk(sess, [(0x8000, 300), (0x812C, 4), (0x9000, 4)], block=64)
+    assert bytes(views[0]) == b"\x01" * 256 + b"\x02" * 8 + b"\x01" * 36
+    assert bytes(views[1]) == b"\xFF" * 4
+    assert bytes(views[2]) == b"\x03" * 4
+    assert all(n <= 64 for f, _, n, _ in api.log if f == "R")
@@ -0,0 +1,61 @@
+"""Release paketi (pipeline/bundle.py): yaz, doğrula, tarfile ile aç."""
+import io
+import json
+import os
+import tarfile
+
+import pytest
+
+from pipeline import bundle
+
+
+@pytest.fixture
+def files(tmp_path):
+    out = {}
+    for name, size in (("a2l/app.a2l", 300_000), ("s19/app.s19", 70_000), ("empty.txt", 0)):
+        p = tmp_path / "in" / name.replace("/", "_")
+        p.parent.mkdir(exist_ok=True)
+        p.write_bytes(os.urandom(size // 2) + b"x" * (size - size // 2))
+        out[name] = str(p)
+    return out
+
+
+def test_round_trip(tmp_path, files):
+    archive = tmp_path / "rel.tar.gz"
+    seen = []
+    m = bundle.write_bundle(str(archive), files, str(tmp_path / "rel.manifest.json"), workers=3,
+                            block_size=64 << 10, progress=lambda done, total: seen.append((done, total)))
+    assert [e["name"] for e in m["files"]] == sorted(files)
+    assert json.loads((tmp_path / "rel.manifest.json").read_text()) == m
+    assert seen[-1][0] == seen[-1][1] == sum(os.path.getsize(p) for p in files.values())
+    assert not (tmp_path / "rel.tar.gz.tmp").exists()
+
+    # Çok üyeli gzip: blok sayısı kadar üye, standart araçlarla açılır
+    with open(archive, "rb") as f:
+        assert f.read().count(b"\x1f\x8b\x08") > 1
+    assert bundle.verify_bundle(str(archive)) == []
+    with tarfile.open(archive, "r:gz") as tar:
+        assert tar.getnames() == [bundle.MANIFEST_NAME] + sorted(files)
+        for name, path in files.items():
+            assert tar.extractfile(name).read() == open(path, "rb").read()
+
+
+def test_verify_detects_tampering(tmp_path, files):
+    archive = tmp_path / "rel.tar.gz"
+    bundle.write_bundle(str(archive), files)
+    with tarfile.open(archive, "r:gz") as tar:
+        members = [(ti, tar.extractfile(ti).read() if ti.isfile() else None) for ti in tar.getmembers()]
+    bad = tmp_path / "bad.tar.gz"
+    with tarfile.open(bad, "w:gz") as tar:
+        for ti, data in members:
+            if ti.name == "s19/app.s19":
+                data = b"y" + data[1:]
+            tar.addfile(ti, io.BytesIO(data))
+    assert bundle.verify_bundle(str(bad)) == ["s19/app.s19"]
+
+
+def test_cancel_removes_partial_archive(tmp_path, files):
+    archive = tmp_path / "rel.tar.gz"
+    with pytest.raises(RuntimeError, match="cancelled"):
+        bundle.write_bundle(str(archive), files, cancel=lambda: True)
+    assert not archive.exists() and not (tmp_path / "rel.tar.gz.tmp").exists()
@@ -0,0 +1,79 @@
+"""Stage checkpoint'leri (pipeline/checkpoint.py) ve release._Resumable ile devam etme."""
+import pytest
+
+from pipeline.checkpoint import CheckpointStore, stage_key
+from pipeline.dag import Stage, run_dag
+from pipeline.release import ReleaseConfig, StageContext, _Resumable
+
+
+def _cfg(tmp_path):
+    return ReleaseConfig("", "", "", "", str(tmp_path / "out"), "1")
+
+
+def _chain(tmp_path, runs, fail=()):
+    """a -> b -> c; b kendi girdi dosyasını hash'ler."""
+    resumed = []
+    rs = _Resumable(_cfg(tmp_path), StageContext(log=lambda m: None), resumed)
+
+    def run(name):
+        def fn(inp):
+            runs.append(name)
+            if name in fail:
+                raise RuntimeError(f"{name} failed")
+            return name.upper()
+        return fn
+
+    inputs = {"a": ({"in": str(tmp_path / "a.txt")}, {}, ()),
+              "b": ({"in": str(tmp_path / "b.txt")}, {"p": 1}, ("a",)),
+              "c": ({}, {}, ("b",))}
+    stages = [Stage(n, rs.wrap(n, run(n), lambda inp, n=n: inputs[n]), inputs[n][2]) for n in "abc"]
+    return run_dag(stages), resumed
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    (tmp_path / "a.txt").write_text("a1")
+    (tmp_path / "b.txt").write_text("b1")
+    return tmp_path
+
+
+def test_resume_skips_finished_stages(inputs):
+    runs = []
+    assert _chain(inputs, runs)[0].ok
+    runs.clear()
+    res, resumed = _chain(inputs, runs)
+    assert res.ok and runs == []
+    assert sorted(resumed) == ["a", "b", "c"]
+    assert res.outputs == {"a": "A", "b": "B", "c": "C"}
+
+
+def test_changed_input_reruns_stage_and_dependents(inputs):
+    _chain(inputs, [])
+    (inputs / "b.txt").write_text("b2 changed")
+    runs = []
+    res, resumed = _chain(inputs, runs)
+    assert res.ok
+    assert runs == ["b", "c"] and resumed == ["a"]
+
+
+def test_unfinished_stage_reruns(inputs):
+    runs = []
+    res, _ = _chain(inputs, runs, fail=("b",))
+    assert "b" in res.errors and res.skipped == ["c"]
+    assert CheckpointStore(str(inputs / "out")).load("b") is None
+    runs.clear()
+    res, resumed = _chain(inputs, runs)
+    assert res.ok
+    assert runs == ["b", "c"] and resumed == ["a"]
+
+
+def test_modified_output_file_invalidates(tmp_path):
+    out = tmp_path / "out.bin"
+    out.write_bytes(b"x")
+    store = CheckpointStore(str(tmp_path))
+    key = stage_key({}, {"v": 1})
+    store.save("s", key, "o", [str(out)])
+    assert store.valid("s", key).output == "o"
+    assert store.valid("s", stage_key({}, {"v": 2})) is None
+    out.write_bytes(b"yy")
+    assert store.valid("s", key) is None
@@ -0,0 +1,59 @@
+"""pipeline/dag.py: eşzamanlılık, hata yayılımı, graf doğrulama."""
+import threading
+
+import pytest
+
+from pipeline.dag import Stage, run_dag
+
+
+def test_independent_stages_run_concurrently():
+    # İki bağımsız stage birbirini beklemeden bitemez
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(tag):
+        def fn(inputs):
+            barrier.wait()
+            return tag
+        return fn
+
+    stages = [Stage("a", meet("A")), Stage("b", meet("B")),
+              Stage("c", lambda i: i["a"] + i["b"], deps=("a", "b"))]
+    res = run_dag(stages)
+    assert res.ok
+    assert res.outputs == {"a": "A", "b": "B", "c": "AB"}
+    (a0, a1), (b0, b1), (c0, _) = (res.timings[n] for n in "abc")
+    assert a0 < b1 and b0 < a1
+    assert c0 >= max(a1, b1)
+
+
+def test_failure_skips_dependents_only():
+    events = []
+
+    def boom(inputs):
+        raise RuntimeError("bozuk")
+
+    stages = [
+        Stage("build", boom),
+        Stage("flash", lambda i: "f", deps=("build",)),
+        Stage("verify", lambda i: "v", deps=("flash",)),
+        Stage("a2l", lambda i: "x"),
+        Stage("vision", lambda i: i["a2l"] + "!", deps=("a2l",)),
+    ]
+    res = run_dag(stages, on_event=lambda kind, name, data: events.append((kind, name)))
+    assert not res.ok
+    assert list(res.errors) == ["build"] and isinstance(res.errors["build"], RuntimeError)
+    assert sorted(res.skipped) == ["flash", "verify"]
+    assert res.outputs == {"a2l": "x", "vision": "x!"}
+    assert ("failed", "build") in events and ("skipped", "verify") in events
+    assert ("start", "flash") not in events
+
+
+@pytest.mark.parametrize("stages, match", [
+    ([Stage("a", None, deps=("b",)), Stage("b", None, deps=("a",))], "döngü"),
+    ([Stage("a", None, deps=("a",))], "döngü"),
+    ([Stage("a", None, deps=("yok",))], "bilinmeyen"),
+    ([Stage("a", None), Stage("a", None)], "tekil"),
+])
+def test_invalid_graph_rejected(stages, match):
+    with pytest.raises(ValueError, match=match):
+        run_dag(stages)
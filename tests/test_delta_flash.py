@@ -0,0 +1,95 @@
+"""delta_flash: sektör haritası, sektör içeriği, delta planı ve kayıt geçersizleme."""
+import pytest
+
+from a2l.hexfile import write_srec
+from t32 import delta_flash, mock_t32api, t32
+
+
+@pytest.fixture(autouse=True)
+def _no_global_session():
+    t32.close_session()
+    yield
+    t32.close_session()
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    d = tmp_path / "flash_state"
+    monkeypatch.setattr(delta_flash, "STATE_DIR", str(d))
+    return d
+
+
+def _session():
+    return t32.T32Session("TCP", "20000", None, api_loader=mock_t32api.MockT32Api)
+
+
+def test_load_sector_map(tmp_path):
+    p = tmp_path / "sectors.txt"
+    p.write_text("; başlık\n0x00804000, 0x4000\n\n0x00800000 0x4000  # ilk\n8421376 16384 ; ondalık\n",
+                 encoding="utf-8")
+    assert delta_flash.load_sector_map(p) == [(0x800000, 0x4000), (0x804000, 0x4000), (0x808000, 0x4000)]
+
+
+def test_sector_bytes_gaps_and_overlap():
+    image = [(0x0FF0, b"\x01" * 0x20), (0x1080, b"\x02" * 4), (0x10FE, b"\x03" * 4)]
+    data = delta_flash.sector_bytes(image, 0x1000, 0x100)
+    assert len(data) == 0x100
+    assert data[:0x10] == b"\x01" * 0x10                  # önceki sektörden taşan parça
+    assert data[0x10:0x80] == b"\xFF" * 0x70              # boşluk silinmiş bayt
+    assert data[0x80:0x84] == b"\x02" * 4
+    assert data[0xFE:] == b"\x03" * 2                     # sonraki sektöre taşan parça
+    assert delta_flash.sector_bytes(image, 0x2000, 0x100) is None
+    assert delta_flash.sector_bytes(image, 0x0F00, 0xF0) is None
+
+
+def test_plan_delta_and_ranges():
+    sectors = [(0x1000, 0x100), (0x1100, 0x100), (0x1200, 0x100), (0x1300, 0x100)]
+    image = [(0x1000, b"\x11" * 0x300)]
+    record = delta_flash.sector_hashes(image, sectors)
+    assert record["0x00001300"] == "erased"
+    assert delta_flash.plan_delta(image, sectors, record).changed == []
+
+    new = [(0x1000, b"\x11" * 0x100 + b"\x22" * 0x200), (0x1300, b"\x33")]
+    plan = delta_flash.plan_delta(new, sectors, record)
+    assert plan.changed == sectors[1:]
+    assert (plan.changed_bytes, plan.total_bytes) == (0x300, 0x400)
+    assert delta_flash._ranges(plan.changed) == [(0x1100, 0x300)]
+    assert delta_flash._ranges([(0x1000, 0x100), (0x1200, 0x100), (0x1300, 0x80)]) == \
+        [(0x1000, 0x100), (0x1200, 0x180)]
+    assert delta_flash.plan_delta(new, sectors, {}).changed == sectors
+
+
+def test_full_flash_invalidates_only_target(tmp_path, state_dir):
+    for name in ("benchA", "benchB"):
+        delta_flash.save_record(name, {"0x00000000": "x"}, str(state_dir))
+    sess = _session()
+    t32.run_flash(str(tmp_path / "app.elf"), str(tmp_path / "boot.s19"), session=sess,
+                  startup_cmm=str(tmp_path / "startup.cmm"), target="benchA")
+    assert delta_flash.load_record("benchA", str(state_dir)) == {}
+    assert delta_flash.load_record("benchB", str(state_dir)) == {"0x00000000": "x"}
+    assert sess.api.commands[-1] == "go"
+
+    t32.run_flash(str(tmp_path / "app.elf"), str(tmp_path / "boot.s19"), session=sess,
+                  startup_cmm=str(tmp_path / "startup.cmm"))
+    assert delta_flash.load_record("benchB", str(state_dir)) == {}
+
+
+def test_run_delta_flash_reprograms_changed_sectors(tmp_path, state_dir):
+    smap = tmp_path / "sectors.txt"
+    smap.write_text("0x1000 0x100\n0x1100 0x100\n0x1200 0x100\n", encoding="utf-8")
+    boot = tmp_path / "boot.s19"
+    write_srec(boot, [(0x1000, bytes(0x300))])
+    sess = _session()
+    kw = dict(session=sess, state_dir=str(state_dir), startup_cmm=str(tmp_path / "startup.cmm"))
+
+    plan = delta_flash.run_delta_flash("", str(boot), str(smap), target="benchA", **kw)
+    assert len(plan.changed) == 3
+    assert delta_flash.load_record("benchA", str(state_dir)) == plan.hashes
+
+    write_srec(boot, [(0x1000, bytes(0x180) + b"\x01" + bytes(0x17F))])
+    plan = delta_flash.run_delta_flash("", str(boot), str(smap), target="benchA", **kw)
+    assert plan.changed == [(0x1100, 0x100)]
+    cmm = (state_dir / "benchA.delta.cmm").read_text(encoding="utf-8")
+    assert "FLASH.ReProgram 0x00001100--0x000011FF /Erase" in cmm
+    assert any(c.startswith('&DELTA="') and c.endswith('benchA.delta.cmm"') for c in sess.api.commands)
+    assert delta_flash.load_record("benchA", str(state_dir)) == plan.hashes
@@ -0,0 +1,71 @@
+"""PRACTICE script izleyici (t32/flash_monitor.py): ilerleme ve stall tespiti."""
+import ctypes
+import threading
+
+import pytest
+
+from t32 import flash_monitor
+from t32.mock_t32api import _deref
+
+
+class _ScriptApi:
+    """polls yoklama boyunca state döner, sonra script biter; messages sırayla verilir."""
+
+    def __init__(self, polls, state=1, messages=()):
+        self.polls, self.state = polls, state
+        self.messages = list(messages)
+        self.last = ""
+        self.commands = []
+
+    def T32_GetPracticeState(self, ref):
+        self.polls -= 1
+        _deref(ref).value = self.state if self.polls > 0 else 0
+        return 0
+
+    def T32_GetMessage(self, msg_ref, status_ref):
+        # Gerçek API gibi: yeni mesaj yoksa sonuncusu okunur
+        if self.messages:
+            self.last = self.messages.pop(0)
+        ctypes.memmove(_deref(msg_ref), self.last.encode() + b"\0", len(self.last) + 1)
+        return 0
+
+    def T32_Cmd(self, cmd):
+        self.commands.append(cmd)
+        return 0
+
+
+class _Session:
+    def __init__(self, api):
+        self.api, self.lock = api, threading.Lock()
+
+
+def test_progress_events():
+    api = _ScriptApi(4, messages=["PROGRESS 10 System up", "PROGRESS 60 Programming flash",
+                                  "PROGRESS 100 File loaded"])
+    events = []
+    mon = flash_monitor.FlashMonitor(_Session(api), on_progress=events.append)
+    mon.run()
+    assert [e.percent for e in events] == [0, 10, 60, 100, 100]
+    assert events[-1].running is False and mon.stage == "File loaded"
+
+
+def test_running_without_progress_stalls():
+    # Script çalışıyor ama hiç mesaj yok (takılmış FLASH.ReProgram/WAIT)
+    api = _ScriptApi(10 ** 6)
+    mon = flash_monitor.FlashMonitor(_Session(api), stall_s=60, running_stall_s=0.3)
+    with pytest.raises(flash_monitor.FlashStalled):
+        mon.run()
+    assert api.commands == [b"END"]
+
+
+def test_running_quiet_step_within_limit():
+    api = _ScriptApi(5)
+    flash_monitor.FlashMonitor(_Session(api), stall_s=0.01, running_stall_s=60).run()
+    assert api.commands == []
+
+
+def test_dialog_stalls_sooner():
+    api = _ScriptApi(10 ** 6, state=2)
+    mon = flash_monitor.FlashMonitor(_Session(api), stall_s=0.2, running_stall_s=60)
+    with pytest.raises(flash_monitor.FlashStalled, match="durum=2"):
+        mon.run()
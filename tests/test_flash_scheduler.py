@@ -0,0 +1,60 @@
+"""Çoklu tezgah flash (t32/flash_scheduler.py), hedef başına mock_t32api."""
+import pytest
+
+from t32 import delta_flash, flash_scheduler, mock_t32api
+
+FAIL_PORT = "20002"
+
+
+class _BenchApi(mock_t32api.MockT32Api):
+    """FAIL_PORT'a bağlanan instance'ın scripti hata mesajıyla biter."""
+
+    def T32_Cmd(self, cmd: bytes):
+        if cmd.upper().startswith(b"DO ") and self.config.get("PORT=") == FAIL_PORT:
+            self.message = "flash error: target not responding"
+        return super().T32_Cmd(cmd)
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    d = tmp_path / "flash_state"
+    monkeypatch.setattr(delta_flash, "STATE_DIR", str(d))
+    for name in ("bench1", "bench2", "other"):
+        delta_flash.save_record(name, {"0x00000000": "x"}, str(d))
+    yield d
+    flash_scheduler.close_sessions()
+
+
+def _target(tmp_path, name, port):
+    cfg = tmp_path / f"{name}.t32"
+    cfg.write_text(f"RCL=NETTCP\nPORT={port}\n", encoding="utf-8")
+    return flash_scheduler.FlashTarget(name, str(cfg), str(tmp_path / "app.elf"), str(tmp_path / "boot.s19"),
+                                       startup_cmm=str(tmp_path / "startup.cmm"))
+
+
+def test_failure_is_isolated_per_target(tmp_path, state_dir):
+    apis = []
+
+    def loader():
+        apis.append(_BenchApi())
+        return apis[-1]
+
+    targets = [_target(tmp_path, "bench1", "20000"), _target(tmp_path, "bench2", FAIL_PORT)]
+    report = flash_scheduler.flash_targets(targets, api_loader=loader)
+
+    assert not report.ok
+    assert [(r.name, r.ok) for r in report.results] == [("bench1", True), ("bench2", False)]
+    assert [r.name for r in report.failed] == ["bench2"]
+    assert "error" in report.failed[0].error
+    assert "1/2 hedef OK" in report.summary()
+    assert len(apis) == 2
+    # Tam flash yalnız kendi kaydını siler; diğer tezgahların kaydı kalır
+    assert delta_flash.load_record("bench1", str(state_dir)) == {}
+    assert delta_flash.load_record("bench2", str(state_dir)) == {}
+    assert delta_flash.load_record("other", str(state_dir)) == {"0x00000000": "x"}
+
+
+def test_duplicate_port_rejected(tmp_path, state_dir):
+    targets = [_target(tmp_path, "bench1", "20000"), _target(tmp_path, "bench2", "20000")]
+    with pytest.raises(ValueError, match="aynı TRACE32 portunu"):
+        flash_scheduler.flash_targets(targets, api_loader=mock_t32api.MockT32Api)
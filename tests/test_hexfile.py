@@ -0,0 +1,78 @@
+"""hexfile: S-record / Intel HEX gidiş-dönüş ve coalesce."""
+import pytest
+
+from a2l import hexfile
+
+
+def _srec_ok(line):
+    raw = bytes.fromhex(line[2:])
+    return raw[0] == len(raw) - 1 and (sum(raw) & 0xFF) == 0xFF
+
+
+@pytest.mark.parametrize("base, rtype, term", [
+    (0x1000, "1", "9"),
+    (0x20000, "2", "8"),
+    (0x80000000, "3", "7"),
+])
+def test_srec_round_trip(tmp_path, base, rtype, term):
+    chunks = [(base, bytes(range(100))), (base + 0x200, b"\xAA" * 7)]
+    p = tmp_path / "img.s19"
+    hexfile.write_srec(p, chunks, header="img")
+    lines = p.read_text(encoding="ascii").split()
+    assert lines[0].startswith("S0") and lines[-1].startswith("S" + term)
+    data = [ln for ln in lines if ln[1] == rtype]
+    assert len(data) == 5                      # 100 byte -> 4 kayıt + 1
+    assert lines[-2] == hexfile._srec_line("5", len(data), 2, b"")
+    assert all(_srec_ok(ln) for ln in lines)
+    assert hexfile.read_srec(p) == chunks
+
+
+def test_srec_explicit_type_too_small(tmp_path):
+    with pytest.raises(ValueError):
+        hexfile.write_srec(tmp_path / "x.s19", [(0x10000, b"\x00")], rtype="1")
+    hexfile.write_srec(tmp_path / "x.s37", [(0x100, b"\x01\x02")], rtype="3")
+    assert hexfile.read_srec(tmp_path / "x.s37") == [(0x100, b"\x01\x02")]
+
+
+def _read_ihex(path):
+    upper, chunks = 0, []
+    for ln in path.read_text(encoding="ascii").split():
+        raw = bytes.fromhex(ln[1:])
+        assert sum(raw) & 0xFF == 0
+        n, addr, rtype, data = raw[0], int.from_bytes(raw[1:3], "big"), raw[3], raw[4:-1]
+        assert len(data) == n
+        if rtype == 4: upper = int.from_bytes(data, "big")
+        elif rtype == 0: chunks.append(((upper << 16) + addr, data))
+        elif rtype == 1: break
+    return hexfile.coalesce(chunks), ln
+
+
+def test_ihex_extended_linear_address(tmp_path):
+    # 64K sınırını aşan parça + ayrı bir üst bölge
+    chunks = [(0x8000FFF0, bytes(range(48))), (0x80100000, b"\x55" * 4)]
+    p = tmp_path / "img.hex"
+    hexfile.write_image(p, chunks)
+    lines = p.read_text(encoding="ascii").split()
+    ela = [ln for ln in lines if ln[7:9] == "04"]
+    assert ela == [hexfile._ihex_line(4, 0, b"\x80\x00"),
+                   hexfile._ihex_line(4, 0, b"\x80\x01"),
+                   hexfile._ihex_line(4, 0, b"\x80\x10")]
+    # sınırdan önceki kayıt 0xFFFF'te biter
+    assert lines[1] == hexfile._ihex_line(0, 0xFFF0, bytes(range(16)))
+    got, last = _read_ihex(p)
+    assert got == chunks
+    assert last == ":00000001FF"
+
+
+def test_coalesce_overlap_and_adjacent():
+    got = hexfile.coalesce([
+        (0x110, b"\x02\x02"),
+        (0x100, b"\x01" * 16),          # 0x100..0x110, 0x110 ile bitişik
+        (0x104, b"\x03\x03"),           # çakışan, sonraki kazanır
+        (0x200, b""),                   # boş parça atlanır
+        (0x300, b"\x04"),
+    ])
+    assert got == [
+        (0x100, b"\x01" * 4 + b"\x03\x03" + b"\x01" * 10 + b"\x02\x02"),
+        (0x300, b"\x04"),
+    ]
@@ -0,0 +1,62 @@
+"""a2l/symindex.py: mmap indeks aramaları main_a2l çözümlemesiyle aynı sonucu vermeli (perf/synth_elf)."""
+import shutil
+
+import pytest
+
+from a2l import main_a2l, symindex
+from a2l.elf_index import ElfIndex
+from perf import synth_elf
+
+SPEC = synth_elf.SynthSpec(cus=2, symbols=40, depth=1, params=80, missing_ratio=0.05)
+
+pytestmark = pytest.mark.skipif(shutil.which(SPEC.cc) is None, reason="gcc yok")
+
+
+@pytest.fixture(scope="module")
+def elf_path(tmp_path_factory):
+    return str(synth_elf.build_elf(SPEC, str(tmp_path_factory.mktemp("synth"))))
+
+
+@pytest.fixture(scope="module")
+def ref(elf_path):
+    idx = ElfIndex(elf_path)
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def shared(elf_path, tmp_path):
+    with symindex.attach(elf_path, index_dir=str(tmp_path)) as si:
+        yield si
+
+
+def test_symbols_match_build_symbol_map(ref, shared):
+    assert len(shared) == len(ref.symmap)
+    for name, addr in ref.symmap.items():
+        assert shared.address(name) == addr, name
+    assert shared.address("yok_boyle_sembol") is None
+    for name, addr in ref.symmap.items():
+        found, ofs = shared.symbol_at(addr)
+        assert ref.symmap[found] == addr and ofs == 0
+
+
+def test_resolve_matches_main_a2l(ref, shared):
+    names = list(synth_elf.param_names(SPEC))
+    assert any("[" in n for n in names) and any(n.startswith("missing_") for n in names)
+    members = 0
+    for n in names:
+        want = (main_a2l.resolve_struct_member_addr(ref.elf, ref.dwarfinfo, ref.symmap, n, ref.var_dies)
+                or main_a2l.resolve_direct_symbol(ref.symmap, n))
+        assert shared.resolve(n) == want, n
+        members += want is not None and "DWARF" in want[1]
+    assert members > 0
+
+
+def test_attach_reuses_index(elf_path, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        symindex.attach(elf_path, build_missing=False, index_dir=str(tmp_path))
+    with symindex.attach(elf_path, index_dir=str(tmp_path)) as si:
+        path = si.path
+    assert list(tmp_path.glob("*.symidx")) == [symindex.index_path(elf_path, str(tmp_path))]
+    with symindex.attach(elf_path, build_missing=False, index_dir=str(tmp_path)) as si:
+        assert si.path == path
@@ -0,0 +1,78 @@
+"""T32Session.ensure / get_session, mock_t32api üzerinden."""
+import time
+
+import pytest
+
+from t32 import t32, mock_t32api
+
+
+@pytest.fixture(autouse=True)
+def _no_global_session():
+    t32.close_session()
+    yield
+    t32.close_session()
+
+
+def _write_config(path, port="20000"):
+    path.write_text(f"RCL=NETASSIST\nPACKLEN=1024\nPORT={port}\n", encoding="utf-8")
+    return str(path)
+
+
+def test_ensure_waits_for_boot():
+    api = mock_t32api.MockT32Api(boot_delay_s=0.3)
+    sess = t32.T32Session("UDP", "20000", "1024", api_loader=lambda: api)
+    t0 = time.monotonic()
+    assert sess.ensure(timeout_s=5) is api
+    assert time.monotonic() - t0 >= 0.3
+    assert sess.connected
+    assert api.calls["T32_Init"] > 1
+    assert api.config == {"NODE=": "localhost", "PORT=": "20000", "PACKLEN=": "1024"}
+
+
+def test_ensure_reuses_live_connection():
+    api = mock_t32api.MockT32Api()
+    sess = t32.T32Session("TCP", "20000", None, api_loader=lambda: api)
+    sess.ensure()
+    inits = api.calls["T32_Init"]
+    sess.ensure()
+    assert api.calls["T32_Init"] == inits
+    assert "PACKLEN=" not in api.config
+
+
+def test_ensure_reconnects_after_drop():
+    api = mock_t32api.MockT32Api()
+    sess = t32.T32Session("TCP", "20000", None, api_loader=lambda: api)
+    sess.ensure()
+    api.T32_Exit()                  # TRACE32 kapandı / bağlantı koptu
+    assert not sess.is_alive()
+    sess.ensure()
+    assert sess.is_alive()
+
+
+def test_ensure_times_out():
+    api = mock_t32api.MockT32Api(boot_delay_s=60)
+    sess = t32.T32Session("TCP", "20000", None, api_loader=lambda: api)
+    with pytest.raises(RuntimeError, match="zaman aşımı"):
+        sess.ensure(timeout_s=0.2)
+    assert not sess.connected
+
+
+def test_get_session_reuses_session(tmp_path):
+    cfg = _write_config(tmp_path / "config.t32")
+    api = mock_t32api.MockT32Api()
+    s1 = t32.get_session(cfg, api_loader=lambda: api)
+    s1.ensure()
+    s2 = t32.get_session(cfg, api_loader=lambda: api)
+    assert s2 is s1
+    s2.ensure()
+    assert api.calls["T32_Init"] == 1
+
+
+def test_get_session_replaces_on_port_change(tmp_path):
+    api = mock_t32api.MockT32Api()
+    s1 = t32.get_session(_write_config(tmp_path / "a.t32"), api_loader=lambda: api)
+    s1.ensure()
+    s2 = t32.get_session(_write_config(tmp_path / "b.t32", port="20002"), api_loader=lambda: api)
+    assert s2 is not s1
+    assert (s2.rcl_mode, s2.port, s2.packlen) == ("UDP", "20002", "1024")
+    assert not s1.connected
@@ -0,0 +1,101 @@
+"""Vision otomasyonu (vision/ati_vision.py), MockVision.dispatch ile."""
+import threading
+
+import pytest
+
+from vision import ati_vision, mock_vision
+from vision.ati_vision import VISION_DEVICE_ONLINE, VISION_DEVICE_UPLOADING
+
+
+class _Device:
+    """State her okunuşta sıradaki değeri verir, son değerde kalır."""
+
+    def __init__(self, states):
+        self.states = list(states)
+
+    @property
+    def State(self):
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+@pytest.fixture
+def mock():
+    return mock_vision.MockVision()
+
+
+@pytest.fixture
+def vs(mock):
+    s = ati_vision.VisionSession(dispatch=mock.dispatch, com_init=False)
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    out = []
+    monkeypatch.setattr(ati_vision.time, "sleep", out.append)
+    return out
+
+
+def test_wait_state_backoff(vs, sleeps):
+    up = VISION_DEVICE_UPLOADING
+    dev = _Device([0, up, up, up, up, up, VISION_DEVICE_ONLINE])
+    state = vs.wait_state(dev, (VISION_DEVICE_ONLINE,), 60, busy_states=(up,))
+    assert state == VISION_DEVICE_ONLINE
+    # Durum değişince en kısa aralığa döner, sonra ikiye katlanır
+    assert sleeps == [0.05, 0.05, 0.1, 0.2, 0.4, 0.8]
+
+
+def test_wait_state_backoff_is_capped(vs, sleeps):
+    dev = _Device([VISION_DEVICE_UPLOADING] * 10 + [VISION_DEVICE_ONLINE])
+    vs.wait_state(dev, (VISION_DEVICE_ONLINE,), 60)
+    assert max(sleeps) == ati_vision.STATE_POLL_MAX_SEC
+
+
+def test_wait_state_timeout(vs):
+    assert vs.wait_state(_Device([0]), (VISION_DEVICE_ONLINE,), 0.2) == 0
+
+
+def test_wait_state_stall_outside_busy_states(vs):
+    assert vs.wait_state(_Device([0]), (VISION_DEVICE_ONLINE,), 60, stall_s=0.1,
+                         busy_states=(VISION_DEVICE_UPLOADING,)) == 0
+
+
+def test_wait_state_cancel(vs, sleeps):
+    calls = []
+    with pytest.raises(ati_vision.VisionCancelled):
+        vs.wait_state(_Device([VISION_DEVICE_UPLOADING]), (VISION_DEVICE_ONLINE,), 60,
+                      cancel=lambda: calls.append(1) or len(calls) > 2)
+    assert len(sleeps) == 2
+
+
+def test_session_is_per_thread(vs):
+    ati_vision.set_session(vs)
+    try:
+        vs.strategy_interface()
+        assert vs.owner_thread == threading.get_ident()
+        assert ati_vision.get_session() is vs
+        other = []
+        t = threading.Thread(target=lambda: other.append(ati_vision.get_session()))
+        t.start(); t.join()
+        # COM nesneleri thread'e bağlı: başka thread yeni oturum alır
+        assert other[0] is not vs
+    finally:
+        ati_vision.set_session(None)
+
+
+def test_package_reuses_session(tmp_path, mock, vs):
+    a2l, s19 = tmp_path / "a.a2l", tmp_path / "a.s19"
+    a2l.write_text('/begin PROJECT P ""\n/begin MODULE M ""\n/begin CHARACTERISTIC A "" VALUE 0x10 L 0 CM 0 1 '
+                   '/end CHARACTERISTIC\n/end MODULE\n/end PROJECT\n')
+    s19.write_text("S0030000FC\n")
+    jobs = [ati_vision.VisionJob(str(a2l), str(s19), str(tmp_path / f"{n}.vst"), device_name=n,
+                                 prj_path=str(tmp_path / "base.vpj")) for n in ("PCM", "TCM")]
+    for _ in range(2):
+        assert all(r.ok for r in ati_vision.package_batch(jobs, session=vs))
+    devices = vs.prj._devices
+    # Cihaz başına ayrı strateji, her biri yalnız bir kez eklenir
+    assert [len(devices[n].strategies) for n in ("PCM", "TCM")] == [1, 1]
+    assert devices["PCM"].strategies[0] is not devices["TCM"].strategies[0]
+    assert mock.calls["ProjectOpen"] == 1
+    assert mock.calls["Dispatch:Vision.StrategyFileInterface"] == 2